@@ -1,747 +1,696 @@
-import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import json
-import os
-
-# Page configuration
-st.set_page_config(
-    page_title="45-Day Study Timetable",
-    page_icon="📚",
-    layout="wide",
-    initial_sidebar_state="collapsed"
-)
-
-# Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        text-align: center;
-        color: #2c3e50;
-        margin-bottom: 2rem;
-    }
-    
-    .summary-container {
-        display: flex;
-        justify-content: space-around;
-        margin: 2rem 0;
-        flex-wrap: wrap;
-        gap: 1rem;
-    }
-    
-    .summary-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        min-width: 200px;
-        flex: 1;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    
-    .summary-card h3 {
-        margin: 0 0 10px 0;
-        font-size: 1.2rem;
-    }
-    
-    .summary-card p {
-        margin: 5px 0;
-        font-size: 0.9rem;
-    }
-    
-    .legend-container {
-        display: flex;
-        justify-content: center;
-        gap: 2rem;
-        margin: 1.5rem 0;
-        flex-wrap: wrap;
-    }
-    
-    .legend-item {
-        display: flex;
-        align-items: center;
-        gap: 8px;
-        padding: 8px 12px;
-        border-radius: 5px;
-        background: #f8f9fa;
-    }
-    
-    .legend-color {
-        width: 20px;
-        height: 20px;
-        border-radius: 4px;
-    }
-    
-    .api-color { background-color: blue; border-left: 4px solid #0000ff; }
-    .stats-color { background-color: black; border-left: 4px solid #000000; }
-    .llm-color { background-color: red; border-left: 4px solid #ff0000; }
-    
-    .week-header {
-        background-color: #2c3e50;
-        color: white;
-        text-align: center;
-        font-weight: bold;
-        padding: 10px;
-        border-radius: 5px;
-        margin: 10px 0;
-    }
-    
-    .rest-day {
-        background-color: #f8f9fa;
-        color: #6c757d;
-        font-style: italic;
-        text-align: center;
-        padding: 10px;
-        border-radius: 5px;
-    }
-    
-    .progress-section {
-        margin: 2rem 0;
-    }
-    
-    .metric-container {
-        display: flex;
-        justify-content: space-around;
-        margin: 1rem 0;
-    }
-    
-    .stDataFrame {
-        width: 100% !important;
-        overflow: visible !important;
-    }
-    
-    .notes-section textarea {
-        width: 100%;
-        min-height: 100px;
-        border: 1px solid #ddd;
-        border-radius: 5px;
-        padding: 8px;
-    }
-    
-    /* Ensure text color is black for Morning and Evening Session columns by default */
-    [data-testid="stDataFrame"] tbody tr td:nth-child(4),
-    [data-testid="stDataFrame"] tbody tr td:nth-child(5) {
-        color: black !important;
-    }
-    
-    /* Override text color for API sessions to red */
-    [data-testid="stDataFrame"] tbody tr td.api-session {
-        color: red !important;
-    }
-    
-    /* Override text color for week headers */
-    [data-testid="stDataFrame"] tbody tr:has(td.week-header) td {
-        color: white !important;
-    }
-    
-    /* Override text color for rest days */
-    [data-testid="stDataFrame"] tbody tr:has(td.rest-day) td {
-        color: #6c757d !important;
-    }
-    
-    /* Ensure text is readable on dark backgrounds */
-    [data-testid="stDataFrame"] tbody tr td.stats-session {
-        color: white !important;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# File to store persistent data
-DATA_FILE = "timetable_data.json"
-
-# Load saved data from JSON file
-def load_data():
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, 'r') as f:
-            return json.load(f)
-    return {"checkbox_states": {}, "notes": {}}
-
-# Save data to JSON file
-def save_data(data):
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
-
-# Initialize persistent data
-persistent_data = load_data()
-
-# Initialize session state with loaded data
-if 'checkbox_states' not in st.session_state:
-    st.session_state.checkbox_states = persistent_data.get("checkbox_states", {})
-if 'notes' not in st.session_state:
-    st.session_state.notes = persistent_data.get("notes", {})
-
-# App title
-st.markdown('<div class="main-header"><h1>📚 45-Day Study Timetable</h1><p>API | Statistics | LLM</p></div>', unsafe_allow_html=True)
-
-# Create schedule data with generic session names
-schedule_data = []
-
-# Session counters for each subject
-api_session = 1
-stats_session = 1
-llm_session = 1
-
-# Week 1
-schedule_data.extend([
-    {"Week": "WEEK 1", "Day": "", "Date": "", "Morning Session": "", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Day 1 (Monday)", "Date": "Jun 9", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 2 (Tuesday)", "Date": "Jun 10", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 3 (Wednesday)", "Date": "Jun 11", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 4 (Thursday)", "Date": "Jun 12", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 5 (Friday)", "Date": "Jun 13", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Saturday", "Date": "Jun 14", "Morning Session": "REST DAY", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 6 (Sunday)", "Date": "Jun 15", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-# Week 2
-schedule_data.extend([
-    {"Week": "WEEK 2", "Day": "", "Date": "", "Morning Session": "", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Day 7 (Monday)", "Date": "Jun 16", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 8 (Tuesday)", "Date": "Jun 17", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 9 (Wednesday)", "Date": "Jun 18", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 10 (Thursday)", "Date": "Jun 19", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 11 (Friday)", "Date": "Jun 20", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Saturday", "Date": "Jun 21", "Morning Session": "REST DAY", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 12 (Sunday)", "Date": "Jun 22", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-# Week 3
-schedule_data.extend([
-    {"Week": "WEEK 3", "Day": "", "Date": "", "Morning Session": "", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Day 13 (Monday)", "Date": "Jun 23", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 14 (Tuesday)", "Date": "Jun 24", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 15 (Wednesday)", "Date": "Jun 25", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 16 (Thursday)", "Date": "Jun 26", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 17 (Friday)", "Date": "Jun 27", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Saturday", "Date": "Jun 28", "Morning Session": "REST DAY", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 18 (Sunday)", "Date": "Jun 29", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-# Week 4
-schedule_data.extend([
-    {"Week": "WEEK 4", "Day": "", "Date": "", "Morning Session": "", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Day 19 (Monday)", "Date": "Jun 30", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 20 (Tuesday)", "Date": "Jul 1", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 21 (Wednesday)", "Date": "Jul 2", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 22 (Thursday)", "Date": "Jul 3", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 23 (Friday)", "Date": "Jul 4", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Saturday", "Date": "Jul 5", "Morning Session": "REST DAY", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 24 (Sunday)", "Date": "Jul 6", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-# Week 5
-schedule_data.extend([
-    {"Week": "WEEK 5", "Day": "", "Date": "", "Morning Session": "", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Day 25 (Monday)", "Date": "Jul 7", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 26 (Tuesday)", "Date": "Jul 8", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 27 (Wednesday)", "Date": "Jul 9", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 28 (Thursday)", "Date": "Jul 10", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 29 (Friday)", "Date": "Jul 11", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Saturday", "Date": "Jul 12", "Morning Session": "REST DAY", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 30 (Sunday)", "Date": "Jul 13", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-# Final Days
-schedule_data.extend([
-    {"Week": "FINAL DAYS", "Day": "", "Date": "", "Morning Session": "", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Day 40 (Thursday)", "Date": "Jul 24", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 41 (Friday)", "Date": "Jul 25", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-    {"Week": "", "Day": "Saturday", "Date": "Jul 26", "Morning Session": "REST DAY", "Evening Session": "", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 42 (Sunday)", "Date": "Jul 27", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 43 (Monday)", "Date": "Jul 28", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"📊 Statistics: Session {stats_session} (50 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-api_session += 1
-stats_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 44 (Tuesday)", "Date": "Jul 29", "Morning Session": f"📊 Statistics: Session {stats_session} (50 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-stats_session += 1
-llm_session += 1
-
-schedule_data.extend([
-    {"Week": "", "Day": "Day 45 (Wednesday)", "Date": "Jul 30", "Morning Session": f"🔧 API: Session {api_session} (45 min)", "Evening Session": f"🤖 LLM: Session {llm_session} (75 min)", "Morning Completed": "", "Evening Completed": "", "Notes": ""},
-])
-
-# Create DataFrame
-df = pd.DataFrame(schedule_data)
-
-# Calculate progress based on completed sessions
-total_days = 45
-api_sessions_completed = 0
-stats_sessions_completed = 0
-llm_sessions_completed = 0
-total_sessions_completed = 0
-total_sessions = 0  # Total number of sessions (Morning + Evening, excluding rest days)
-
-# Count sessions and completions
-for idx, row in df.iterrows():
-    if 'REST DAY' in str(row['Morning Session']) or (not row['Morning Session'] and not row['Evening Session']):
-        continue
-    
-    morning_key = f"morning_{idx}"
-    evening_key = f"evening_{idx}"
-    
-    # Count total sessions
-    if '🔧 API' in str(row['Morning Session']):
-        total_sessions += 1
-    elif '📊 Statistics' in str(row['Morning Session']):
-        total_sessions += 1
-    elif '🤖 LLM' in str(row['Morning Session']):
-        total_sessions += 1
-        
-    if '🔧 API' in str(row['Evening Session']):
-        total_sessions += 1
-    elif '📊 Statistics' in str(row['Evening Session']):
-        total_sessions += 1
-    elif '🤖 LLM' in str(row['Evening Session']):
-        total_sessions += 1
-    
-    # Count completed sessions
-    if st.session_state.checkbox_states.get(morning_key, False):
-        total_sessions_completed += 1
-        if '🔧 API' in str(row['Morning Session']):
-            api_sessions_completed += 1
-        elif '📊 Statistics' in str(row['Morning Session']):
-            stats_sessions_completed += 1
-        elif '🤖 LLM' in str(row['Morning Session']):
-            llm_sessions_completed += 1
-    
-    if st.session_state.checkbox_states.get(evening_key, False):
-        total_sessions_completed += 1
-        if '🔧 API' in str(row['Evening Session']):
-            api_sessions_completed += 1
-        elif '📊 Statistics' in str(row['Evening Session']):
-            stats_sessions_completed += 1
-        elif '🤖 LLM' in str(row['Evening Session']):
-            llm_sessions_completed += 1
-
-# Total sessions per subject (as per the summary cards)
-total_api_sessions = 25
-total_stats_sessions = 25
-total_llm_sessions = 25
-
-# Calculate progress percentages
-api_progress = (api_sessions_completed / total_api_sessions) * 100
-stats_progress = (stats_sessions_completed / total_stats_sessions) * 100
-llm_progress = (llm_sessions_completed / total_llm_sessions) * 100
-overall_progress = (total_sessions_completed / total_sessions) * 100 if total_sessions > 0 else 0
-
-# Summary cards
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.markdown(f"""
-    <div class="summary-card">
-        <h3>🔧 API</h3>
-        <p><strong>19.0 Hours</strong></p>
-        <p>25 Sessions × 45-50 min</p>
-        <p>Progress: {api_progress:.1f}%</p>
-    </div>
-    """, unsafe_allow_html=True)
-    st.progress(api_progress / 100)
-
-with col2:
-    st.markdown(f"""
-    <div class="summary-card">
-        <h3>📊 Statistics</h3>
-        <p><strong>~20 Hours</strong></p>
-        <p>25 Sessions × 45-50 min</p>
-        <p>Progress: {stats_progress:.1f}%</p>
-    </div>
-    """, unsafe_allow_html=True)
-    st.progress(stats_progress / 100)
-
-with col3:
-    st.markdown(f"""
-    <div class="summary-card">
-        <h3>🤖 LLM</h3>
-        <p><strong>29.8 Hours</strong></p>
-        <p>25 Sessions × 70-75 min</p>
-        <p>Progress: {llm_progress:.1f}%</p>
-    </div>
-    """, unsafe_allow_html=True)
-    st.progress(llm_progress / 100)
-
-# Legend
-st.markdown("""
-<div class="legend-container">
-    <div class="legend-item">
-        <div class="legend-color api-color"></div>
-        <span>API</span>
-    </div>
-    <div class="legend-item">
-        <div class="legend-color stats-color"></div>
-        <span>Statistics</span>
-    </div>
-    <div class="legend-item">
-        <div class="legend-color llm-color"></div>
-        <span>LLM</span>
-    </div>
-</div>
-""", unsafe_allow_html=True)
-
-# Display schedule
-st.markdown("## 📅 Complete 45-Day Schedule")
-
-# Custom styling for the dataframe
-def style_dataframe(df):
-    def apply_styles(row):
-        styles = [''] * len(row)
-        
-        # Week headers
-        if row['Week'] and not row['Day']:
-            styles = ['background-color: #2c3e50; color: white; font-weight: bold; text-align: center'] * len(row)
-            styles[0] += '; --cell-class: week-header'
-        
-        # Rest days
-        elif 'REST DAY' in str(row['Morning Session']):
-            styles = ['background-color: #f8f9fa; color: #6c757d; font-style: italic'] * len(row)
-            styles[0] += '; --cell-class: rest-day'
-        
-        # Subject-based coloring for Morning Session
-        elif '🔧 API' in str(row['Morning Session']):
-            styles[3] = 'background-color: blue; border-left: 4px solid #0000ff; --cell-class: api-session'
-        elif '📊 Statistics' in str(row['Morning Session']):
-            styles[3] = 'background-color: black; border-left: 4px solid #000000; --cell-class: stats-session'
-        elif '🤖 LLM' in str(row['Morning Session']):
-            styles[3] = 'background-color: red; border-left: 4px solid #ff0000; --cell-class: llm-session'
-            
-        # Subject-based coloring for Evening Session
-        if '🔧 API' in str(row['Evening Session']):
-            styles[4] = 'background-color: blue; border-left: 4px solid #0000ff; --cell-class: api-session'
-        elif '📊 Statistics' in str(row['Evening Session']):
-            styles[4] = 'background-color: black; border-left: 4px solid #000000; --cell-class: stats-session'
-        elif '🤖 LLM' in str(row['Evening Session']):
-            styles[4] = 'background-color: red; border-left: 4px solid #ff0000; --cell-class: llm-session'
-            
-        return styles
-    
-    # Add checkboxes and notes for each row
-    for idx, row in df.iterrows():
-        if 'REST DAY' in str(row['Morning Session']) or (not row['Morning Session'] and not row['Evening Session']):
-            df.at[idx, 'Morning Completed'] = ''
-            df.at[idx, 'Evening Completed'] = ''
-            df.at[idx, 'Notes'] = ''
-        else:
-            # Unique keys for checkboxes and notes
-            morning_key = f"morning_{idx}"
-            evening_key = f"evening_{idx}"
-            notes_key = f"notes_{idx}"
-            
-            # Initialize checkbox states if not already set
-            if morning_key not in st.session_state.checkbox_states:
-                st.session_state.checkbox_states[morning_key] = False
-            if evening_key not in st.session_state.checkbox_states:
-                st.session_state.checkbox_states[evening_key] = False
-            if notes_key not in st.session_state.notes:
-                st.session_state.notes[notes_key] = ""
-            
-            # Add checkbox states to DataFrame
-            df.at[idx, 'Morning Completed'] = '✅' if st.session_state.checkbox_states[morning_key] else '⬜'
-            df.at[idx, 'Evening Completed'] = '✅' if st.session_state.checkbox_states[evening_key] else '⬜'
-            df.at[idx, 'Notes'] = st.session_state.notes[notes_key]
-            
-    return df.style.apply(apply_styles, axis=1)
-
-# Function to display the table and checkboxes/notes
-def display_schedule_with_checkboxes():
-    styled_df = style_dataframe(df.copy())
-    st.dataframe(styled_df, use_container_width=True, height=len(df) * 35 + 100)  # Full view mode
-    
-    # Add checkboxes and notes below the table
-    st.markdown("## 📋 Daily Progress and Notes")
-    for idx, row in df.iterrows():
-        if 'REST DAY' in str(row['Morning Session']) or (not row['Morning Session'] and not row['Evening Session']):
-            continue
-        
-        st.markdown(f"### {row['Day']} - {row['Date']}")
-        col1, col2 = st.columns([1, 3])
-        
-        with col1:
-            morning_key = f"morning_{idx}"
-            evening_key = f"evening_{idx}"
-            
-            morning_checked = st.checkbox(
-                f"Morning: {row['Morning Session']}",
-                value=st.session_state.checkbox_states.get(morning_key, False),
-                key=morning_key
-            )
-            evening_checked = st.checkbox(
-                f"Evening: {row['Evening Session']}",
-                value=st.session_state.checkbox_states.get(evening_key, False),
-                key=evening_key
-            )
-            
-            # Update session state and save to file
-            if morning_checked != st.session_state.checkbox_states.get(morning_key, False):
-                st.session_state.checkbox_states[morning_key] = morning_checked
-                save_data({"checkbox_states": st.session_state.checkbox_states, "notes": st.session_state.notes})
-            
-            if evening_checked != st.session_state.checkbox_states.get(evening_key, False):
-                st.session_state.checkbox_states[evening_key] = evening_checked
-                save_data({"checkbox_states": st.session_state.checkbox_states, "notes": st.session_state.notes})
-        
-        with col2:
-            notes_key = f"notes_{idx}"
-            notes = st.text_area(
-                "Notes",
-                value=st.session_state.notes.get(notes_key, ""),
-                key=notes_key,
-                placeholder="Add your notes or review here..."
-            )
-            
-            # Update session state and save to file
-            if notes != st.session_state.notes.get(notes_key, ""):
-                st.session_state.notes[notes_key] = notes
-                save_data({"checkbox_states": st.session_state.checkbox_states, "notes": st.session_state.notes})
-
-# Display the schedule with checkboxes and notes
-display_schedule_with_checkboxes()
-
-# Progress tracking section
-st.markdown("## 📈 Progress Tracking")
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.metric(
-        label="📚 Sessions Completed",
-        value=f"{total_sessions_completed}/{total_sessions}",
-        delta=f"{overall_progress:.1f}% Complete"
-    )
-
-with col2:
-    st.metric(
-        label="🎯 API Sessions",
-        value=f"{api_sessions_completed}/{total_api_sessions}",
-        delta=f"{api_progress:.1f}% Complete"
-    )
-
-with col3:
-    st.metric(
-        label="📊 Statistics Sessions", 
-        value=f"{stats_sessions_completed}/{total_stats_sessions}",
-        delta=f"{stats_progress:.1f}% Complete"
-    )
-
-# Progress visualization
-fig = go.Figure()
-
-subjects = ['API', 'Statistics', 'LLM']
-progress_values = [api_progress, stats_progress, llm_progress]
-colors = ['#27ae60', '#ffc107', '#007bff']
-
-fig.add_trace(go.Bar(
-    x=subjects,
-    y=progress_values,
-    marker_color=colors,
-    text=[f'{val:.1f}%' for val in progress_values],
-    textposition='auto',
-))
-
-fig.update_layout(
-    title='📊 Subject Progress Overview',
-    yaxis_title='Progress (%)',
-    showlegend=False,
-    height=400,
-    yaxis=dict(range=[0, 100])
-)
-
-st.plotly_chart(fig, use_container_width=True)
-
-# Footer
-st.markdown("---")
-st.markdown("""
-<div style='text-align: center; color: #666; margin-top: 2rem;'>
-    <p>📚 Stay consistent, track your progress, and achieve your learning goals!</p>
-    <p><em>Remember: Rest days are important for knowledge consolidation.</em></p>
-</div>
+import time
+
+# Start of the script run, for the time-to-first-interaction measurement
+RUN_STARTED = time.perf_counter()
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+from datetime import date, datetime, timedelta
+import os
+import threading
+
+from timetable.analytics import compute_analytics, event_key, make_event
+from timetable.config import configured_plan, storage_settings
+from timetable.export import FORMATS, export_file, read_progress_csv
+from timetable.legacy import load_upgraded
+from timetable.profiling import Profiler
+from timetable.progress import ProgressCounter, week_progress
+from timetable.replan import apply_layout, count_missed, layout, replan
+from timetable.notes import LazyNotes, open_blobs, sweep_notes
+from timetable.plans import PLAN_CACHE, plan_file, plan_files, plans_dir
+from timetable.search import NoteIndex, snippet
+from timetable.schedule import CODE_COLUMNS
+from timetable.sessions import Slot
+from timetable.storage import DEFAULT_USER, WriteBehindBackend, open_backend
+from timetable.styles import overlay_state
+
+# Plan definitions: the files in TIMETABLE_PLANS (default: plans/); the default one is
+# resolved like the API and the command-line tools do (TIMETABLE_PLAN_FILE or plans/default.toml).
+# Parsed and compiled plans are shared by every session (plans.PLAN_CACHE) and a file is
+# only re-read when it changes.
+PLAN_FILES = plan_files(plans_dir())
+try:
+    DEFAULT_PLAN_FILE = plan_file()
+    PLAN_FILE_DEFAULT = os.path.splitext(os.path.basename(DEFAULT_PLAN_FILE))[0]
+    PLAN_FILES.setdefault(PLAN_FILE_DEFAULT, DEFAULT_PLAN_FILE)
+
+    # Plan picked in the UI (or ?plan=name), else the default
+    PLAN_CHOICE = st.session_state.get("plan_choice") or st.query_params.get("plan", PLAN_FILE_DEFAULT)
+    if PLAN_CHOICE not in PLAN_FILES:
+        PLAN_CHOICE = PLAN_FILE_DEFAULT
+    DEFINITION = PLAN_CACHE.definition(PLAN_FILES[PLAN_CHOICE])
+except (OSError, ValueError) as exc:
+    st.error(f"Cannot load the study plan: {exc}")
+    st.stop()
+
+# Study plan shown by the app; TIMETABLE_DAYS overrides its length and
+# TIMETABLE_PLAN=solved balances sessions against the hour targets instead of the fixed rotation
+PLAN, PLAN_REPORT = configured_plan(definition=DEFINITION)
+
+# Page configuration
+st.set_page_config(
+    page_title=f"{PLAN.days}-Day Study Timetable",
+    page_icon="📚",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+# Fast-start mode (the default; TIMETABLE_FAST_START=0 turns it off): today's sessions are
+# rendered first and the schedule table and charts are only built once their section is opened
+FAST_START = os.environ.get("TIMETABLE_FAST_START", "1") != "0"
+
+# Custom CSS, read once per server process from static/app.css
+@st.cache_resource
+def load_css():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "app.css"), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+st.html(load_css())
+
+# Plotly is only imported once a chart section is opened
+def plotly_go():
+    import plotly.graph_objects as go
+    return go
+
+# Per-phase timing: enable with TIMETABLE_PROFILE=1 or ?debug=1, sample with
+# TIMETABLE_PROFILE_SAMPLE (0-1) and export to JSON lines with TIMETABLE_PROFILE_LOG
+if "profiler" not in st.session_state:
+    st.session_state.profiler = Profiler(
+        sample_rate=float(os.environ.get("TIMETABLE_PROFILE_SAMPLE", "1")),
+        log_path=os.environ.get("TIMETABLE_PROFILE_LOG")
+    )
+profiler = st.session_state.profiler
+profiler.enabled = os.environ.get("TIMETABLE_PROFILE") == "1" or st.query_params.get("debug") == "1"
+profiler.begin("run")
+
+# Storage backend: "json" (a single timetable_data.json file) or "sqlite" for multi-learner servers
+STORAGE_BACKEND, DATA_FILE = storage_settings()
+
+# Learner whose progress is shown, e.g. ?user=alice
+USER = st.query_params.get("user", DEFAULT_USER)
+
+# Saves are written behind the UI: batched after TIMETABLE_WRITE_DELAY seconds without
+# changes (0 writes synchronously) and at most TIMETABLE_MAX_STALENESS seconds late
+WRITE_DELAY = float(os.environ.get("TIMETABLE_WRITE_DELAY", "0.5"))
+MAX_STALENESS = float(os.environ.get("TIMETABLE_MAX_STALENESS", "2"))
+
+# Storage backend shared by every session of this server process
+@st.cache_resource
+def get_store():
+    store = open_backend(STORAGE_BACKEND, DATA_FILE)
+    if WRITE_DELAY > 0:
+        store = WriteBehindBackend(store, delay=WRITE_DELAY, max_delay=max(MAX_STALENESS, WRITE_DELAY))
+    return store
+
+# Note bodies, stored apart from the state as content-addressed blobs (shared by every
+# session). With write-behind they are written by the writer thread, so saving a note
+# never waits on the disk; blobs no note references any more are swept once per
+# process, off the script thread.
+@st.cache_resource
+def get_note_blobs():
+    store = get_store()
+    blobs = open_blobs(DATA_FILE, store.defer if isinstance(store, WriteBehindBackend) else None)
+    threading.Thread(target=sweep_notes, args=(store, blobs), name="timetable-note-sweep", daemon=True).start()
+    return blobs
+
+# Load saved data for the current learner and plan. This is the whole state rather than
+# load(keys=...) for the visible week: the progress counters and metrics count every
+# checkbox, search and the full table need every note ref (bodies are loaded lazily),
+# analytics read the event log, and the legacy remap checks the whole state.
+def load_data():
+    return load_upgraded(get_store(), USER, PLAN)
+
+# Save a single change for the current learner and plan (queued for the background writer)
+def save_data(section, key, value):
+    with profiler.phase("save"):
+        get_store().set(USER, PLAN.name, section, key, value)
+
+# Initialize session state with loaded data (once per browser session)
+if 'checkbox_states' not in st.session_state or 'notes' not in st.session_state:
+    with profiler.phase("load"):
+        # Taken before loading, so changes made meanwhile are merged again rather than missed
+        st.session_state.state_version = get_store().version(USER, PLAN.name)
+        persistent_data = load_data()
+    st.session_state.checkbox_states = persistent_data.get("checkbox_states", {})
+    # Only references are loaded here; a note's body is read when its day is rendered
+    st.session_state.notes = LazyNotes(persistent_data.get("notes", {}), get_note_blobs())
+    st.session_state.plan_layout = persistent_data.get("plan", {}).get("layout")
+    # Completion events in chronological order (their keys sort by timestamp)
+    events = persistent_data.get("events", {})
+    st.session_state.events = [events[key] for key in sorted(events)]
+    st.session_state.event_keys = set(events)
+
+# Merge changes saved by other tabs or processes since this session last looked.
+# Only keys whose stored value differs from this session's are applied, so our own
+# saves come back as no-ops; returns the number of keys applied.
+def merge_remote_changes():
+    version, changes = get_store().changes_since(USER, PLAN.name, st.session_state.state_version)
+    st.session_state.state_version = version
+    merged = 0
+    new_events = False
+    for section, key, value in changes:
+        if section == "checkbox_states" and st.session_state.checkbox_states.get(key, False) != value:
+            st.session_state.checkbox_states[key] = value
+            counter = st.session_state.get("progress_counter")
+            if counter is not None:
+                counter.set(key, value)
+        elif section == "notes" and st.session_state.notes.set_ref(key, value):
+            if "note_index" in st.session_state:
+                st.session_state.note_index.update(key, st.session_state.notes.get(key, ""))
+        elif section == "events" and key not in st.session_state.event_keys:
+            st.session_state.event_keys.add(key)
+            st.session_state.events.append(value)
+            new_events = True
+        elif section == "plan" and key == "layout" and st.session_state.plan_layout != value:
+            st.session_state.plan_layout = value
+            st.session_state.pop("view_week", None)
+        else:
+            continue
+        # Let the widget pick up the merged value
+        st.session_state.pop(key, None)
+        merged += 1
+    if new_events:
+        st.session_state.events.sort(key=lambda event: event[0])
+    return merged
+
+with profiler.phase("sync"):
+    merge_remote_changes()
+
+# Sessions moved by an earlier re-plan are laid over the base plan
+if st.session_state.get("plan_layout"):
+    PLAN = apply_layout(PLAN, st.session_state.plan_layout)
+
+# App title
+st.markdown(f'<div class="main-header"><h1>📚 {PLAN.days}-Day Study Timetable</h1><p>{DEFINITION.title}</p></div>', unsafe_allow_html=True)
+
+# Switching plans starts the session over with the new plan's saved state
+def switch_plan():
+    st.query_params["plan"] = st.session_state.plan_choice
+    for key in list(st.session_state):
+        if key not in ("plan_choice", "profiler"):
+            del st.session_state[key]
+
+def plan_title(name):
+    try:
+        return PLAN_CACHE.definition(PLAN_FILES[name]).title
+    except (OSError, ValueError):
+        return f"{name} (invalid)"
+
+if len(PLAN_FILES) > 1:
+    st.selectbox(
+        "Study plan", list(PLAN_FILES), index=list(PLAN_FILES).index(PLAN_CHOICE),
+        format_func=plan_title,
+        key="plan_choice", on_change=switch_plan
+    )
+
+# Session table, schedule frame and cell styles of the plan, compiled once per server
+# process and shared read-only by every session
+with profiler.phase("schedule"):
+    COMPILED = PLAN_CACHE.compiled(DEFINITION, PLAN)
+    df = COMPILED.schedule
+    sessions = COMPILED.sessions
+
+# Calculate progress based on completed sessions
+total_days = PLAN.days
+subject_names = [subject[0] for subject in PLAN.subjects]
+
+# Rebuild the progress counters from the checkbox states
+@profiler.timed("progress")
+def rebuild_progress():
+    st.session_state.progress_counter = ProgressCounter.from_states(
+        df[CODE_COLUMNS].to_numpy(),
+        sessions.to_matrix(sessions.minutes, len(df)),
+        subject_names,
+        st.session_state.checkbox_states
+    )
+    st.session_state.progress_plan = PLAN
+
+# Counters are rebuilt only on load or when the plan changes; toggles update them by delta
+if st.session_state.get("progress_plan") != PLAN:
+    rebuild_progress()
+
+# Widget callbacks: persist the change, then rerun only the affected day and the counters
+def on_session_toggle(key, day_fragment):
+    profiler.begin("toggle")
+    checked = st.session_state[key]
+    st.session_state.checkbox_states[key] = checked
+    save_data("checkbox_states", key, checked)
+    event = make_event(key, checked)
+    st.session_state.events.append(event)
+    st.session_state.event_keys.add(event_key(event))
+    save_data("events", event_key(event), event)
+    st.session_state.progress_counter.set(key, checked)
+    st.rerun([day_fragment, "week_header", "summary", "progress", "analytics", "table"])
+
+def on_notes_change(key, day_fragment):
+    profiler.begin("notes")
+    notes = st.session_state[key]
+    ref = st.session_state.notes.save(key, notes)
+    if ref is not None:
+        if "note_index" in st.session_state:
+            st.session_state.note_index.update(key, notes)
+        save_data("notes", key, ref)
+    st.rerun([day_fragment, "table"])
+
+# Progress checkboxes and notes for a single day
+def render_day(idx, row, day_fragment):
+    st.markdown(f"### {row['Day']} - {row['Date']}")
+    col1, col2 = st.columns([1, 3])
+
+    with col1:
+        day_sessions = sessions.row_slice(idx)
+        for i in range(day_sessions.start, day_sessions.stop):
+            session_key = sessions.state_key(i)
+            st.checkbox(
+                f"{Slot(sessions.slot[i]).name.title()}: {sessions.label(i)}",
+                value=st.session_state.checkbox_states.get(session_key, False),
+                key=session_key,
+                on_change=on_session_toggle,
+                args=(session_key, day_fragment)
+            )
+
+    with col2:
+        notes_key = f"notes_{idx}"
+        st.text_area(
+            "Notes",
+            value=st.session_state.notes.get(notes_key, ""),
+            key=notes_key,
+            placeholder="Add your notes or review here...",
+            on_change=on_notes_change,
+            args=(notes_key, day_fragment)
+        )
+
+# Schedule row of today's study day, if the plan has one
+def today_row():
+    today = df.index[(df["Calendar Date"] == np.datetime64(date.today())) & (df[CODE_COLUMNS] >= 0).any(axis=1)]
+    return int(today[0]) if len(today) else None
+
+# Today's sessions come first, so they can be ticked before the rest of the page is built
+TODAY_ROW = today_row()
+if TODAY_ROW is not None:
+    st.markdown("## 📍 Today")
+    st.fragment(render_day, key="today")(TODAY_ROW, df.loc[TODAY_ROW], "today")
+profiler.mark("time_to_interactive", RUN_STARTED)
+
+# Summary cards (rerun on their own when a session is toggled)
+@st.fragment(key="summary")
+@profiler.timed("summary")
+def render_summary():
+    progress = st.session_state.progress_counter.summary()
+
+    # Planned hours and session lengths come from the generated plan
+    for column, (code, (name, label, minutes)) in zip(st.columns(len(PLAN.subjects)), enumerate(PLAN.subjects)):
+        with column:
+            st.markdown(f"""
+            <div class="summary-card">
+                <h3>{label}</h3>
+                <p><strong>{progress["total_minutes"][code] / 60:.1f} Hours</strong></p>
+                <p>{progress["totals"][code]} Sessions × {minutes} min</p>
+                <p>Progress: {progress["percent"][code]:.1f}% · {progress["completed_minutes"][code] / 60:.1f} h studied</p>
+            </div>
+            """, unsafe_allow_html=True)
+            st.progress(progress["percent"][code] / 100)
+
+render_summary()
+
+if PLAN_REPORT is not None:
+    with st.expander("🎯 Planned vs target hours"):
+        st.dataframe(PLAN_REPORT.round(2), hide_index=True)
+
+# Legend
+st.markdown(COMPILED.legend, unsafe_allow_html=True)
+
+# Display schedule
+st.markdown(f"## 📅 Complete {PLAN.days}-Day Schedule")
+
+# Schedule table with the completion/notes overlay, cached per plan and state
+# (notes are keyed by their blob references, so bodies are only read on a miss)
+@st.cache_resource(max_entries=16)
+def build_table(spec, completed, note_refs, _schedule, _notes):
+    return overlay_state(_schedule, completed, _notes)
+
+# Schedule table (reruns on its own when a session or note changes)
+@st.fragment(key="table")
+@profiler.timed("table")
+def render_table():
+    section = st.expander("Full schedule table", expanded=not FAST_START, key="show_table", on_change="rerun")
+    if not section.open:
+        return
+    with section:
+        notes = st.session_state.notes
+        table = build_table(PLAN, st.session_state.progress_counter.done, notes.version_key(), df, notes)
+        styles = COMPILED.styles
+        styled_df = table.style.apply(lambda _: styles, axis=None)
+        st.dataframe(styled_df, use_container_width=True, height=len(df) * 35 + 100)  # Full view mode
+
+# Weeks of the plan and the week containing today (clamped to the plan)
+n_weeks = int(df["Week Number"].max())
+
+def current_week():
+    week_starts = df.loc[df["Week"] != "", "Calendar Date"].to_numpy()
+    week = int(np.searchsorted(week_starts, np.datetime64(date.today()), side="right"))
+    return min(max(week, 1), n_weeks)
+
+# Navigation callbacks for the daily section
+def shift_week(step):
+    profiler.begin("navigate")
+    st.session_state.view_week = min(max(st.session_state.view_week + step, 1), n_weeks)
+
+def show_current_week():
+    profiler.begin("navigate")
+    st.session_state.view_week = current_week()
+
+def jump_to_date():
+    profiler.begin("navigate")
+    picked = st.session_state.jump_date
+    if picked is not None:
+        matches = df.index[df["Calendar Date"] == np.datetime64(picked)]
+        if len(matches):
+            st.session_state.view_week = int(df.at[matches[0], "Week Number"])
+
+# Compact completion summary for weeks that are not rendered as widgets
+def week_summary(weeks, totals, completed):
+    rows = df[(df["Week"] == "") & df["Week Number"].isin(weeks)]
+    spans = rows.groupby("Week Number", observed=True)["Date"].agg(["first", "last"]).astype(str)
+    return pd.DataFrame({
+        "Week": [f"WEEK {week}" for week in spans.index],
+        "Dates": spans["first"] + " – " + spans["last"],
+        "Completed": [f"{completed[week - 1]}/{totals[week - 1]}" for week in spans.index],
+    })
+
+# Scheduled and completed sessions per week, from the stored checkbox states
+def weekly_counts():
+    return week_progress(
+        df["Week Number"].to_numpy(), df[CODE_COLUMNS].to_numpy(), st.session_state.progress_counter.done
+    )
+
+# Completion count of the week in view (reruns on its own when a session is toggled)
+@st.fragment(key="week_header")
+def render_week_header(week):
+    totals, completed = weekly_counts()
+    st.markdown(f"### WEEK {week} · {completed[week - 1]}/{totals[week - 1]} sessions completed")
+
+# Daily progress and notes, one week at a time; widgets are only created for the week in view
+@st.fragment(key="days")
+@profiler.timed("widgets")
+def render_days():
+    if "view_week" not in st.session_state:
+        st.session_state.view_week = current_week()
+    view_week = st.session_state.view_week
+
+    nav1, nav2, nav3, nav4 = st.columns([1, 1, 1, 2])
+    with nav1:
+        st.button("◀ Previous week", on_click=shift_week, args=(-1,), disabled=view_week <= 1)
+    with nav2:
+        st.button("📍 This week", on_click=show_current_week)
+    with nav3:
+        st.button("Next week ▶", on_click=shift_week, args=(1,), disabled=view_week >= n_weeks)
+    with nav4:
+        st.date_input(
+            "Jump to date",
+            value=None,
+            min_value=df["Calendar Date"].iloc[0].date(),
+            max_value=df["Calendar Date"].iloc[-1].date(),
+            key="jump_date",
+            on_change=jump_to_date
+        )
+
+    if view_week > 1:
+        with st.expander(f"Earlier weeks (1–{view_week - 1})"):
+            totals, completed = weekly_counts()
+            st.dataframe(week_summary(range(1, view_week), totals, completed), hide_index=True)
+
+    render_week_header(view_week)
+    week_rows = df[(df["Week Number"] == view_week) & (df[CODE_COLUMNS] >= 0).any(axis=1)]
+    for idx, row in week_rows.iterrows():
+        if idx == TODAY_ROW:
+            st.caption(f"📍 {row['Day']} - {row['Date']} is today: its sessions are at the top of the page.")
+            continue
+        day_fragment = f"day_{idx}"
+        st.fragment(render_day, key=day_fragment)(idx, row, day_fragment)
+
+    if view_week < n_weeks:
+        with st.expander(f"Later weeks ({view_week + 1}–{n_weeks})"):
+            totals, completed = weekly_counts()
+            st.dataframe(week_summary(range(view_week + 1, n_weeks + 1), totals, completed), hide_index=True)
+
+# Move missed sessions onto the days from today on and keep the new layout
+def replan_missed():
+    profiler.begin("replan")
+    new_plan, first, moved = replan(PLAN, st.session_state.progress_counter.done, date.today())
+    if moved:
+        previous = st.session_state.get("plan_layout")
+        if previous:
+            first = min(first, previous["from_day"])
+        st.session_state.plan_layout = layout(new_plan, first)
+        save_data("plan", "layout", st.session_state.plan_layout)
+        st.session_state.pop("view_week", None)
+
+# Inverted index over the notes, built on the first search (it reads every note body)
+# and updated on every note save after that
+def note_index():
+    if "note_index" not in st.session_state:
+        st.session_state.note_index = NoteIndex(st.session_state.notes)
+    return st.session_state.note_index
+
+# Show the week of a search result in the daily section
+def jump_to_note(row):
+    profiler.begin("navigate")
+    st.session_state.view_week = int(df.at[row, "Week Number"])
+    st.rerun(["search", "days"])
+
+# Search box over the notes; results link to their day
+@st.fragment(key="search")
+@profiler.timed("search")
+def render_search():
+    query = st.text_input("🔍 Search notes", key="note_query", placeholder="Search your notes...")
+    if not query.strip():
+        return
+    results = note_index().search(query, limit=10)
+    if not results:
+        st.caption("No matching notes.")
+        return
+    for key, _score in results:
+        row = int(key.rpartition("_")[2])
+        if row not in df.index:
+            continue
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.markdown(f"**{df.at[row, 'Day']} - {df.at[row, 'Date']}** · {snippet(st.session_state.notes[key], query)}")
+        with col2:
+            st.button("Go to day", key=f"search_{key}", on_click=jump_to_note, args=(row,))
+
+# Function to display the table and checkboxes/notes
+def display_schedule_with_checkboxes():
+    render_table()
+
+    st.markdown("## 📋 Daily Progress and Notes")
+    missed = count_missed(PLAN, st.session_state.progress_counter.done, date.today())
+    if missed:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.warning(f"{missed} session{'s' if missed != 1 else ''} scheduled before today {'are' if missed != 1 else 'is'} not completed.")
+        with col2:
+            st.button("🔁 Re-plan remaining sessions", on_click=replan_missed)
+    render_search()
+    render_days()
+
+# Display the schedule with checkboxes and notes
+display_schedule_with_checkboxes()
+
+# Progress tracking section
+st.markdown("## 📈 Progress Tracking")
+
+# Metrics and chart (rerun on their own when a session is toggled)
+@st.fragment(key="progress")
+@profiler.timed("chart")
+def render_progress():
+    progress = st.session_state.progress_counter.summary()
+    columns = st.columns(len(PLAN.subjects) + 1)
+
+    with columns[0]:
+        st.metric(
+            label="📚 Sessions Completed",
+            value=f"{progress['completed_total']}/{progress['total']}",
+            delta=f"{progress['overall']:.1f}% Complete"
+        )
+
+    for column, (code, (name, label, minutes)) in zip(columns[1:], enumerate(PLAN.subjects)):
+        with column:
+            st.metric(
+                label=f"{label} Sessions",
+                value=f"{progress['completed'][code]}/{progress['totals'][code]}",
+                delta=f"{progress['percent'][code]:.1f}% Complete"
+            )
+
+    # Progress visualization, built only while its section is open
+    chart = st.expander("📊 Subject Progress Overview", expanded=not FAST_START, key="show_progress_chart", on_change="rerun")
+    if not chart.open:
+        return
+    go = plotly_go()
+    with chart:
+        fig = go.Figure()
+
+        progress_values = [float(value) for value in progress["percent"]]
+
+        fig.add_trace(go.Bar(
+            x=subject_names,
+            y=progress_values,
+            marker_color=COMPILED.colors,
+            text=[f'{val:.1f}%' for val in progress_values],
+            textposition='auto',
+        ))
+
+        fig.update_layout(
+            title='📊 Subject Progress Overview',
+            yaxis_title='Progress (%)',
+            showlegend=False,
+            height=400,
+            yaxis=dict(range=[0, 100])
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+render_progress()
+
+# Study analytics from the completion event log
+st.markdown("## 📊 Study Analytics")
+
+# Analytics are cached per plan, learner, event-log version and completion matrix (packed to
+# bits: imports and changes merged from other tools update it without recording events),
+# so they only recompute when either changes
+@st.cache_data(max_entries=32)
+def build_analytics(spec, user, version, done_bits, today, n_rows, _sessions, _events, _done):
+    return compute_analytics(_sessions, _events, _done, n_rows, today)
+
+# Burndown, minutes studied, streaks and velocity (rerun on their own when a session is toggled)
+@st.fragment(key="analytics")
+@profiler.timed("analytics")
+def render_analytics():
+    section = st.expander("Burndown, streaks and velocity", expanded=not FAST_START, key="show_analytics", on_change="rerun")
+    if not section.open:
+        return
+    go = plotly_go()
+    with section:
+        events = st.session_state.events
+        done = st.session_state.progress_counter.done
+        analytics = build_analytics(
+            PLAN, USER, len(events), np.packbits(done).tobytes(), date.today(), len(df), sessions, events, done
+        )
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric(label="🔥 Current Streak", value=f"{analytics['current_streak']} days")
+        with col2:
+            st.metric(label="🏆 Longest Streak", value=f"{analytics['longest_streak']} days")
+        with col3:
+            st.metric(label="⏱️ This Week", value=f"{analytics['weekly'].iloc[-1] / 60:.1f} h" if len(analytics["weekly"]) else "0.0 h")
+
+        burndown_tab, daily_tab, weekly_tab, velocity_tab = st.tabs(["Burndown", "Daily minutes", "Weekly minutes", "Velocity"])
+        with burndown_tab:
+            burndown = analytics["burndown"]
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(x=burndown.index, y=burndown["Planned"], name="Planned", line=dict(dash="dash")))
+            fig.add_trace(go.Scatter(x=burndown.index, y=burndown["Actual"], name="Actual"))
+            fig.update_layout(title="📉 Hours remaining", yaxis_title="Hours", height=400)
+            st.plotly_chart(fig, use_container_width=True)
+        with daily_tab:
+            daily = analytics["daily"]
+            st.plotly_chart(go.Figure(go.Bar(x=daily.index, y=daily.to_numpy())).update_layout(
+                title="Minutes studied per day", yaxis_title="Minutes", height=400
+            ), use_container_width=True)
+        with weekly_tab:
+            weekly = analytics["weekly"]
+            st.plotly_chart(go.Figure(go.Bar(x=weekly.index, y=weekly.to_numpy() / 60)).update_layout(
+                title="Hours studied per week", yaxis_title="Hours", height=400
+            ), use_container_width=True)
+        with velocity_tab:
+            st.dataframe(analytics["velocity"].round(2), hide_index=True)
+            if not analytics["events"]:
+                st.caption("Velocity is measured from completion events; tick off sessions to start recording them.")
+
+render_analytics()
+
+# Export and import of the schedule with progress and notes
+st.markdown("## 💾 Export & Import")
+
+# Deferred download: the file is streamed out only when the button is clicked
+def export_download(fmt, done, notes):
+    return lambda: export_file(fmt, sessions, done, notes)
+
+# Apply the Done column of an uploaded CSV export
+def import_progress():
+    uploaded = st.session_state.progress_upload
+    if uploaded is None:
+        return
+    profiler.begin("import")
+    counter = st.session_state.progress_counter
+    changed = 0
+    for key, checked in read_progress_csv(uploaded, sessions):
+        if st.session_state.checkbox_states.get(key, False) != checked:
+            st.session_state.checkbox_states[key] = checked
+            save_data("checkbox_states", key, checked)
+            counter.set(key, checked)
+            # Let the checkbox pick up the imported value
+            st.session_state.pop(key, None)
+            changed += 1
+    st.session_state.import_result = changed
+
+export_columns = st.columns(len(FORMATS) + 1)
+for column, (fmt, (mime, extension)) in zip(export_columns, FORMATS.items()):
+    with column:
+        st.download_button(
+            f"⬇️ {fmt.upper()}",
+            data=export_download(fmt, st.session_state.progress_counter.done, st.session_state.notes),
+            file_name=f"timetable_{PLAN.name}.{extension}",
+            mime=mime,
+            on_click="ignore"
+        )
+with export_columns[-1]:
+    st.file_uploader("Import progress (CSV export)", type="csv", key="progress_upload")
+    st.button("Import progress", on_click=import_progress)
+    if "import_result" in st.session_state:
+        st.caption(f"Updated {st.session_state.import_result} sessions from the last import.")
+
+# Seconds between checks for changes made in other tabs (TIMETABLE_SYNC_SECONDS, 0 = off)
+SYNC_SECONDS = float(os.environ.get("TIMETABLE_SYNC_SECONDS", "5"))
+
+# Polls the store's version; the page reruns only when another tab changed something
+def sync_remote_changes():
+    if merge_remote_changes():
+        st.rerun()
+
+if SYNC_SECONDS > 0:
+    st.fragment(sync_remote_changes, run_every=SYNC_SECONDS)()
+
+# Timing debug panel (sidebar, only when profiling is enabled)
+@st.fragment
+def render_debug_panel():
+    st.markdown("### ⏱️ Phase timings")
+    st.button("Refresh timings")
+    runs = profiler.runs()
+    if runs:
+        st.dataframe(pd.DataFrame([
+            {"Run": run["run"], "Kind": run["kind"], **{name: round(ms, 1) for name, ms in run["phases"].items()},
+             "Total": round(run["total_ms"], 1),
+             **{"TTI" if name == "time_to_interactive" else name: round(ms, 1) for name, ms in run["marks"].items()}}
+            for run in runs
+        ]), hide_index=True)
+    else:
+        st.caption("No sampled runs yet.")
+    st.caption(f"Sampling {profiler.sample_rate:.0%} of runs" +
+               (f" · logging to {profiler.log_path}" if profiler.log_path else ""))
+
+if profiler.enabled:
+    with st.sidebar:
+        render_debug_panel()
+
+# Footer
+st.markdown("---")
+st.markdown("""
+<div style='text-align: center; color: #666; margin-top: 2rem;'>
+    <p>📚 Stay consistent, track your progress, and achieve your learning goals!</p>
+    <p><em>Remember: Rest days are important for knowledge consolidation.</em></p>
+</div>
 """, unsafe_allow_html=True)
\ No newline at end of file
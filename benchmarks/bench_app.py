@@ -0,0 +1,241 @@
+# Headless benchmark of app.py across plan sizes, note volumes and toggle patterns.
+#
+# Drives the app with Streamlit's AppTest and reports cold-start time,
+# time to first interaction (today's checkboxes rendered), per-interaction
+# rerun latency, save_data cost and peak memory. Results are
+# written as JSON so runs from different versions can be compared:
+#
+#     python benchmarks/bench_app.py --output before.json
+#     python benchmarks/bench_app.py --output after.json --compare before.json
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+sys.path.insert(0, ROOT)
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from timetable.plans import default_definition  # noqa: E402
+from timetable.schedule import generate_sessions  # noqa: E402
+from timetable.storage import DEFAULT_PLAN_NAME, DEFAULT_USER, atomic_write_json, open_backend  # noqa: E402
+
+PLAN_DAYS = [45, 365, 3650]
+NOTE_VOLUMES = [0, 100, 1000]
+PATTERNS = ["repeat", "sweep", "navigate"]
+NOTE_TEXT = "Reviewed the session, worked through the exercises and wrote down open questions. " * 3
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def timings(values):
+    return {
+        "median_ms": statistics.median(values) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "max_ms": max(values) * 1000,
+    }
+
+
+# State file with `notes` notes spread over the plan's session rows
+def seed_state(directory, backend, days, notes):
+    sessions = generate_sessions(replace(default_definition().spec, days=days))
+    rows = sorted(set(sessions.row.tolist()))[:notes]
+    state = {"checkbox_states": {}, "notes": {f"notes_{row}": NOTE_TEXT for row in rows}}
+    if backend == "json":
+        atomic_write_json(os.path.join(directory, "timetable_data.json"), state)
+    else:
+        store = open_backend("sqlite", os.path.join(directory, "timetable_data.db"))
+        for key, value in state["notes"].items():
+            store.set(DEFAULT_USER, DEFAULT_PLAN_NAME, "notes", key, value)
+        store.close()
+    return len(rows)
+
+
+# One interaction of the given pattern; returns its wall time
+def interact(at, pattern, step):
+    if pattern == "repeat":
+        checkbox = at.checkbox[0]
+        action = checkbox.uncheck() if checkbox.value else checkbox.check()
+    elif pattern == "sweep":
+        checkbox = at.checkbox[step % len(at.checkbox)]
+        action = checkbox.uncheck() if checkbox.value else checkbox.check()
+    else:
+        label = "◀ Previous week" if step % 2 else "Next week ▶"
+        button = next(b for b in at.button if b.label == label)
+        if button.disabled:
+            label = "Next week ▶" if step % 2 else "◀ Previous week"
+            button = next(b for b in at.button if b.label == label)
+        action = button.click()
+    start = time.perf_counter()
+    action.run()
+    return time.perf_counter() - start
+
+
+# Time-to-interactive marks of the app runs, in order, from the profiler's JSON-lines log
+def interactive_marks(log_path):
+    if not os.path.exists(log_path):
+        return []
+    with open(log_path, encoding="utf-8") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    return [event["ms"] / 1000 for event in events if event.get("mark") and event["phase"] == "time_to_interactive"]
+
+
+def bench_app(days, notes, backend, interactions, fast_start=True):
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        seeded = seed_state(directory, backend, days, notes)
+        log_path = os.path.join(directory, "profile.jsonl")
+        os.environ["TIMETABLE_DAYS"] = str(days)
+        os.environ["TIMETABLE_STORAGE"] = backend
+        os.environ["TIMETABLE_FAST_START"] = "1" if fast_start else "0"
+        os.environ["TIMETABLE_PROFILE"] = "1"
+        os.environ["TIMETABLE_PROFILE_LOG"] = log_path
+        os.environ.pop("TIMETABLE_DATA", None)
+        os.chdir(directory)
+        try:
+            tracemalloc.start()
+            start = time.perf_counter()
+            at = AppTest.from_file(APP, default_timeout=600).run()
+            cold_start = time.perf_counter() - start
+            if at.exception:
+                raise RuntimeError(f"app raised during cold start: {at.exception}")
+
+            warm = []
+            for _ in range(3):
+                start = time.perf_counter()
+                at.run()
+                warm.append(time.perf_counter() - start)
+            # The first mark is the cold run; the next three are the warm reruns
+            marks = interactive_marks(log_path)
+
+            patterns = {}
+            for pattern in PATTERNS:
+                latencies = []
+                for step in range(interactions):
+                    # Fragment reruns leave only the rerun fragments in AppTest's tree,
+                    # so restore the full page before each timed interaction
+                    at.run()
+                    latencies.append(interact(at, pattern, step))
+                    if at.exception:
+                        raise RuntimeError(f"app raised during {pattern}: {at.exception}")
+                patterns[pattern] = timings(latencies)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            os.chdir(cwd)
+    return {
+        "days": days,
+        "notes": seeded,
+        "backend": backend,
+        "fast_start": fast_start,
+        "cold_start_ms": cold_start * 1000,
+        "time_to_interactive_ms": marks[0] * 1000 if marks else None,
+        "warm_time_to_interactive": timings(marks[1:4]) if len(marks) > 1 else None,
+        "full_rerun": timings(warm),
+        "interactions": patterns,
+        "peak_memory_mb": peak / 2 ** 20,
+    }
+
+
+# Cost of persisting a single note change against a store holding `notes` notes
+def bench_save(days, notes, backend, repeats=200):
+    with tempfile.TemporaryDirectory() as directory:
+        seed_state(directory, backend, days, notes)
+        name = "timetable_data.json" if backend == "json" else "timetable_data.db"
+        store = open_backend(backend, os.path.join(directory, name))
+        store.load(DEFAULT_USER, DEFAULT_PLAN_NAME)
+        samples = []
+        for i in range(repeats):
+            start = time.perf_counter()
+            store.set(DEFAULT_USER, DEFAULT_PLAN_NAME, "notes", f"notes_{i % max(notes, 1)}", f"{NOTE_TEXT} {i}")
+            samples.append(time.perf_counter() - start)
+        store.close()
+    return timings(samples)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    index = {(r["days"], r["notes"], r["backend"]): r for r in baseline["runs"]}
+    print(f"\nCompared with {baseline_path} ({baseline.get('revision')}):")
+    for run in results["runs"]:
+        old = index.get((run["days"], run["notes"], run["backend"]))
+        if old is None:
+            continue
+        rows = [("cold start", old["cold_start_ms"], run["cold_start_ms"])]
+        if old.get("time_to_interactive_ms") and run["time_to_interactive_ms"]:
+            rows.append(("tti", old["time_to_interactive_ms"], run["time_to_interactive_ms"]))
+        rows += [
+            (pattern, old["interactions"][pattern]["median_ms"], run["interactions"][pattern]["median_ms"])
+            for pattern in run["interactions"] if pattern in old["interactions"]
+        ]
+        rows.append(("save", old["save"]["median_ms"], run["save"]["median_ms"]))
+        label = f"{run['days']}d/{run['notes']}n/{run['backend']}"
+        print(label + "  " + "  ".join(f"{name} {new / old_ms:.2f}x" for name, old_ms, new in rows if old_ms))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmark of app.py")
+    parser.add_argument("--days", type=int, nargs="+", default=PLAN_DAYS)
+    parser.add_argument("--notes", type=int, nargs="+", default=NOTE_VOLUMES)
+    parser.add_argument("--backend", choices=["json", "sqlite"], nargs="+", default=["json"])
+    parser.add_argument("--interactions", type=int, default=10)
+    parser.add_argument("--output", default="bench_app.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--no-fast-start", dest="fast_start", action="store_false",
+                        help="build the schedule table and charts up front (TIMETABLE_FAST_START=0)")
+    args = parser.parse_args()
+
+    results = {
+        "revision": git_revision(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "streamlit": st.__version__,
+        "runs": [],
+    }
+    print(f"{'days':>5} {'notes':>5} {'backend':>7} {'cold ms':>8} {'tti ms':>7} {'repeat':>7} {'sweep':>7} "
+          f"{'nav':>7} {'save ms':>8} {'peak MB':>8}")
+    for days in args.days:
+        for notes in args.notes:
+            for backend in args.backend:
+                run = bench_app(days, notes, backend, args.interactions, args.fast_start)
+                run["save"] = bench_save(days, run["notes"], backend)
+                results["runs"].append(run)
+                i = run["interactions"]
+                tti = run["time_to_interactive_ms"] or float("nan")
+                print(f"{days:>5} {run['notes']:>5} {backend:>7} {run['cold_start_ms']:>8.0f} {tti:>7.0f} "
+                      f"{i['repeat']['median_ms']:>7.1f} {i['sweep']['median_ms']:>7.1f} "
+                      f"{i['navigate']['median_ms']:>7.1f} {run['save']['median_ms']:>8.3f} "
+                      f"{run['peak_memory_mb']:>8.1f}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Benchmark the compiled kernels against their pure-Python fallbacks, and the
+# end-to-end schedule/style/progress build, on large plans.
+#
+#     python setup.py build_ext --inplace
+#     python benchmarks/bench_kernels.py
+import os
+import sys
+import time
+from dataclasses import replace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable import _kernels_py as pure  # noqa: E402
+from timetable.plans import CompiledPlan, default_definition  # noqa: E402
+from timetable.schedule import CODE_COLUMNS, _calendar, generate_schedule, generate_sessions  # noqa: E402
+
+try:
+    from timetable import _kernels as compiled  # noqa: E402
+except ImportError:
+    compiled = None
+
+PLAN_DAYS = [365, 3650, 20000]
+REPEATS = 5
+
+
+def best_of(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# (name, callable taking a kernel module) for every kernel, on the inputs of one plan
+def kernel_cases(spec):
+    sessions = generate_sessions(spec)
+    df = generate_schedule(spec, sessions)
+    dates, is_rest = _calendar(spec)
+    names = [subject[0] for subject in spec.subjects]
+    rotation = np.array([[names.index(name) for name in pair] for pair in spec.rotation])
+    codes = df[CODE_COLUMNS].to_numpy()
+    minutes = sessions.to_matrix(sessions.minutes, len(df))
+    rng = np.random.default_rng(0)
+    states = {sessions.state_key(i): bool(rng.random() < 0.5) for i in range(len(sessions))}
+    done = pure.completion_matrix(states, len(df))
+    week, day, morning = df["Week"].to_numpy(), df["Day"].to_numpy(), df["Morning Session"].to_numpy()
+    kinds = pure.row_kinds(week, day, morning)
+    labels = [subject[1] for subject in spec.subjects]
+    return [
+        ("session_layout", lambda k: k.session_layout(is_rest, rotation, len(names), spec.week_length)),
+        ("day_dates", lambda k: k.day_dates(dates.to_numpy())),
+        ("session_labels", lambda k: k.session_labels(sessions.subject, sessions.ordinal, sessions.minutes, labels)),
+        ("row_kinds", lambda k: k.row_kinds(week, day, morning)),
+        ("style_cells", lambda k: k.style_cells(kinds, codes, 8, (3, 4), "h", "h1", "r", "r1", ["a", "b", "c"])),
+        ("completion_matrix", lambda k: k.completion_matrix(states, len(df))),
+        ("progress_counts", lambda k: k.progress_counts(codes, minutes, done, len(names))),
+    ]
+
+
+def main():
+    if compiled is None:
+        print("Compiled kernels not built (python setup.py build_ext --inplace); timing the fallback only.")
+    print(f"{'days':>7} {'kernel':<18} {'python ms':>10} {'compiled ms':>12} {'speedup':>8}")
+    for days in PLAN_DAYS:
+        spec = replace(default_definition().spec, days=days)
+        for name, run in kernel_cases(spec):
+            python_ms = best_of(lambda: run(pure)) * 1000
+            compiled_ms = best_of(lambda: run(compiled)) * 1000 if compiled else float("nan")
+            print(f"{days:>7} {name:<18} {python_ms:>10.2f} {compiled_ms:>12.2f} {python_ms / compiled_ms:>7.1f}x")
+
+    # Whole schedule + style matrix build with whichever kernels timetable.kernels picked
+    print()
+    print(f"{'days':>7} {'schedule + styles ms':>21}")
+    definition = default_definition()
+    for days in PLAN_DAYS:
+        spec = replace(definition.spec, days=days)
+        build_ms = best_of(lambda: CompiledPlan(definition, spec)) * 1000
+        print(f"{days:>7} {build_ms:>21.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Benchmark the vectorized progress engine against the old iterrows() loop.
+#
+#     python benchmarks/bench_progress.py
+import os
+import sys
+import time
+from dataclasses import replace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable.progress import completion_matrix, compute_progress  # noqa: E402
+from timetable.plans import default_definition  # noqa: E402
+from timetable.schedule import CODE_COLUMNS, generate_schedule  # noqa: E402
+
+PLAN_DAYS = [45, 365, 3650, 20000]
+REPEATS = 5
+
+
+# The counting loop the app used before the progress engine
+def legacy_count(df, checkbox_states):
+    counts = {"API": 0, "Statistics": 0, "LLM": 0}
+    total = 0
+    for idx, row in df.iterrows():
+        if 'REST DAY' in str(row['Morning Session']) or (not row['Morning Session'] and not row['Evening Session']):
+            continue
+        for slot, column in (("morning", 'Morning Session'), ("evening", 'Evening Session')):
+            if checkbox_states.get(f"{slot}_{idx}", False):
+                total += 1
+                if '🔧 API' in str(row[column]):
+                    counts["API"] += 1
+                elif '📊 Statistics' in str(row[column]):
+                    counts["Statistics"] += 1
+                elif '🤖 LLM' in str(row[column]):
+                    counts["LLM"] += 1
+    return total, counts
+
+
+def best_of(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'days':>7} {'sessions':>9} {'engine ms':>10} {'legacy ms':>10}")
+    for days in PLAN_DAYS:
+        df = generate_schedule(replace(default_definition().spec, days=days))
+        codes = df[CODE_COLUMNS].to_numpy()
+        states = {
+            f"{slot}_{idx}": bool(rng.random() < 0.5)
+            for idx in range(len(df)) for slot in ("morning", "evening")
+        }
+
+        def engine():
+            compute_progress(codes, completion_matrix(states, len(df)), len(default_definition().spec.subjects))
+
+        engine_ms = best_of(engine) * 1000
+        legacy_ms = best_of(lambda: legacy_count(df, states), repeats=1) * 1000 if days <= 3650 else float("nan")
+        print(f"{days:>7} {int((codes >= 0).sum()):>9} {engine_ms:>10.2f} {legacy_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# Benchmark the schedule solver on long plans with many subjects.
+#
+#     python benchmarks/bench_solver.py
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable.solver import solve_plan  # noqa: E402
+
+PLAN_DAYS = [45, 365, 3650]
+SUBJECT_COUNTS = [3, 12]
+LENGTHS = [30, 45, 50, 60, 75, 90]
+
+
+def main():
+    print(f"{'days':>5} {'subjects':>8} {'solve ms':>9} {'max dev h':>10}")
+    for days in PLAN_DAYS:
+        for n_subjects in SUBJECT_COUNTS:
+            # Targets fill about 80% of the two daily slots
+            subjects = {}
+            for i in range(n_subjects):
+                minutes = LENGTHS[i % len(LENGTHS)]
+                subjects[f"S{i}"] = {"minutes": minutes, "target_hours": days * 1.6 / n_subjects * minutes / 60}
+            start = time.perf_counter()
+            _spec, report = solve_plan(date(2025, 1, 6), days, subjects)
+            elapsed = time.perf_counter() - start
+            print(f"{days:>5} {n_subjects:>8} {elapsed * 1000:>9.1f} {report['Deviation Hours'].abs().max():>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import os
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from timetable.cohort import ON_TRACK, cohort_report, scan
+from timetable.config import configured_plan, storage_settings
+
+# Admin view of a study group: streamlit run cohort_app.py
+# Reads the directory or SQLite store in TIMETABLE_COHORT (default: the app's storage)
+PLAN, _PLAN_REPORT = configured_plan()
+subject_names = [subject[0] for subject in PLAN.subjects]
+
+st.set_page_config(page_title="Study Group Progress", page_icon="👥", layout="wide")
+st.markdown("# 👥 Study Group Progress")
+
+
+def default_source():
+    kind, path = storage_settings()
+    return path if kind == "sqlite" else os.path.dirname(os.path.abspath(path))
+
+
+# Summaries per learner and source, kept across reruns and sessions; entries are
+# re-read only when their file (or SQLite version) changes
+@st.cache_resource
+def summary_cache(source):
+    return {}, threading.Lock()
+
+
+source = st.text_input("Learner states (directory or SQLite store)", os.environ.get("TIMETABLE_COHORT", default_source()))
+col1, col2 = st.columns([3, 1])
+with col1:
+    on_track = st.slider("On track with at least this share of due sessions done", 0.5, 1.0, ON_TRACK, 0.05)
+with col2:
+    today = st.date_input("As of", date.today())
+    st.button("🔄 Refresh")
+
+if not os.path.exists(source):
+    st.warning(f"{source} does not exist.")
+    st.stop()
+
+cache, lock = summary_cache(source)
+with lock:
+    summaries = scan(source, PLAN, today, cache)
+report = cohort_report(summaries, subject_names, today, on_track)
+learners = report["learners"]
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("👥 Learners", len(learners))
+with col2:
+    st.metric("🎯 On track", f"{report['on_track_percent']:.1f}%")
+with col3:
+    st.metric("📚 Median completion", f"{learners['Percent'].median():.1f}%" if len(learners) else "–")
+
+st.markdown("## 📊 Completion by subject")
+st.dataframe(report["distribution"].round(1))
+if len(learners):
+    bins = np.arange(0, 101, 10)
+    st.bar_chart(pd.DataFrame(
+        {name: np.histogram(learners[name], bins=bins)[0] for name in subject_names},
+        index=[f"{low}–{low + 10}%" for low in bins[:-1]],
+    ))
+
+st.markdown("## 🐢 Furthest behind")
+if len(report["laggards"]):
+    st.dataframe(report["laggards"].round(2), hide_index=True)
+else:
+    st.caption("Everyone is up to date.")
+
+with st.expander("All learners"):
+    st.dataframe(learners.round(2), hide_index=True)
+
+if report["errors"]:
+    with st.expander(f"⚠️ {len(report['errors'])} unreadable states"):
+        st.dataframe(pd.DataFrame({"Learner": list(report["errors"]), "Error": list(report["errors"].values())}),
+                     hide_index=True)
@@ -0,0 +1,18 @@
+# Builds the optional compiled kernels; without Cython or a C compiler the package
+# installs as pure Python and timetable.kernels falls back to _kernels_py.
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [Extension("timetable._kernels", ["timetable/_kernels.pyx"], optional=True)], language_level=3
+    )
+
+setup(
+    name="timetable",
+    packages=["timetable"],
+    ext_modules=ext_modules,
+)
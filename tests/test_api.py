@@ -0,0 +1,124 @@
+# The service behind the HTTP API, and the Starlette app parsing requests into its calls
+import asyncio
+import json
+
+import pytest
+
+from timetable.api import TimetableService, create_app
+from timetable.notes import open_blobs
+from timetable.plans import default_definition
+from timetable.storage import JsonBackend
+
+
+@pytest.fixture
+def service(tmp_path):
+    path = str(tmp_path / "timetable_data.json")
+    store = JsonBackend(path)
+    yield TimetableService(store, default_definition().spec, open_blobs(path))
+    store.close()
+
+
+def test_list_sessions_filters_and_pages(service):
+    page = service.list_sessions("alice", subject="API", limit=3)
+    assert page["total"] > 3
+    assert [session["id"] for session in page["sessions"]] == ["API-1", "API-2", "API-3"]
+    assert service.list_sessions("alice", subject="API", offset=2, limit=1)["sessions"][0]["id"] == "API-3"
+    assert all(session["slot"] == "evening" for session in service.list_sessions("alice", slot="evening")["sessions"])
+
+
+def test_toggle_and_progress(service):
+    session = service.toggle("alice", "API-1")
+    assert session["done"] is True
+    assert service.toggle("alice", "API-1", done=True)["done"] is True
+    assert service.list_sessions("alice", done=True)["total"] == 1
+
+    progress = service.progress("alice")
+    assert progress["completed"] == 1
+    assert progress["subjects"]["API"]["completed"] == 1
+    assert service.progress("bob")["completed"] == 0
+
+    assert service.toggle("alice", "API-1")["done"] is False
+    assert service.progress("alice")["completed"] == 0
+
+
+def test_notes_are_stored_per_study_day(service):
+    day = service.list_sessions("alice", limit=1)["sessions"][0]["date"]
+    service.set_notes("alice", day, "Read the FastAPI docs")
+    first = service.list_sessions("alice", limit=1)["sessions"][0]
+    assert first["notes"] == "Read the FastAPI docs"
+
+
+def test_batch_is_validated_before_anything_is_written(service):
+    with pytest.raises(KeyError):
+        service.apply("alice", [{"session": "API-1", "done": True}, {"session": "API-999"}])
+    with pytest.raises(ValueError):
+        service.apply("alice", [{"session": "API-1", "done": "yes"}])
+    with pytest.raises(ValueError):
+        service.apply("alice", [{"done": True}])
+    assert service.progress("alice")["completed"] == 0
+
+    assert service.apply("alice", [{"session": "API-1", "done": True}, {"session": "LLM-1", "done": True}]) == {"applied": 2}
+    assert service.progress("alice")["completed"] == 2
+
+
+def test_invalid_filters_are_rejected(service):
+    with pytest.raises(ValueError):
+        service.list_sessions("alice", subject="Chemistry")
+    with pytest.raises(ValueError):
+        service.list_sessions("alice", slot="night")
+    with pytest.raises(KeyError):
+        service.set_notes("alice", "1999-01-01", "before the plan")
+
+
+# Call the ASGI app directly (its test client needs httpx); returns (status, JSON body)
+def call(app, method, path, query="", body=b""):
+    messages = []
+    scope = {
+        "type": "http", "http_version": "1.1", "method": method, "scheme": "http", "path": path,
+        "raw_path": path.encode(), "root_path": "", "query_string": query.encode(),
+        "headers": [(b"content-type", b"application/json")], "server": ("testserver", 80), "client": ("test", 1),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = next(message for message in messages if message["type"] == "http.response.start")
+    content = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+    return start["status"], json.loads(content)
+
+
+@pytest.fixture
+def app(tmp_path):
+    path = str(tmp_path / "timetable_data.json")
+    store = JsonBackend(path)
+    yield create_app(store, default_definition().spec, open_blobs(path))
+    store.close()
+
+
+def test_routes(app):
+    assert call(app, "GET", "/health") == (200, {"status": "ok", "plan": "default"})
+    status, session = call(app, "POST", "/users/alice/sessions/API-1/toggle", body=b'{"done": true}')
+    assert status == 200 and session["done"] is True
+    assert call(app, "POST", "/users/alice/sessions/API-2/toggle")[1]["done"] is True
+    assert call(app, "GET", "/users/alice/progress")[1]["completed"] == 2
+    assert call(app, "GET", "/users/alice/sessions", "done=true")[1]["total"] == 2
+    assert call(app, "POST", "/users/alice/sessions/API-999/toggle")[0] == 404
+
+
+@pytest.mark.parametrize("body", [b"[1]", b'"text"', b"3", b"{not json"])
+def test_request_body_must_be_a_json_object(app, body):
+    for method, path in (("POST", "/users/alice/sessions/API-1/toggle"), ("POST", "/users/alice/batch"),
+                         ("PUT", "/users/alice/notes/2025-06-09")):
+        status, error = call(app, method, path, body=body)
+        assert status == 400, (path, body)
+        assert "error" in error
+
+
+def test_limit_is_clamped(app):
+    status, page = call(app, "GET", "/users/alice/sessions", "limit=-5")
+    assert status == 200 and page["sessions"] == []
+    assert len(call(app, "GET", "/users/alice/sessions", "limit=100000")[1]["sessions"]) == 90
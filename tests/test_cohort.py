@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+
+from timetable.cohort import cohort_report, parse_state_name, scan, state_files
+from timetable.plans import default_definition
+from timetable.schedule import generate_sessions
+from timetable.storage import JsonBackend, SqliteBackend
+
+
+@pytest.fixture
+def spec():
+    return default_definition().spec
+
+
+def tick(store, user, spec, count, plan=None):
+    sessions = generate_sessions(spec)
+    store.set_many(user, plan or spec.name, [
+        ("checkbox_states", sessions.state_key(i), True) for i in range(count)
+    ])
+
+
+def test_parse_state_name():
+    plans = {"data-science"}
+    assert parse_state_name("d/timetable_data.json", "timetable_data", plans) == ("default", "default")
+    assert parse_state_name("d/timetable_data.alice.json", "timetable_data", plans) == ("alice", "default")
+    assert parse_state_name("d/timetable_data.bob.smith.json", "timetable_data", plans) == ("bob.smith", "default")
+    assert parse_state_name("d/timetable_data.data-science.json", "timetable_data", plans) == ("default", "data-science")
+    assert parse_state_name("d/timetable_data.alice.data-science.json", "timetable_data", plans) == ("alice", "data-science")
+    assert parse_state_name("d/other.json", "timetable_data", plans) is None
+
+
+def test_learners_with_only_a_journal_are_scanned(tmp_path, spec):
+    store = JsonBackend(str(tmp_path / "timetable_data.json"))
+    tick(store, "alice", spec, 4)
+    tick(store, "bob", spec, 1)
+    tick(store, "carol", spec, 2, plan="data-science")
+    # Nothing has compacted yet: the learners only have journal files
+    assert not list(tmp_path.glob("*.json"))
+
+    assert set(state_files(str(tmp_path), spec.name, "timetable_data")) == {"alice", "bob"}
+    summaries = scan(str(tmp_path), spec, spec.start, workers=1, root="timetable_data")
+    assert {learner: sum(summary["completed"]) for learner, summary in summaries.items()} == {"alice": 4, "bob": 1}
+
+    store.close()
+    assert set(scan(str(tmp_path), spec, spec.start, workers=1, root="timetable_data")) == {"alice", "bob"}
+
+
+def test_scan_rereads_only_changed_learners(tmp_path, spec):
+    store = JsonBackend(str(tmp_path / "timetable_data.json"))
+    tick(store, "alice", spec, 1)
+    tick(store, "bob", spec, 1)
+    cache = {}
+    scan(str(tmp_path), spec, spec.start, cache=cache, workers=1, root="timetable_data")
+    bob = cache["bob"]
+
+    tick(store, "alice", spec, 3)
+    summaries = scan(str(tmp_path), spec, spec.start, cache=cache, workers=1, root="timetable_data")
+    assert sum(summaries["alice"]["completed"]) == 3
+    assert cache["bob"] is bob
+    store.close()
+
+
+def test_sqlite_scan_and_report(tmp_path, spec):
+    path = str(tmp_path / "timetable_data.db")
+    store = SqliteBackend(path)
+    tick(store, "alice", spec, 10)
+    tick(store, "bob", spec, 0)
+    store.set("bob", spec.name, "checkbox_states", generate_sessions(spec).state_key(0), False)
+    store.close()
+
+    today = spec.start + timedelta(days=4)
+    summaries = scan(path, spec, today, workers=1)
+    assert set(summaries) == {"alice", "bob"}
+
+    report = cohort_report(summaries, [subject[0] for subject in spec.subjects], today)
+    learners = report["learners"].set_index("Learner")
+    assert learners.loc["alice", "Completed"] == 10
+    assert learners.loc["bob", "Completed"] == 0
+    assert list(report["laggards"]["Learner"]) == ["bob"]
+    assert report["on_track_percent"] == 50.0
@@ -0,0 +1,78 @@
+import io
+
+import pandas as pd
+import pytest
+
+from timetable.export import EXPORT_COLUMNS, FORMATS, export_file, main, read_progress_csv
+from timetable.plans import default_definition
+from timetable.progress import completion_matrix
+from timetable.schedule import generate_sessions
+from timetable.storage import JsonBackend
+
+
+@pytest.fixture
+def sessions():
+    return generate_sessions(default_definition().spec)
+
+
+def progress(sessions, checked):
+    states = {sessions.state_key(i): True for i in checked}
+    return states, completion_matrix(states, int(sessions.row.max()) + 1)
+
+
+@pytest.mark.parametrize("fmt", list(FORMATS))
+def test_exports_are_accepted_by_the_download_button(sessions, fmt):
+    from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+    _states, done = progress(sessions, [0, 3])
+    data, _mime = convert_data_to_bytes_and_infer_mime(
+        export_file(fmt, sessions, done, {f"notes_{sessions.row[0]}": "first day"}), TypeError("unsupported")
+    )
+    assert len(data) > 0
+
+
+def test_csv_round_trip(sessions):
+    states, done = progress(sessions, [0, 3, len(sessions) - 1])
+    notes = {f"notes_{sessions.row[0]}": "Read chapter 1, then exercises"}
+    exported = export_file("csv", sessions, done, notes)
+
+    frame = pd.read_csv(io.BytesIO(exported.getvalue()))
+    assert list(frame.columns) == EXPORT_COLUMNS
+    assert len(frame) == len(sessions)
+    assert frame.loc[0, "Notes"] == "Read chapter 1, then exercises"
+
+    imported = dict(read_progress_csv(exported, sessions))
+    assert {key for key, value in imported.items() if value} == set(states)
+    assert len(imported) == len(sessions)
+
+
+def test_parquet_matches_csv(sessions):
+    _states, done = progress(sessions, [1, 2])
+    parquet = pd.read_parquet(export_file("parquet", sessions, done, {}))
+    csv = pd.read_csv(export_file("csv", sessions, done, {}))
+    assert list(parquet["Session"]) == list(csv["Session"])
+    assert list(parquet["Done"]) == list(csv["Done"])
+
+
+def test_import_skips_unknown_sessions(sessions):
+    data = io.StringIO("Session,Done\nAPI-1,true\nAPI-999,true\nChemistry-1,true\nbogus,true\nLLM-1,no\n")
+    key_of = {sessions.session_id(i): sessions.state_key(i) for i in range(len(sessions))}
+    assert dict(read_progress_csv(data, sessions)) == {key_of["API-1"]: True, key_of["LLM-1"]: False}
+
+
+def test_cli_import_then_export(tmp_path, monkeypatch, sessions):
+    monkeypatch.delenv("TIMETABLE_DAYS", raising=False)
+    monkeypatch.delenv("TIMETABLE_PLAN", raising=False)
+    data = str(tmp_path / "timetable_data.json")
+    upload = tmp_path / "progress.csv"
+    upload.write_text("Session,Done\nAPI-1,true\nStatistics-2,x\n")
+
+    main(["--storage", "json", "--data", data, "--user", "alice", "import", str(upload)])
+    output = tmp_path / "export.csv"
+    main(["--storage", "json", "--data", data, "--user", "alice", "export", "-o", str(output)])
+
+    frame = pd.read_csv(output)
+    assert sorted(frame.loc[frame["Done"], "Session"]) == ["API-1", "Statistics-2"]
+    store = JsonBackend(data)
+    assert sum(store.load("alice", "default")["checkbox_states"].values()) == 2
+    store.close()
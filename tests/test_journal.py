@@ -0,0 +1,71 @@
+import json
+import os
+
+from timetable.storage import JournalStore, read_journaled
+
+
+def test_changes_are_appended_and_replayed(tmp_path):
+    path = str(tmp_path / "timetable_data.json")
+    store = JournalStore(path)
+    store.set("checkbox_states", "morning_1", True)
+    store.set_many([("checkbox_states", "morning_1", False), ("notes", "notes_1", "first note")])
+
+    # Nothing is rewritten: the snapshot does not exist yet and the journal holds one line per change
+    assert not os.path.exists(path)
+    with open(path + ".journal", "rb") as f:
+        assert len(f.readlines()) == 3
+    expected = {"checkbox_states": {"morning_1": False}, "notes": {"notes_1": "first note"}}
+    reopened = JournalStore(path).load()
+    assert {section: values for section, values in reopened.items() if values} == expected
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    path = str(tmp_path / "timetable_data.json")
+    store = JournalStore(path, compact_every=3)
+    for row in range(1, 5):
+        store.set("checkbox_states", f"morning_{row}", True)
+
+    # Compacted after the third change; the fourth is in the fresh journal
+    with open(path) as f:
+        snapshot = json.load(f)
+    assert sorted(snapshot["checkbox_states"]) == ["morning_1", "morning_2", "morning_3"]
+    with open(path + ".journal", "rb") as f:
+        assert [json.loads(line)["key"] for line in f] == ["morning_4"]
+    assert len(read_journaled(path)[0]["checkbox_states"]) == 4
+
+    # Timestamps survive compaction, so an older change still loses afterwards
+    store.set("checkbox_states", "morning_1", False, ts=1.0)
+    assert JournalStore(path).load()["checkbox_states"]["morning_1"] is True
+
+
+def test_files_saved_before_the_journal_load_as_before(tmp_path):
+    path = str(tmp_path / "timetable_data.json")
+    with open(path, "w") as f:
+        json.dump({"checkbox_states": {"morning_1": True}, "notes": {"notes_1": "old"}}, f)
+
+    store = JournalStore(path)
+    assert store.load()["checkbox_states"] == {"morning_1": True}
+    store.set("notes", "notes_1", "new")
+    assert JournalStore(path).load()["notes"] == {"notes_1": "new"}
+
+
+def test_torn_journal_record_is_dropped_and_truncated(tmp_path):
+    path = str(tmp_path / "timetable_data.json")
+    store = JournalStore(path)
+    store.set("checkbox_states", "morning_1", True)
+    store.set("notes", "notes_1", "kept")
+    complete = os.path.getsize(path + ".journal")
+
+    # A crash in the middle of an append leaves a partial last line
+    with open(path + ".journal", "ab") as f:
+        f.write(b'{"section": "notes", "key": "notes_2", "val')
+
+    reopened = JournalStore(path)
+    assert reopened.load()["notes"] == {"notes_1": "kept"}
+    assert os.path.getsize(path + ".journal") == complete
+
+    reopened.set("notes", "notes_2", "after the crash")
+    with open(path + ".journal", "rb") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["key"] for record in records] == ["morning_1", "notes_1", "notes_2"]
+    assert JournalStore(path).load()["notes"] == {"notes_1": "kept", "notes_2": "after the crash"}
@@ -0,0 +1,103 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from timetable import _kernels_py as py
+from timetable.plans import default_definition
+from timetable.schedule import CODE_COLUMNS, generate_schedule, generate_sessions
+from timetable.styles import HEADER_STYLE, REST_STYLE
+
+compiled = pytest.importorskip("timetable._kernels")
+
+
+def assert_same(left, right):
+    if isinstance(left, tuple):
+        assert len(left) == len(right)
+        for a, b in zip(left, right):
+            assert_same(a, b)
+        return
+    left, right = np.asarray(left), np.asarray(right)
+    assert left.shape == right.shape
+    assert left.tolist() == right.tolist()
+
+
+# The default plan and variations of it: other lengths, free slots, a different rest day and week length
+def specs():
+    spec = default_definition().spec
+    return [
+        spec,
+        replace(spec, days=1),
+        replace(spec, days=100),
+        replace(spec, rotation=(("API", None), (None, "LLM"), ("Statistics", "API"))),
+        replace(spec, rest_weekdays=(0, 6), week_length=5),
+    ]
+
+
+@pytest.fixture(params=range(len(specs())))
+def spec(request):
+    return specs()[request.param]
+
+
+def test_session_layout(spec):
+    rng = np.random.default_rng(1)
+    is_rest = rng.random(200) < 0.3
+    rotation = rng.integers(-1, 3, (7, 2))
+    for n in (0, 1, 13, 200):
+        assert_same(
+            compiled.session_layout(is_rest[:n], rotation, 3, spec.week_length),
+            py.session_layout(is_rest[:n], rotation, 3, spec.week_length),
+        )
+    for kernels in (compiled, py):
+        with pytest.raises(ValueError):
+            kernels.session_layout(is_rest, np.zeros((0, 2), dtype=np.int64), 3, 7)
+
+
+def test_day_dates():
+    dates = np.arange(np.datetime64("2023-12-25"), np.datetime64("2025-03-05"), dtype="datetime64[D]")
+    assert_same(compiled.day_dates(dates), py.day_dates(dates))
+    assert_same(compiled.day_dates(dates[:0]), py.day_dates(dates[:0]))
+
+
+def test_session_labels(spec):
+    sessions = generate_sessions(spec)
+    labels = [subject[1] for subject in spec.subjects]
+    assert_same(
+        compiled.session_labels(sessions.subject, sessions.ordinal, sessions.minutes, labels),
+        py.session_labels(sessions.subject, sessions.ordinal, sessions.minutes, labels),
+    )
+    assert_same(compiled.session_labels([], [], [], labels), py.session_labels([], [], [], labels))
+
+
+def test_row_kinds_and_styles(spec):
+    df = generate_schedule(spec)
+    columns = df["Week"].to_numpy(), df["Day"].to_numpy(), df["Morning Session"].to_numpy()
+    kinds = py.row_kinds(*columns)
+    assert_same(compiled.row_kinds(*columns), kinds)
+    assert {py.HEADER, py.REST, py.PLAIN} >= set(kinds.tolist())
+
+    codes = df[CODE_COLUMNS].to_numpy()
+    args = (kinds, codes, 8, (3, 4), HEADER_STYLE, "first", REST_STYLE, "rest first", ["a", None, "c"])
+    assert_same(compiled.style_cells(*args), py.style_cells(*args))
+
+
+def test_completion_and_progress(spec):
+    sessions = generate_sessions(spec)
+    n_rows = int(sessions.row.max()) + 1
+    rng = np.random.default_rng(2)
+    states = {sessions.state_key(int(i)): bool(rng.integers(2)) for i in rng.integers(0, len(sessions), 40)}
+    # Keys the matrix must ignore: out of range, malformed, other sections
+    states.update({f"morning_{n_rows}": True, "morning_x": True, "notes_1": True, "evening_": True})
+    done = py.completion_matrix(states, n_rows)
+    assert_same(compiled.completion_matrix(states, n_rows), done)
+
+    codes = sessions.to_matrix(sessions.subject, n_rows, fill=-1)
+    minutes = sessions.to_matrix(sessions.minutes, n_rows)
+    assert_same(compiled.progress_counts(codes, minutes, done, 3), py.progress_counts(codes, minutes, done, 3))
+
+
+def test_public_module_uses_the_extension():
+    from timetable import kernels
+
+    assert kernels.COMPILED
+    assert kernels.session_layout is compiled.session_layout
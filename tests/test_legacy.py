@@ -0,0 +1,83 @@
+from dataclasses import replace
+
+import pytest
+
+from timetable.legacy import LAYOUT, LAYOUT_KEY, is_legacy, load_upgraded
+from timetable.plans import default_definition
+from timetable.schedule import generate_sessions
+from timetable.storage import JsonBackend
+
+# Rows of the original table: week headers, rest days and the "FINAL DAYS" header at 40
+HEADER_ROWS = {0, 8, 16, 24, 32, 40}
+REST_ROWS = {6, 14, 22, 30, 38, 43}
+STUDY_ROWS = [row for row in range(48) if row not in HEADER_ROWS | REST_ROWS]
+
+
+@pytest.fixture
+def spec():
+    return default_definition().spec
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JsonBackend(str(tmp_path / "timetable_data.json"))
+    yield store
+    store.close()
+
+
+# A state as the original table saved it: every study row's checkboxes and notes,
+# with `checked` keys ticked and `notes` filled in
+def legacy_state(checked=(), notes=None):
+    state = {"checkbox_states": {}, "notes": {}}
+    for row in STUDY_ROWS:
+        state["checkbox_states"][f"morning_{row}"] = f"morning_{row}" in checked
+        state["checkbox_states"][f"evening_{row}"] = f"evening_{row}" in checked
+        state["notes"][f"notes_{row}"] = (notes or {}).get(f"notes_{row}", "")
+    return state
+
+
+def key_of(spec, session_id):
+    sessions = generate_sessions(spec)
+    return next(sessions.state_key(i) for i in range(len(sessions)) if sessions.session_id(i) == session_id)
+
+
+def test_legacy_rows_are_moved_to_their_sessions(spec, store):
+    state = legacy_state(
+        checked={"morning_44", "evening_46", "morning_10"},
+        notes={"notes_44": "Day 42 review", "notes_10": "early note"},
+    )
+    store.set_many("default", "default", [
+        (section, key, value) for section, values in state.items() for key, value in values.items()
+    ])
+
+    upgraded = load_upgraded(store, "default", spec)
+    checked = {key for key, value in upgraded["checkbox_states"].items() if value}
+    # Legacy row 44 held API-22 / LLM-22, row 46 Statistics-24 / LLM-23; rows before 40 are unchanged
+    assert checked == {key_of(spec, "API-22"), key_of(spec, "LLM-23"), "morning_10"}
+    api_22_row = key_of(spec, "API-22").split("_")[1]
+    assert upgraded["notes"][f"notes_{api_22_row}"] == "Day 42 review"
+    assert upgraded["notes"]["notes_10"] == "early note"
+    assert upgraded["plan"][LAYOUT_KEY] == LAYOUT
+
+    # Persisted once: loading again changes nothing
+    stored = store.load("default", "default")
+    assert stored == upgraded
+    assert load_upgraded(store, "default", spec) == stored
+
+
+def test_current_state_on_the_final_rows_is_left_alone(spec, store):
+    # Day 34's note and a session of row 45, as the current app saves them
+    store.set("default", "default", "notes", "notes_44", "Day 34")
+    store.set("default", "default", "checkbox_states", "morning_45", True)
+    before = store.load("default", "default")
+
+    assert not is_legacy(before, spec)
+    assert load_upgraded(store, "default", spec) == before
+    assert store.load("default", "default") == before
+
+
+def test_other_plans_are_not_remapped(spec):
+    state = legacy_state(checked={"morning_44"})
+    assert is_legacy(state, spec)
+    assert not is_legacy(state, replace(spec, name="solved"))
+    assert not is_legacy({**state, "plan": {LAYOUT_KEY: LAYOUT}}, spec)
@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from timetable.storage import JournalStore, JsonBackend, SqliteBackend, read_journaled
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "json":
+        backend = JsonBackend(str(tmp_path / "timetable_data.json"))
+    else:
+        backend = SqliteBackend(str(tmp_path / "timetable_data.db"))
+    yield backend
+    backend.close()
+
+
+def test_last_writer_wins_by_change_time(backend):
+    backend.set("alice", "default", "checkbox_states", "morning_1", True, ts=200.0)
+    backend.set("alice", "default", "checkbox_states", "morning_1", False, ts=100.0)
+    backend.set("alice", "default", "notes", "notes_1", "old", ts=100.0)
+    backend.set("alice", "default", "notes", "notes_1", "new", ts=300.0)
+
+    state = backend.load("alice", "default")
+    assert state["checkbox_states"] == {"morning_1": True}
+    assert state["notes"] == {"notes_1": "new"}
+
+
+def test_tabs_changing_different_keys_both_win(backend):
+    # Two tabs loaded the same state; each saves only the key it changed
+    backend.set("alice", "default", "checkbox_states", "morning_1", True, ts=100.0)
+    backend.set("alice", "default", "checkbox_states", "evening_1", True, ts=90.0)
+    assert backend.load("alice", "default")["checkbox_states"] == {"morning_1": True, "evening_1": True}
+
+
+def test_changes_since(backend):
+    backend.set("alice", "default", "checkbox_states", "morning_1", True)
+    version = backend.version("alice", "default")
+    assert backend.changes_since("alice", "default", version) == (version, [])
+
+    backend.set_many("alice", "default", [
+        ("checkbox_states", "morning_2", True),
+        ("notes", "notes_2", "read chapter 2"),
+    ])
+    current, changes = backend.changes_since("alice", "default", version)
+    assert current > version
+    assert sorted(changes) == [("checkbox_states", "morning_2", True), ("notes", "notes_2", "read chapter 2")]
+
+    # Writing an unchanged value is not a change
+    backend.set("alice", "default", "checkbox_states", "morning_2", True)
+    assert backend.changes_since("alice", "default", current) == (current, [])
+    # Another learner's changes are not this one's
+    backend.set("bob", "default", "checkbox_states", "morning_3", True)
+    assert backend.changes_since("alice", "default", current) == (current, [])
+
+
+def test_two_stores_on_one_file_see_each_other(tmp_path):
+    path = str(tmp_path / "timetable_data.json")
+    first, second = JournalStore(path), JournalStore(path)
+
+    first.set("checkbox_states", "morning_1", True)
+    second.set("checkbox_states", "evening_1", True)
+    assert first.load()["checkbox_states"] == {"morning_1": True, "evening_1": True}
+
+    version = first.version()
+    second.set("notes", "notes_1", "from the second store")
+    assert first.changes_since(version)[1] == [("notes", "notes_1", "from the second store")]
+
+    # A compaction by one store is picked up by the other, which keeps appending after it
+    first.compact()
+    second.set("checkbox_states", "morning_2", True)
+    expected = {"morning_1": True, "evening_1": True, "morning_2": True}
+    assert first.load()["checkbox_states"] == expected
+    assert read_journaled(path)[0]["checkbox_states"] == expected
+
+
+def test_concurrent_writers_with_compaction_keep_every_record(tmp_path):
+    path = str(tmp_path / "timetable_data.json")
+    stores = [JournalStore(path, compact_every=7) for _ in range(4)]
+
+    def write(n, store):
+        for i in range(50):
+            store.set("checkbox_states", f"key_{n}_{i}", True)
+
+    threads = [threading.Thread(target=write, args=(n, store)) for n, store in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(JournalStore(path).load()["checkbox_states"]) == 200
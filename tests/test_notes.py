@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from timetable.notes import COMPRESSED, PLAIN, LazyNotes, NoteBlobs, open_blobs, sweep_notes
+from timetable.storage import JsonBackend, SqliteBackend, WriteBehindBackend
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    return str(tmp_path / "timetable_data.json")
+
+
+def test_equal_notes_share_a_blob(tmp_path):
+    blobs = NoteBlobs(str(tmp_path / "notes"))
+    first, second = blobs.put("Read chapter 3"), blobs.put("Read chapter 3")
+    assert first == second
+    assert blobs.put("") == ""
+    assert sum(len(files) for _dir, _dirs, files in os.walk(blobs.root)) == 1
+    assert blobs.get(first) == "Read chapter 3"
+    # Notes saved inline by older versions read as they are
+    assert blobs.get("inline note") == "inline note"
+    assert blobs.get("") == ""
+
+
+def test_long_notes_are_compressed(tmp_path):
+    blobs = NoteBlobs(str(tmp_path / "notes"), compress_min=64)
+    short, long = blobs.put("short"), blobs.put("gradient descent " * 50)
+    with open(blobs.path(short["blob"]), "rb") as f:
+        assert f.read(1) == PLAIN
+    with open(blobs.path(long["blob"]), "rb") as f:
+        assert f.read(1) == COMPRESSED
+        assert os.path.getsize(blobs.path(long["blob"])) < len("gradient descent " * 50)
+    assert NoteBlobs(blobs.root).get(long) == "gradient descent " * 50
+
+
+def test_note_blobs_are_written_behind_and_swept(data_file):
+    store = WriteBehindBackend(JsonBackend(data_file), delay=60, max_delay=60)
+    blobs = open_blobs(data_file, store.defer)
+    notes = LazyNotes({}, blobs)
+
+    ref = notes.save("notes_1", "Read chapter 3")
+    store.set("alice", "default", "notes", "notes_1", ref)
+    # Not on disk yet, but readable
+    assert not os.path.exists(blobs.path(ref["blob"]))
+    assert blobs.get(ref) == "Read chapter 3"
+    store.flush(5)
+    assert os.path.exists(blobs.path(ref["blob"]))
+
+    orphan = blobs.put("replaced text")
+    store.flush(5)
+    assert sweep_notes(store, blobs, min_age=3600) == 0
+    assert sweep_notes(store, blobs, min_age=0) == 1
+    assert not os.path.exists(blobs.path(orphan["blob"]))
+    assert open_blobs(data_file).get(ref) == "Read chapter 3"
+    store.close()
+
+
+@pytest.mark.parametrize("backend_class, name", [(JsonBackend, "timetable_data.json"), (SqliteBackend, "timetable_data.db")])
+def test_sweep_keeps_notes_of_every_learner_and_plan(tmp_path, backend_class, name):
+    path = str(tmp_path / name)
+    store = backend_class(path)
+    blobs = open_blobs(path)
+    for user, plan in (("default", "default"), ("alice", "default"), ("alice", "data-science")):
+        store.set(user, plan, "notes", "notes_1", blobs.put(f"{user} {plan}"))
+    orphan = blobs.put("nobody's note")
+
+    assert sweep_notes(store, blobs, min_age=0) == 1
+    assert not os.path.exists(blobs.path(orphan["blob"]))
+    for user, plan in (("default", "default"), ("alice", "default"), ("alice", "data-science")):
+        assert blobs.get(store.load(user, plan)["notes"]["notes_1"]) == f"{user} {plan}"
+    store.close()
+
+
+def test_lazy_notes_read_bodies_on_access(tmp_path):
+    blobs = NoteBlobs(str(tmp_path / "notes"))
+    refs = {f"notes_{row}": blobs.put(f"note {row}") for row in range(1, 6)}
+    refs["notes_9"] = "inline"
+    os.remove(blobs.path(refs["notes_5"]["blob"]))
+
+    notes = LazyNotes(refs, blobs)
+    # Listing keys reads nothing, so a missing blob only matters when its note is opened
+    assert sorted(notes) == sorted(refs) and len(notes) == 6
+    assert notes["notes_2"] == "note 2" and notes["notes_9"] == "inline"
+    with pytest.raises(FileNotFoundError):
+        notes["notes_5"]
+
+    assert notes.save("notes_2", "note 2") is None
+    ref = notes.save("notes_2", "edited")
+    assert notes.refs["notes_2"] == ref and notes["notes_2"] == "edited"
+    # A reference changed by another tab drops the cached body
+    assert notes.set_ref("notes_2", refs["notes_1"])
+    assert not notes.set_ref("notes_2", refs["notes_1"])
+    assert notes["notes_2"] == "note 1"
@@ -0,0 +1,108 @@
+import json
+import os
+from dataclasses import replace
+
+import pytest
+
+from timetable.plans import PLANS_DIR, PlanCache, default_definition, load_definition, plan_file, plan_files
+
+PLAN = """
+name = "exam"
+start = 2025-01-06
+days = {days}
+rest_weekdays = ["Sunday"]
+rotation = [["A", "B"]]
+
+[subjects.A]
+minutes = 30
+
+[subjects.B]
+minutes = 60
+color = "#ff0000"
+"""
+
+
+def write_plan(path, days, mtime_ns=None):
+    with open(path, "w") as f:
+        f.write(PLAN.format(days=days))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_definitions_are_parsed_from_toml_and_json(tmp_path):
+    definition = load_definition(os.path.join(PLANS_DIR, "default.toml"))
+    assert definition.spec == default_definition().spec
+    assert [name for name, _color in definition.colors] == ["API", "Statistics", "LLM"]
+
+    path = str(tmp_path / "exam.json")
+    with open(path, "w") as f:
+        json.dump({"start": "2025-01-06", "days": 5, "rotation": [["A", "A"]], "subjects": {"A": {"minutes": 30}}}, f)
+    definition = load_definition(path)
+    assert definition.spec.name == "exam"
+    assert definition.colors == (("A", "#7f8c8d"),)
+
+
+@pytest.mark.parametrize("text", [
+    'start = 2025-01-06\ndays = 5\nrotation = [["A", "B"]]\n[subjects.A]\nminutes = 30\n',
+    'start = 2025-01-06\ndays = 5\nrotation = [["A"]]\n[subjects.A]\nminutes = 30\n',
+    'start = 2025-01-06\nrotation = [["A", "A"]]\n[subjects.A]\nminutes = 30\n',
+    'start = 2025-01-06\ndays = 5\nrotation = [["A", "A"]]\n[subjects.A]\nminutes = "long"\n',
+    "not toml [",
+])
+def test_malformed_files_are_rejected(tmp_path, text):
+    path = tmp_path / "broken.toml"
+    path.write_text(text)
+    with pytest.raises(ValueError, match="broken.toml"):
+        load_definition(str(path))
+
+
+def test_changed_files_are_reparsed_and_their_plans_dropped(tmp_path):
+    path = str(tmp_path / "exam.toml")
+    write_plan(path, 10, mtime_ns=1_000_000_000)
+    cache = PlanCache()
+    plan = cache.get(path)
+    assert cache.get(path) is plan
+    assert len(plan.sessions) == 2 * plan.spec.days
+
+    # Same size and mtime: the stale definition is kept, as the file is not re-read
+    write_plan(path, 20, mtime_ns=1_000_000_000)
+    assert cache.definition(path) is plan.definition
+
+    # A new mtime re-reads it and drops what was compiled from the old definition
+    write_plan(path, 20, mtime_ns=2_000_000_000)
+    changed = cache.get(path)
+    assert changed.spec.days == 20 and changed is not plan
+    assert len(cache) == 1
+
+    # So does a new size, even when the mtime is unchanged
+    write_plan(path, 300, mtime_ns=2_000_000_000)
+    assert cache.definition(path).spec.days == 300
+
+
+def test_compiled_plans_are_bounded(tmp_path):
+    path = str(tmp_path / "exam.toml")
+    write_plan(path, 10)
+    cache = PlanCache(maxsize=2)
+    definition = cache.definition(path)
+    plans = [cache.compiled(definition, replace(definition.spec, days=days)) for days in (5, 6, 7)]
+    assert len(cache) == 2
+    # The least recently used plan was evicted, the others are shared
+    assert cache.compiled(definition, plans[2].spec) is plans[2]
+    assert cache.compiled(definition, plans[0].spec) is not plans[0]
+
+
+def test_plan_file_resolution(tmp_path):
+    assert plan_file({}) == os.path.join(PLANS_DIR, "default.toml")
+    assert plan_file({"TIMETABLE_PLAN_FILE": "/elsewhere/exam.toml"}) == "/elsewhere/exam.toml"
+
+    write_plan(str(tmp_path / "b.toml"), 10)
+    write_plan(str(tmp_path / "a.toml"), 10)
+    (tmp_path / "readme.txt").write_text("")
+    assert list(plan_files(str(tmp_path))) == ["a", "b"]
+    # Without a default.* the first file is used
+    assert plan_file({"TIMETABLE_PLANS": str(tmp_path)}) == str(tmp_path / "a.toml")
+    write_plan(str(tmp_path / "default.toml"), 10)
+    assert plan_file({"TIMETABLE_PLANS": str(tmp_path)}) == str(tmp_path / "default.toml")
+
+    with pytest.raises(FileNotFoundError):
+        plan_file({"TIMETABLE_PLANS": str(tmp_path / "missing")})
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from timetable.plans import default_definition
+from timetable.progress import ProgressCounter, compute_progress
+from timetable.schedule import generate_sessions
+
+
+@pytest.fixture
+def plan():
+    sessions = generate_sessions(default_definition().spec)
+    n_rows = int(sessions.row.max()) + 1
+    codes = sessions.to_matrix(sessions.subject, n_rows, fill=-1)
+    minutes = sessions.to_matrix(sessions.minutes, n_rows)
+    return sessions, codes, minutes, [subject[0] for subject in sessions.spec.subjects]
+
+
+def test_counts_match_a_full_recount_after_every_toggle(plan):
+    sessions, codes, minutes, names = plan
+    counter = ProgressCounter(codes, minutes, names)
+    states = {}
+    rng = np.random.default_rng(7)
+    for i in rng.integers(0, len(sessions), 300):
+        key = sessions.state_key(int(i))
+        states[key] = not states.get(key, False)
+        assert counter.set(key, states[key])
+
+        rebuilt = ProgressCounter.from_states(codes, minutes, names, states)
+        assert counter.completed.tolist() == rebuilt.completed.tolist()
+        assert counter.completed_minutes.tolist() == rebuilt.completed_minutes.tolist()
+
+    summary = counter.summary()
+    recount = compute_progress(codes, counter.done, len(names))
+    assert summary["completed"].tolist() == recount["completed"].tolist()
+    assert summary["overall"] == pytest.approx(recount["overall"])
+
+
+def test_totals_and_minutes(plan):
+    sessions, codes, minutes, names = plan
+    counter = ProgressCounter(codes, minutes, names)
+    summary = counter.summary()
+    assert summary["totals"].tolist() == [30, 30, 30]
+    assert summary["total_minutes"].tolist() == [30 * 45, 30 * 50, 30 * 75]
+    assert summary["completed_total"] == 0 and summary["overall"] == 0.0
+
+    counter.set(sessions.state_key(0), True)  # API-1, 45 minutes
+    summary = counter.summary()
+    assert summary["completed"].tolist() == [1, 0, 0]
+    assert summary["completed_minutes"].tolist() == [45, 0, 0]
+    assert summary["percent"][0] == pytest.approx(100 / 30)
+
+
+def test_changes_that_do_not_count_are_ignored(plan):
+    sessions, codes, minutes, names = plan
+    counter = ProgressCounter(codes, minutes, names)
+    key = sessions.state_key(0)
+    assert counter.set(key, True)
+    # Repeated, unscheduled (week header, rest day), out of range and malformed keys
+    assert not counter.set(key, True)
+    for other in ("morning_0", "morning_6", "evening_6", f"morning_{len(codes)}", "notes_1", "morning_x"):
+        assert not counter.set(other, True)
+    assert counter.summary()["completed_total"] == 1
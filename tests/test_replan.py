@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from timetable.plans import default_definition
+from timetable.progress import completion_matrix
+from timetable.replan import apply_layout, count_missed, layout, replan
+from timetable.schedule import generate_sessions
+
+
+@pytest.fixture
+def spec():
+    return default_definition().spec
+
+
+def done_matrix(sessions, checked):
+    n_rows = int(sessions.row.max()) + 1
+    return completion_matrix({sessions.state_key(i): True for i in checked}, n_rows)
+
+
+def session_ids(sessions):
+    return {sessions.state_key(i): sessions.session_id(i) for i in range(len(sessions))}
+
+
+def test_replan_keeps_session_ids(spec):
+    sessions = generate_sessions(spec)
+    today = spec.start + timedelta(days=12)
+    # Done: the first three sessions and one after today; everything else before today is missed
+    checked = [0, 1, 2, len(sessions) - 5]
+    done = done_matrix(sessions, checked)
+    assert count_missed(spec, done, today) > 0
+
+    new_spec, first, moved = replan(spec, done, today)
+    replanned = generate_sessions(new_spec)
+
+    assert moved > 0
+    assert first == 1
+    assert len(replanned) == len(sessions)
+    assert sorted(session_ids(replanned).values()) == sorted(session_ids(sessions).values())
+    # Completed sessions keep their slot, so their checkbox keys still name the same session
+    before, after = session_ids(sessions), session_ids(replanned)
+    for i in checked:
+        key = sessions.state_key(i)
+        assert after[key] == before[key]
+    # Nothing unfinished is left before today
+    assert count_missed(new_spec, done, today) == 0
+
+
+def test_replan_without_missed_sessions_is_a_no_op(spec):
+    sessions = generate_sessions(spec)
+    done = done_matrix(sessions, [])
+    assert replan(spec, done, spec.start) == (spec, spec.days, 0)
+
+
+def test_layout_round_trips(spec):
+    sessions = generate_sessions(spec)
+    new_spec, first, _moved = replan(spec, done_matrix(sessions, [0]), spec.start + timedelta(days=20))
+    assert apply_layout(spec, layout(new_spec, first)) == new_spec
+
+
+def test_layouts_without_ordinals_number_sessions_chronologically(spec):
+    sessions = generate_sessions(spec)
+    new_spec, first, _moved = replan(spec, done_matrix(sessions, []), spec.start + timedelta(days=5))
+    stored = layout(new_spec, first)
+    del stored["ordinals"]
+    rebuilt = generate_sessions(apply_layout(spec, stored))
+    for subject in range(len(spec.subjects)):
+        ordinals = rebuilt.ordinal[rebuilt.subject == subject]
+        assert np.array_equal(ordinals, np.arange(1, len(ordinals) + 1))
@@ -0,0 +1,76 @@
+from dataclasses import replace
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from timetable.plans import default_definition
+from timetable.schedule import PlanSpec, generate_schedule, generate_sessions
+
+
+@pytest.fixture
+def spec():
+    return default_definition().spec
+
+
+def test_default_plan_matches_the_original_table(spec):
+    schedule = generate_schedule(spec)
+    # Rows as the hand-written table had them for its first week
+    assert list(schedule.loc[0, ["Week", "Day", "Date"]]) == ["WEEK 1", "", ""]
+    assert list(schedule.loc[1, ["Day", "Date", "Morning Session", "Evening Session"]]) == [
+        "Day 1 (Monday)", "Jun 9", "🔧 API: Session 1 (45 min)", "📊 Statistics: Session 1 (50 min)",
+    ]
+    assert list(schedule.loc[2, ["Morning Session", "Evening Session"]]) == [
+        "📊 Statistics: Session 2 (50 min)", "🤖 LLM: Session 1 (75 min)",
+    ]
+    assert list(schedule.loc[6, ["Day", "Date", "Morning Session", "Evening Session"]]) == [
+        "Saturday", "Jun 14", "REST DAY", "",
+    ]
+    assert list(schedule.loc[7, ["Day", "Morning Session", "Evening Session"]]) == [
+        "Day 6 (Sunday)", "🔧 API: Session 4 (45 min)", "🤖 LLM: Session 4 (75 min)",
+    ]
+    assert list(schedule.loc[39, ["Day", "Date"]]) == ["Day 30 (Sunday)", "Jul 13"]
+
+
+def test_sessions_of_the_default_plan(spec):
+    sessions = generate_sessions(spec)
+    assert len(sessions) == 2 * spec.days
+    assert np.bincount(sessions.subject).tolist() == [30, 30, 30]
+    # Numbered chronologically per subject
+    for subject in range(3):
+        assert sessions.ordinal[sessions.subject == subject].tolist() == list(range(1, 31))
+    # No sessions on rest days (Saturdays) and dates in order
+    assert 5 not in set(pd.DatetimeIndex(sessions.date).weekday)
+    assert np.all(np.diff(sessions.date) >= np.timedelta64(0, "D"))
+    assert sessions.session_id(0) == "API-1"
+    assert sessions.state_key(0) == "morning_1"
+
+
+def test_week_headers_and_rows(spec):
+    schedule = generate_schedule(spec)
+    headers = schedule.index[schedule["Week"] != ""].tolist()
+    assert headers == list(range(0, len(schedule), spec.week_length + 1))
+    sessions = generate_sessions(spec)
+    assert set(sessions.row.tolist()).isdisjoint(headers)
+    codes = schedule[["Morning Code", "Evening Code"]].to_numpy()
+    assert np.array_equal(codes[sessions.row, sessions.slot], sessions.subject)
+
+
+def test_plan_length_and_free_slots(spec):
+    assert len(generate_sessions(replace(spec, days=10))) == 20
+    assert len(generate_sessions(replace(spec, days=0))) == 0
+
+    free = replace(spec, rotation=(("API", None),))
+    sessions = generate_sessions(free)
+    assert len(sessions) == spec.days
+    assert set(sessions.slot.tolist()) == {0}
+
+
+def test_plan_without_study_days_is_rejected():
+    spec = PlanSpec.from_subjects(
+        start=date(2025, 1, 6), days=5, rotation=[("A", "A")],
+        subjects={"A": {"label": "A", "minutes": 30}}, rest_weekdays=tuple(range(7)),
+    )
+    with pytest.raises(ValueError):
+        generate_sessions(spec)
@@ -0,0 +1,64 @@
+from timetable.search import NoteIndex, snippet, tokenize
+
+
+def keys(results):
+    return [key for key, _score in results]
+
+
+def test_tokenize_drops_stopwords_and_case():
+    assert tokenize("The Gradient of a LOSS function") == ["gradient", "loss", "function"]
+
+
+def test_ranking_prefers_frequent_terms_in_short_notes():
+    index = NoteIndex({
+        "notes_1": "gradient descent and the gradient of the loss",
+        "notes_2": "gradient boosting trees, bagging, random forests and other ensemble methods in detail",
+        "notes_3": "prompt engineering for LLM agents",
+    })
+    assert keys(index.search("gradient")) == ["notes_1", "notes_2"]
+    # Rare terms weigh more than common ones
+    assert keys(index.search("gradient forests"))[0] == "notes_2"
+    assert index.search("transformers") == []
+    assert index.search("") == []
+
+
+def test_last_word_matches_as_a_prefix_while_typing():
+    index = NoteIndex({"notes_1": "regression diagnostics", "notes_2": "regularization with ridge"})
+    assert sorted(keys(index.search("reg"))) == ["notes_1", "notes_2"]
+    assert keys(index.search("regu")) == ["notes_2"]
+    # A finished word (followed by a space) must match exactly
+    assert index.search("reg ") == []
+
+
+def test_updates_replace_and_remove_notes():
+    index = NoteIndex({"notes_1": "linear regression", "notes_2": "logistic regression"})
+    index.update("notes_1", "bayesian inference")
+    assert keys(index.search("regression")) == ["notes_2"]
+    assert keys(index.search("bayes")) == ["notes_1"]
+    assert index.expand("lin") == []
+
+    index.update("notes_2", "")
+    assert index.search("regression") == []
+    assert len(index) == 1
+    index.remove("notes_1")
+    index.remove("notes_9")
+    assert len(index) == 0 and index.total_length == 0 and index.postings == {}
+
+
+def test_index_matches_a_fresh_build_after_updates():
+    notes = {f"notes_{i}": f"session {i} covers topic{i % 3} and review" for i in range(20)}
+    index = NoteIndex(notes)
+    for i in range(0, 20, 2):
+        notes[f"notes_{i}"] = f"rewritten note about topic{i % 4}"
+        index.update(f"notes_{i}", notes[f"notes_{i}"])
+    fresh = NoteIndex(notes)
+    assert index.search("topic1 review") == fresh.search("topic1 review")
+    assert index.postings == fresh.postings
+
+
+def test_snippet_centres_on_the_match():
+    text = "An introduction. " * 5 + "The central limit theorem explains sampling distributions. " + "Filler. " * 10
+    excerpt = snippet(text, "theorem", width=40)
+    assert "theorem" in excerpt
+    assert excerpt.startswith("…") and excerpt.endswith("…")
+    assert snippet("short note", "missing") == "short note"
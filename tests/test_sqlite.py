@@ -0,0 +1,84 @@
+import sqlite3
+import threading
+
+import pytest
+
+from timetable.storage import JsonBackend, SqliteBackend, open_backend
+
+
+@pytest.fixture(params=[("json", "timetable_data.json"), ("sqlite", "timetable_data.db")])
+def backend(request, tmp_path):
+    kind, name = request.param
+    backend = open_backend(kind, str(tmp_path / name))
+    yield backend
+    backend.close()
+
+
+def test_users_and_plans_are_separate(backend):
+    backend.set("alice", "default", "checkbox_states", "morning_1", True)
+    backend.set("bob", "default", "checkbox_states", "evening_1", True)
+    backend.set("alice", "data-science", "checkbox_states", "evening_2", True)
+
+    assert backend.load("alice", "default")["checkbox_states"] == {"morning_1": True}
+    assert backend.load("bob", "default")["checkbox_states"] == {"evening_1": True}
+    assert backend.load("alice", "data-science")["checkbox_states"] == {"evening_2": True}
+    assert backend.load("carol", "default")["checkbox_states"] == {}
+
+
+def test_load_restricted_to_keys(backend):
+    backend.set_many("alice", "default", [
+        ("checkbox_states", "morning_1", True),
+        ("checkbox_states", "evening_1", False),
+        ("notes", "notes_1", "text"),
+    ])
+    state = backend.load("alice", "default", keys=["morning_1", "notes_1"])
+    assert state["checkbox_states"] == {"morning_1": True}
+    assert state["notes"] == {"notes_1": "text"}
+
+
+def test_unknown_section_is_rejected(backend):
+    with pytest.raises(ValueError):
+        backend.set("alice", "default", "scores", "x", 1)
+
+
+def test_default_learner_keeps_the_json_file(tmp_path):
+    backend = JsonBackend(str(tmp_path / "timetable_data.json"))
+    assert backend.path_for("default", "default") == str(tmp_path / "timetable_data.json")
+    assert backend.path_for("alice", "default") == str(tmp_path / "timetable_data.alice.json")
+    assert backend.path_for("alice", "data-science") == str(tmp_path / "timetable_data.alice.data-science.json")
+    backend.close()
+
+
+def test_databases_without_version_columns_are_migrated(tmp_path):
+    path = str(tmp_path / "timetable_data.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE state (user TEXT NOT NULL, plan TEXT NOT NULL, section TEXT NOT NULL, key TEXT NOT NULL, "
+            "value TEXT NOT NULL, updated_at REAL NOT NULL DEFAULT (julianday('now')), "
+            "PRIMARY KEY (user, plan, section, key)) WITHOUT ROWID"
+        )
+        conn.execute("INSERT INTO state (user, plan, section, key, value) VALUES ('alice', 'default', 'checkbox_states', 'morning_1', 'true')")
+    conn.close()
+
+    backend = SqliteBackend(path)
+    assert backend.load("alice", "default")["checkbox_states"] == {"morning_1": True}
+    backend.set("alice", "default", "checkbox_states", "morning_1", False)
+    assert backend.load("alice", "default")["checkbox_states"] == {"morning_1": False}
+    backend.close()
+
+
+def test_connections_are_pooled(tmp_path):
+    backend = SqliteBackend(str(tmp_path / "timetable_data.db"), pool_size=2)
+    threads = [
+        threading.Thread(target=backend.set, args=(f"user{n}", "default", "checkbox_states", "morning_1", True))
+        for n in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert backend.idle() <= 2
+    assert all(backend.load(f"user{n}", "default")["checkbox_states"] for n in range(20))
+    backend.close()
+    assert backend.idle() == 0
@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from timetable.storage import JsonBackend, WriteBehindBackend
+
+
+# Backend recording each batch it is asked to write; fails the first `failures` batches
+class RecordingBackend(JsonBackend):
+    def __init__(self, path, failures=0):
+        super().__init__(path)
+        self.failures = failures
+        self.batches = []
+        self.written = threading.Event()
+
+    def set_many(self, user, plan, changes, ts=None):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.batches.append((user, plan, list(changes)))
+        super().set_many(user, plan, changes, ts)
+        self.written.set()
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    return str(tmp_path / "timetable_data.json")
+
+
+def test_changes_to_a_key_are_coalesced(data_file):
+    backend = RecordingBackend(data_file)
+    store = WriteBehindBackend(backend, delay=0.05, max_delay=5)
+    for checked in (True, False, True):
+        store.set("alice", "default", "checkbox_states", "morning_0", checked)
+    store.set("alice", "default", "notes", "notes_0", "draft")
+    store.set("alice", "default", "notes", "notes_0", "final")
+
+    assert backend.written.wait(5)
+    store.flush()
+    assert len(backend.batches) == 1
+    user, plan, changes = backend.batches[0]
+    assert (user, plan) == ("alice", "default")
+    assert sorted((section, key, value) for section, key, value, _ts in changes) == [
+        ("checkbox_states", "morning_0", True),
+        ("notes", "notes_0", "final"),
+    ]
+    store.close()
+
+
+def test_reads_see_pending_changes_and_flush_writes_them(data_file):
+    backend = RecordingBackend(data_file)
+    store = WriteBehindBackend(backend, delay=60, max_delay=60)
+    store.set("alice", "default", "checkbox_states", "morning_0", True)
+
+    assert store.pending() == 1
+    assert backend.load("alice", "default")["checkbox_states"] == {}
+    assert store.load("alice", "default")["checkbox_states"] == {"morning_0": True}
+
+    assert store.flush(5)
+    assert store.pending() == 0
+    assert backend.load("alice", "default")["checkbox_states"] == {"morning_0": True}
+    store.close()
+    with pytest.raises(RuntimeError):
+        store.set("alice", "default", "checkbox_states", "morning_1", True)
+
+
+def test_changes_keep_the_time_they_were_made(data_file):
+    backend = RecordingBackend(data_file)
+    backend.set("alice", "default", "checkbox_states", "morning_0", False, ts=200.0)
+    store = WriteBehindBackend(backend, delay=60, max_delay=60)
+    # Made before the stored change, so it loses even though it reaches the disk later
+    store.set("alice", "default", "checkbox_states", "morning_0", True, ts=100.0)
+    store.flush(5)
+    assert backend.load("alice", "default")["checkbox_states"] == {"morning_0": False}
+    store.close()
+
+
+def test_failed_writes_are_retried(data_file):
+    backend = RecordingBackend(data_file, failures=2)
+    store = WriteBehindBackend(backend, delay=0.01, max_delay=0.05)
+    store.set("alice", "default", "checkbox_states", "morning_0", True)
+
+    assert store.flush(5)
+    assert store.error is None
+    assert backend.load("alice", "default")["checkbox_states"] == {"morning_0": True}
+    store.close()
+
+
+def test_deferred_work_runs_before_later_changes(data_file):
+    backend = RecordingBackend(data_file)
+    store = WriteBehindBackend(backend, delay=60, max_delay=60)
+    order = []
+    backend.batches = order
+    store.defer(order.append, "deferred")
+    store.set("alice", "default", "checkbox_states", "morning_0", True)
+
+    store.flush(5)
+    assert order[0] == "deferred"
+    assert order[1][0] == "alice"
+    store.close()
+
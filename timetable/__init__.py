@@ -0,0 +1,3 @@
+from timetable.plans import PlanDefinition, default_definition, load_definition
+from timetable.schedule import COLUMNS, PlanSpec, generate_schedule, generate_sessions
+from timetable.sessions import Session, SessionTable, Slot
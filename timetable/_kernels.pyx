@@ -0,0 +1,173 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+#
+# Compiled versions of the kernels in _kernels_py.py (same signatures and results).
+# Build in place with:
+#
+#     python setup.py build_ext --inplace
+import numpy as np
+
+from timetable._kernels_py import DAY_TEXT, HEADER, PLAIN, REST, SLOTS
+
+
+def session_layout(is_rest, rotation, Py_ssize_t n_subjects, Py_ssize_t week_length):
+    cdef const unsigned char[:] rest = np.ascontiguousarray(is_rest, dtype=np.uint8)
+    cdef const long long[:, :] rot = np.ascontiguousarray(rotation, dtype=np.int64)
+    cdef Py_ssize_t n = rest.shape[0], period = rot.shape[0], i, s, k = 0, study = 0
+    cdef long long code
+    if period == 0:
+        raise ValueError("empty rotation")
+    out_subject = np.empty(2 * n, dtype=np.int8)
+    out_ordinal = np.empty(2 * n, dtype=np.int32)
+    out_slot = np.empty(2 * n, dtype=np.int8)
+    out_day_of = np.empty(2 * n, dtype=np.int64)
+    out_day = np.empty(2 * n, dtype=np.int32)
+    out_row = np.empty(2 * n, dtype=np.int32)
+    cdef signed char[:] subject = out_subject, slot = out_slot
+    cdef int[:] ordinal = out_ordinal, day = out_day, row = out_row
+    cdef long long[:] day_of = out_day_of
+    counts = np.zeros(max(n_subjects, 1), dtype=np.int32)
+    cdef int[:] count = counts
+
+    for i in range(n):
+        if rest[i]:
+            continue
+        for s in range(2):
+            code = rot[study % period, s]
+            if code < 0:
+                continue
+            count[code] += 1
+            subject[k] = <signed char>code
+            ordinal[k] = count[code]
+            slot[k] = <signed char>s
+            day_of[k] = i
+            day[k] = <int>(study + 1)
+            row[k] = <int>(i + i // week_length + 1)
+            k += 1
+        study += 1
+    return (out_subject[:k], out_ordinal[:k], out_slot[:k], out_day_of[:k], out_day[:k], out_row[:k])
+
+
+# Days since 1970-01-01 to (month 0-11, day 1-31), after H. Hinnant's civil_from_days
+cdef inline void _civil(long long z, int *month, int *day) noexcept:
+    cdef long long era, doe, yoe, doy, mp
+    z += 719468
+    era = (z if z >= 0 else z - 146096) // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day[0] = <int>(doy - (153 * mp + 2) // 5 + 1)
+    month[0] = <int>(mp + 2 if mp < 10 else mp - 10)
+
+
+def day_dates(dates):
+    cdef const long long[:] days = np.ascontiguousarray(dates, dtype="datetime64[D]").view(np.int64)
+    cdef Py_ssize_t i, n = days.shape[0]
+    cdef int month, day
+    cdef object[:] table = DAY_TEXT
+    result = np.empty(n, dtype=object)
+    cdef object[:] out = result
+    for i in range(n):
+        _civil(days[i], &month, &day)
+        out[i] = table[month * 31 + day - 1]
+    return result
+
+
+def session_labels(subject, ordinal, minutes, labels):
+    cdef const signed char[:] codes = np.ascontiguousarray(subject, dtype=np.int8)
+    cdef const int[:] numbers = np.ascontiguousarray(ordinal, dtype=np.int32)
+    cdef const short[:] lengths = np.ascontiguousarray(minutes, dtype=np.int16)
+    cdef Py_ssize_t i, n = codes.shape[0]
+    cdef list prefixes = [f"{label}: Session " for label in labels]
+    result = np.empty(n, dtype=object)
+    cdef object[:] out = result
+    for i in range(n):
+        out[i] = f"{prefixes[codes[i]]}{numbers[i]} ({lengths[i]} min)"
+    return result
+
+
+def row_kinds(week, day, morning):
+    cdef object[:] weeks = np.asarray(week, dtype=object)
+    cdef object[:] days = np.asarray(day, dtype=object)
+    cdef object[:] mornings = np.asarray(morning, dtype=object)
+    cdef Py_ssize_t i, n = weeks.shape[0]
+    result = np.empty(n, dtype=np.int8)
+    cdef signed char[:] kinds = result
+    for i in range(n):
+        if weeks[i] != "" and days[i] == "":
+            kinds[i] = HEADER
+        elif mornings[i] == "REST DAY":
+            kinds[i] = REST
+        else:
+            kinds[i] = PLAIN
+    return result
+
+
+def style_cells(kinds, codes, Py_ssize_t n_columns, session_columns, header, header_first, rest, rest_first,
+                subject_css):
+    cdef const signed char[:] kind = np.ascontiguousarray(kinds, dtype=np.int8)
+    cdef const long long[:, :] code = np.ascontiguousarray(codes, dtype=np.int64)
+    cdef Py_ssize_t i, j, slot, n = kind.shape[0], n_css = len(subject_css)
+    cdef list columns = list(session_columns)
+    cdef list css = list(subject_css)
+    cdef long long c
+    result = np.full((n, n_columns), "", dtype=object)
+    cdef object[:, :] styles = result
+    for i in range(n):
+        if kind[i] == HEADER:
+            styles[i, 0] = header_first
+            for j in range(1, n_columns):
+                styles[i, j] = header
+        elif kind[i] == REST:
+            styles[i, 0] = rest_first
+            for j in range(1, n_columns):
+                styles[i, j] = rest
+        else:
+            for slot in range(len(columns)):
+                c = code[i, slot]
+                if 0 <= c < n_css and css[c] is not None:
+                    styles[i, <Py_ssize_t>columns[slot]] = css[c]
+    return result
+
+
+def completion_matrix(dict checkbox_states, Py_ssize_t n_rows):
+    result = np.zeros((n_rows, len(SLOTS)), dtype=bool)
+    cdef unsigned char[:, :] done = result.view(np.uint8)
+    cdef str key, slot, row
+    cdef Py_ssize_t s
+    for key, checked in checkbox_states.items():
+        if not checked:
+            continue
+        slot, _, row = key.partition("_")
+        if slot == "morning":
+            s = 0
+        elif slot == "evening":
+            s = 1
+        else:
+            continue
+        if row.isdigit():
+            r = int(row)
+            if r < n_rows:
+                done[<Py_ssize_t>r, s] = 1
+    return result
+
+
+def progress_counts(codes, minutes, done, Py_ssize_t n_subjects):
+    cdef const long long[:, :] code = np.ascontiguousarray(codes, dtype=np.int64)
+    cdef const long long[:, :] length = np.ascontiguousarray(minutes, dtype=np.int64)
+    cdef const unsigned char[:, :] checked = np.ascontiguousarray(done, dtype=bool).view(np.uint8)
+    out = [np.zeros(n_subjects, dtype=np.int64) for _ in range(4)]
+    cdef long long[:] totals = out[0], completed = out[1], total_minutes = out[2], completed_minutes = out[3]
+    cdef Py_ssize_t i, s
+    cdef long long c
+    for i in range(code.shape[0]):
+        for s in range(code.shape[1]):
+            c = code[i, s]
+            if c < 0:
+                continue
+            totals[c] += 1
+            total_minutes[c] += length[i, s]
+            if checked[i, s]:
+                completed[c] += 1
+                completed_minutes[c] += length[i, s]
+    return tuple(out)
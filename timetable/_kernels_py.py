@@ -0,0 +1,119 @@
+# Pure-Python/NumPy implementations of the computational kernels. These are the
+# reference for the compiled versions in _kernels.pyx, which must return the same values.
+import numpy as np
+
+SLOTS = ("morning", "evening")
+
+# Row kinds of the schedule table
+PLAIN, HEADER, REST = 0, 1, 2
+
+MONTH_NAMES = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# "Jun 9"-style text for every (month, day of month), indexed by month * 31 + day - 1
+DAY_TEXT = np.array([f"{month} {day}" for month in MONTH_NAMES for day in range(1, 32)], dtype=object)
+
+
+# Sessions of a calendar laid out by the rotation, one entry per session in chronological order
+# (morning first). `is_rest` flags rest days, `rotation` is an (n, 2) array of subject codes with
+# -1 for a free slot. Returns (subject, ordinal, slot, calendar day index, study day number, schedule row).
+def session_layout(is_rest, rotation, n_subjects, week_length):
+    is_rest = np.asarray(is_rest, dtype=bool)
+    rotation = np.asarray(rotation, dtype=np.int64).reshape(-1, 2)
+    if not len(rotation):
+        raise ValueError("empty rotation")
+    study_index = np.cumsum(~is_rest) - 1
+    study = ~is_rest
+    codes = rotation[study_index[study] % len(rotation)]
+
+    subject = codes.ravel()
+    slot = np.tile(np.array([0, 1], dtype=np.int8), len(codes))
+    day_of = np.repeat(np.flatnonzero(study), 2)
+    scheduled = subject >= 0
+    subject, slot, day_of = subject[scheduled], slot[scheduled], day_of[scheduled]
+
+    # Per-subject session numbers in chronological order
+    ordinal = np.zeros(len(subject), dtype=np.int32)
+    for code in range(n_subjects):
+        hits = subject == code
+        ordinal[hits] = np.arange(1, int(hits.sum()) + 1)
+
+    return (
+        subject.astype(np.int8), ordinal, slot, day_of,
+        (study_index[day_of] + 1).astype(np.int32),
+        (day_of + day_of // week_length + 1).astype(np.int32),
+    )
+
+
+# "Jun 9"-style text of datetime64[D] dates
+def day_dates(dates):
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    months = dates.astype("datetime64[M]")
+    month = months.astype(np.int64) % 12
+    day = (dates - months).astype(np.int64)
+    return DAY_TEXT[month * 31 + day]
+
+
+# Display strings of sessions, e.g. "🔧 API: Session 3 (45 min)"; `labels` are the subject labels
+def session_labels(subject, ordinal, minutes, labels):
+    if not len(subject):
+        return np.zeros(0, dtype=object)
+    return (
+        np.array(labels, dtype=object)[np.asarray(subject, dtype=np.int64)] + ": Session "
+        + np.asarray(ordinal).astype(str).astype(object) + " ("
+        + np.asarray(minutes).astype(str).astype(object) + " min)"
+    )
+
+
+# Kind of every schedule row: HEADER for week headers, REST for rest days, PLAIN otherwise
+def row_kinds(week, day, morning):
+    header = (np.asarray(week, dtype=object) != "") & (np.asarray(day, dtype=object) == "")
+    rest = (np.asarray(morning, dtype=object) == "REST DAY") & ~header
+    return np.where(header, HEADER, np.where(rest, REST, PLAIN)).astype(np.int8)
+
+
+# CSS of every cell: `header` and `rest` rows get their style in every column (`*_first` in the
+# first one), session cells get the style of their subject (`subject_css[code]`, None for none)
+def style_cells(kinds, codes, n_columns, session_columns, header, header_first, rest, rest_first, subject_css):
+    kinds = np.asarray(kinds)
+    codes = np.asarray(codes)
+    styles = np.full((len(kinds), n_columns), "", dtype=object)
+    is_header = kinds == HEADER
+    is_rest = kinds == REST
+    styles[is_header] = header
+    styles[is_header, 0] = header_first
+    styles[is_rest] = rest
+    styles[is_rest, 0] = rest_first
+    plain = kinds == PLAIN
+    for code, css in enumerate(subject_css):
+        if css is None:
+            continue
+        for slot, column in enumerate(session_columns):
+            styles[plain & (codes[:, slot] == code), column] = css
+    return styles
+
+
+# Turn the `{slot}_{row}` checkbox dict into an (n_rows, 2) boolean array
+def completion_matrix(checkbox_states, n_rows):
+    done = np.zeros((n_rows, len(SLOTS)), dtype=bool)
+    for key, checked in checkbox_states.items():
+        if not checked:
+            continue
+        slot, _, row = key.partition("_")
+        if slot in SLOTS and row.isdigit() and int(row) < n_rows:
+            done[int(row), SLOTS.index(slot)] = True
+    return done
+
+
+# Per-subject (sessions, completed sessions, minutes, completed minutes) of (n_rows, 2)
+# code, minute and completion arrays; codes below 0 are empty slots
+def progress_counts(codes, minutes, done, n_subjects):
+    codes = np.asarray(codes)
+    minutes = np.asarray(minutes)
+    scheduled = codes >= 0
+    done = np.asarray(done, dtype=bool) & scheduled
+    return (
+        np.bincount(codes[scheduled], minlength=n_subjects).astype(np.int64),
+        np.bincount(codes[done], minlength=n_subjects).astype(np.int64),
+        np.bincount(codes[scheduled], weights=minutes[scheduled], minlength=n_subjects).astype(np.int64),
+        np.bincount(codes[done], weights=minutes[done], minlength=n_subjects).astype(np.int64),
+    )
@@ -0,0 +1,124 @@
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from timetable.progress import SLOTS
+
+# Columns of a completion event: unix seconds, checkbox state key, 1 = checked / 0 = unchecked
+EVENT_FIELDS = ("ts", "key", "done")
+
+# Weeks end on Sunday, so weekly buckets line up with the Monday-first schedule weeks
+WEEK_FREQ = "W-SUN"
+
+
+# Compact completion event for a checkbox change
+def make_event(key, checked, ts=None):
+    return [round(time.time() if ts is None else ts, 3), key, int(checked)]
+
+
+# Storage key of an event: sorts chronologically and is unique per toggle
+def event_key(event):
+    return f"{int(event[0] * 1000):015d}:{event[1]}"
+
+
+# Events joined with the sessions they refer to, in local time.
+# Each row carries the signed change (+1/-1 session, +/- minutes) it made;
+# toggles of slots without a session are dropped.
+def event_frame(events, sessions, n_rows):
+    frame = pd.DataFrame(list(events), columns=list(EVENT_FIELDS))
+    parts = frame["key"].str.extract(r"^([a-z]+)_(\d+)$")
+    slot = parts[0].map({name: code for code, name in enumerate(SLOTS)})
+    row = pd.to_numeric(parts[1])
+    valid = (slot.notna() & (row < n_rows)).to_numpy()
+
+    index = sessions.to_matrix(np.arange(len(sessions)), n_rows, fill=-1)
+    session = np.full(len(frame), -1, dtype=np.int64)
+    session[valid] = index[row[valid].astype(np.int64), slot[valid].astype(np.int64)]
+    frame = frame[session >= 0]
+    session = session[session >= 0]
+
+    local = datetime.now().astimezone().tzinfo
+    sign = np.where(frame["done"].to_numpy() > 0, 1, -1)
+    return pd.DataFrame({
+        "ts": pd.to_datetime(frame["ts"], unit="s", utc=True).dt.tz_convert(local).dt.tz_localize(None).to_numpy(),
+        "subject": sessions.subject[session].astype(np.int64),
+        "sessions": sign,
+        "minutes": sign * sessions.minutes[session].astype(np.int64),
+    }).sort_values("ts", kind="stable")
+
+
+# Longest and current run of consecutive active days (current counts up to `today` or the day before)
+def streaks(active, today):
+    if not active.any():
+        return 0, 0
+    runs = active.groupby((~active).cumsum()).cumsum()
+    longest = int(runs.max())
+    today = pd.Timestamp(today)
+    current = 0
+    for day in (today, today - pd.Timedelta(days=1)):
+        if day in runs.index and runs[day] > 0:
+            current = int(runs[day])
+            break
+    return longest, current
+
+
+# Burndown, daily/weekly minutes, streaks and per-subject velocity from the event log.
+#
+# `done` is the current completion matrix; completions without events (recorded
+# before the log existed) count as done on the plan's first day. Velocity is the
+# net number of sessions completed per week since the first recorded event.
+def compute_analytics(sessions, events, done, n_rows, today):
+    subject_names = [subject[0] for subject in sessions.spec.subjects]
+    n_subjects = len(subject_names)
+    today = pd.Timestamp(today).normalize()
+    ev = event_frame(events, sessions, n_rows)
+
+    # Completions the event log does not account for
+    completed_minutes = int(sessions.minutes[done[sessions.row, sessions.slot]].sum())
+    untracked = completed_minutes - int(ev["minutes"].sum())
+
+    plan_start = pd.Timestamp(sessions.spec.start)
+    plan_end = pd.Timestamp(sessions.date[-1]) if len(sessions) else plan_start
+    first = min(plan_start, ev["ts"].min().normalize()) if len(ev) else plan_start
+    days = pd.date_range(first, max(plan_end, today), freq="D")
+
+    daily = ev.set_index("ts")["minutes"].resample("D").sum().reindex(days, fill_value=0)
+    weekly = daily.resample(WEEK_FREQ).sum()
+
+    total_minutes = int(sessions.minutes.sum())
+    planned = pd.Series(sessions.minutes.astype(np.int64), index=pd.DatetimeIndex(sessions.date))
+    planned = planned.groupby(level=0).sum().reindex(days, fill_value=0)
+    actual = daily.copy()
+    actual.iloc[0] += untracked
+    burndown = pd.DataFrame({
+        "Planned": total_minutes - planned.cumsum(),
+        "Actual": (total_minutes - actual.cumsum()).where(days <= today),
+    }, index=days) / 60
+
+    longest, current = streaks(daily > 0, today)
+
+    by_week = ev.groupby([pd.Grouper(key="ts", freq=WEEK_FREQ), "subject"])["sessions"].sum().unstack(fill_value=0)
+    by_week = by_week.reindex(columns=range(n_subjects), fill_value=0)
+    n_weeks = max((today - ev["ts"].min().normalize()).days // 7 + 1, 1) if len(ev) else 1
+    totals = np.bincount(sessions.subject, minlength=n_subjects)
+    completed = np.bincount(sessions.subject[done[sessions.row, sessions.slot]], minlength=n_subjects)
+    per_week = by_week.sum().to_numpy() / n_weeks
+    remaining = totals - completed
+    velocity = pd.DataFrame({
+        "Subject": subject_names,
+        "Sessions / week": per_week,
+        "Remaining": remaining,
+        "Weeks to finish": np.divide(remaining, per_week, out=np.full(n_subjects, np.nan), where=per_week > 0),
+    })
+
+    return {
+        "burndown": burndown,
+        "daily": daily,
+        "weekly": weekly,
+        "longest_streak": longest,
+        "current_streak": current,
+        "velocity": velocity,
+        "events": len(ev),
+    }
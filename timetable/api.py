@@ -0,0 +1,299 @@
+# JSON API over the learners' timetable state, sharing the app's storage layer.
+#
+#     python -m timetable.api --port 8502
+#
+# Endpoints (all under /users/{user}):
+#     GET  /sessions                     sessions with completion state and notes;
+#                                        filters: from, to (ISO dates), subject, slot, done; offset, limit
+#     POST /sessions/{session}/toggle    set {"done": true|false}, or flip without a body
+#     PUT  /notes/{date}                 {"text": "..."} for the study day on that date
+#     GET  /progress                     per-subject and overall progress
+#     POST /batch                        {"updates": [{"session": "API-3", "done": true},
+#                                                     {"date": "2025-06-10", "notes": "..."}]}
+#
+# Storage calls run on a bounded pool of worker threads; the SQLite backend reuses a
+# bounded pool of connections. The JSON store can be shared with a running app on
+# POSIX systems, where its files are locked; SQLite scales better with many learners.
+# The plan is resolved like the app's default (TIMETABLE_PLAN_FILE or plans/default.toml)
+# once at start-up; restart the API after editing its file.
+import argparse
+from contextlib import asynccontextmanager
+from datetime import date
+from functools import lru_cache
+
+import anyio
+import numpy as np
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from timetable.analytics import event_key, make_event
+from timetable.config import configured_plan, storage_settings
+from timetable.export import learner_plan
+from timetable.legacy import load_upgraded
+from timetable.notes import LazyNotes, open_blobs
+from timetable.progress import ProgressCounter, completion_matrix
+from timetable.schedule import generate_sessions
+from timetable.sessions import SLOT_KEYS
+from timetable.storage import open_backend
+
+# Worker threads (and SQLite connections) serving storage calls
+POOL_SIZE = 8
+
+# Largest page of sessions returned at once
+MAX_LIMIT = 1000
+
+
+# Session table of a plan and its session-id -> index lookup
+@lru_cache(maxsize=16)
+def plan_sessions(spec):
+    sessions = generate_sessions(spec)
+    return sessions, {sessions.session_id(i): i for i in range(len(sessions))}
+
+
+def session_json(sessions, i, done, notes):
+    row = int(sessions.row[i])
+    return {
+        "id": sessions.session_id(i),
+        "key": sessions.state_key(i),
+        "date": str(sessions.date[i]),
+        "day": int(sessions.day[i]),
+        "slot": SLOT_KEYS[sessions.slot[i]],
+        "subject": sessions.spec.subjects[sessions.subject[i]][0],
+        "minutes": int(sessions.minutes[i]),
+        "done": bool(done.get(sessions.state_key(i), False)),
+        "notes": notes.get(f"notes_{row}", ""),
+    }
+
+
+# Blocking operations on one learner's state; run on the worker pool
+class TimetableService:
+    def __init__(self, store, base_plan, blobs):
+        self.store = store
+        self.base_plan = base_plan
+        self.blobs = blobs
+
+    def _context(self, user):
+        state = load_upgraded(self.store, user, self.base_plan)
+        state["notes"] = LazyNotes(state["notes"], self.blobs)
+        sessions, ids = plan_sessions(learner_plan(self.base_plan, state))
+        return state, sessions, ids
+
+    def list_sessions(self, user, start=None, end=None, subject=None, slot=None, done=None, offset=0, limit=100):
+        state, sessions, _ids = self._context(user)
+        checked = state["checkbox_states"]
+        mask = np.ones(len(sessions), dtype=bool)
+        if start is not None:
+            mask &= sessions.date >= np.datetime64(start, "D")
+        if end is not None:
+            mask &= sessions.date <= np.datetime64(end, "D")
+        if subject is not None:
+            names = [s[0] for s in sessions.spec.subjects]
+            if subject not in names:
+                raise ValueError(f"unknown subject: {subject!r}")
+            mask &= sessions.subject == names.index(subject)
+        if slot is not None:
+            if slot not in SLOT_KEYS:
+                raise ValueError(f"unknown slot: {slot!r}")
+            mask &= sessions.slot == SLOT_KEYS.index(slot)
+        selected = np.flatnonzero(mask)
+        if done is not None:
+            selected = [i for i in selected if checked.get(sessions.state_key(i), False) == done]
+        page = selected[offset:offset + limit]
+        return {
+            "total": len(selected),
+            "offset": offset,
+            "sessions": [session_json(sessions, i, checked, state["notes"]) for i in page],
+        }
+
+    # Storage changes for one update dict; raises KeyError/ValueError before anything is written
+    def _changes(self, state, sessions, ids, update):
+        if "session" in update:
+            i = ids.get(update["session"])
+            if i is None:
+                raise KeyError(f"unknown session: {update['session']!r}")
+            key = sessions.state_key(i)
+            done = update.get("done")
+            if done is None:
+                done = not state["checkbox_states"].get(key, False)
+            elif not isinstance(done, bool):
+                raise ValueError("'done' must be true or false")
+            event = make_event(key, done)
+            state["checkbox_states"][key] = done
+            return [("checkbox_states", key, done), ("events", event_key(event), event)]
+        if "date" in update:
+            text = update.get("notes", update.get("text"))
+            if not isinstance(text, str):
+                raise ValueError("notes must be a string")
+            rows = sessions.row[sessions.date == np.datetime64(date.fromisoformat(update["date"]), "D")]
+            if not len(rows):
+                raise KeyError(f"no study day on {update['date']}")
+            key = f"notes_{int(rows[0])}"
+            ref = state["notes"].save(key, text)
+            return [] if ref is None else [("notes", key, ref)]
+        raise ValueError("an update needs a 'session' or a 'date'")
+
+    # Apply updates atomically with respect to validation: all are checked, then written in one batch
+    def apply(self, user, updates):
+        state, sessions, ids = self._context(user)
+        changes = []
+        for update in updates:
+            changes.extend(self._changes(state, sessions, ids, update))
+        self.store.set_many(user, self.base_plan.name, changes)
+        return {"applied": len(updates)}
+
+    def toggle(self, user, session_id, done=None):
+        self.apply(user, [{"session": session_id, "done": done}])
+        state, sessions, ids = self._context(user)
+        return session_json(sessions, ids[session_id], state["checkbox_states"], state["notes"])
+
+    def set_notes(self, user, day, text):
+        self.apply(user, [{"date": day, "notes": text}])
+        return {"date": day, "notes": text}
+
+    def progress(self, user):
+        state, sessions, _ids = self._context(user)
+        n_rows = int(sessions.row.max(initial=0)) + 1
+        names = [s[0] for s in sessions.spec.subjects]
+        counter = ProgressCounter(
+            sessions.to_matrix(sessions.subject, n_rows, fill=-1),
+            sessions.to_matrix(sessions.minutes, n_rows),
+            names,
+            completion_matrix(state["checkbox_states"], n_rows),
+        )
+        summary = counter.summary()
+        return {
+            "subjects": {
+                name: {
+                    "sessions": int(summary["totals"][code]),
+                    "completed": int(summary["completed"][code]),
+                    "percent": round(float(summary["percent"][code]), 2),
+                    "minutes": int(summary["total_minutes"][code]),
+                    "completed_minutes": int(summary["completed_minutes"][code]),
+                }
+                for code, name in enumerate(names)
+            },
+            "total": summary["total"],
+            "completed": summary["completed_total"],
+            "overall": round(summary["overall"], 2),
+        }
+
+
+def _optional_date(value):
+    return None if value is None else date.fromisoformat(value)
+
+
+def _optional_bool(value):
+    if value is None:
+        return None
+    if value.lower() in ("true", "1", "yes"):
+        return True
+    if value.lower() in ("false", "0", "no"):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+async def _json_body(request, default=None):
+    body = await request.body()
+    if not body:
+        return default
+    try:
+        data = await request.json()
+    except ValueError:
+        raise ValueError("request body is not valid JSON")
+    if not isinstance(data, dict):
+        raise ValueError("request body must be a JSON object")
+    return data
+
+
+# ASGI application serving `store` (with note bodies in `blobs`) for `base_plan`
+def create_app(store, base_plan, blobs, pool_size=POOL_SIZE):
+    service = TimetableService(store, base_plan, blobs)
+    limiter = None
+
+    @asynccontextmanager
+    async def lifespan(app):
+        nonlocal limiter
+        limiter = anyio.CapacityLimiter(pool_size)
+        try:
+            yield
+        finally:
+            store.close()
+
+    async def run(func, *args):
+        return await anyio.to_thread.run_sync(func, *args, limiter=limiter)
+
+    async def health(request):
+        return JSONResponse({"status": "ok", "plan": base_plan.name})
+
+    async def sessions(request):
+        query = request.query_params
+        limit = max(min(int(query.get("limit", 100)), MAX_LIMIT), 0)
+        offset = max(int(query.get("offset", 0)), 0)
+        return JSONResponse(await run(
+            service.list_sessions, request.path_params["user"], _optional_date(query.get("from")),
+            _optional_date(query.get("to")), query.get("subject"), query.get("slot"),
+            _optional_bool(query.get("done")), offset, limit,
+        ))
+
+    async def toggle(request):
+        body = await _json_body(request, {})
+        return JSONResponse(await run(
+            service.toggle, request.path_params["user"], request.path_params["session"], body.get("done")
+        ))
+
+    async def notes(request):
+        body = await _json_body(request, {})
+        return JSONResponse(await run(
+            service.set_notes, request.path_params["user"], request.path_params["date"], body.get("text")
+        ))
+
+    async def progress(request):
+        return JSONResponse(await run(service.progress, request.path_params["user"]))
+
+    async def batch(request):
+        body = await _json_body(request, {})
+        updates = body.get("updates")
+        if not isinstance(updates, list) or not all(isinstance(update, dict) for update in updates):
+            raise ValueError("'updates' must be a list of objects")
+        return JSONResponse(await run(service.apply, request.path_params["user"], updates))
+
+    async def not_found(request, exc):
+        return JSONResponse({"error": str(exc.args[0]) if exc.args else "not found"}, status_code=404)
+
+    async def bad_request(request, exc):
+        return JSONResponse({"error": str(exc)}, status_code=400)
+
+    return Starlette(
+        routes=[
+            Route("/health", health),
+            Route("/users/{user}/sessions", sessions),
+            Route("/users/{user}/sessions/{session}/toggle", toggle, methods=["POST"]),
+            Route("/users/{user}/notes/{date}", notes, methods=["PUT"]),
+            Route("/users/{user}/progress", progress),
+            Route("/users/{user}/batch", batch, methods=["POST"]),
+        ],
+        exception_handlers={KeyError: not_found, ValueError: bad_request},
+        lifespan=lifespan,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local JSON API for the study timetable")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--storage", choices=["json", "sqlite"], help="backend (default: TIMETABLE_STORAGE or json)")
+    parser.add_argument("--data", help="state file (default: timetable_data.json or timetable_data.db)")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    plan, _report = configured_plan()
+    kind, path = storage_settings(kind=args.storage, path=args.data)
+    app = create_app(open_backend(kind, path), plan, open_blobs(path), args.pool_size)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
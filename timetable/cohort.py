@@ -0,0 +1,290 @@
+# Progress of a study group: one summary per learner state, aggregated into
+# per-subject completion distributions, on-track share and laggards.
+#
+#     python -m timetable.cohort states/            # a directory of JSON state files
+#                                                   # (timetable_data[.user][.plan].json)
+#     python -m timetable.cohort timetable_data.db  # every learner in a SQLite store
+#
+# Learner states are parsed on a process pool; summaries are cached per file
+# stamp (per learner version for SQLite), so a refresh only re-reads what changed.
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from datetime import date, datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from timetable.config import configured_plan, storage_settings
+from timetable.export import learner_plan
+from timetable.legacy import upgrade_state
+from timetable.plans import PLAN_CACHE, plan_files, plans_dir
+from timetable.progress import completion_matrix
+from timetable.schedule import generate_sessions
+from timetable.storage import DEFAULT_PLAN_NAME, DEFAULT_USER, SqliteBackend, read_journaled
+
+# A learner is on track with at least this share of the sessions due so far completed
+ON_TRACK = 0.9
+
+# Laggards listed by default
+LAGGARDS = 10
+
+# Below this many states to (re)read, they are read in-process: starting the pool costs more
+POOL_MIN = 64
+
+
+@lru_cache(maxsize=64)
+def _sessions(spec):
+    return generate_sessions(spec)
+
+
+# Per-subject session, completion and due-by-`today` counts of one learner's state,
+# measured against their own plan (the base plan with their re-plan layout)
+def learner_summary(state, base_plan, today):
+    upgrade_state(state, base_plan)
+    sessions = _sessions(learner_plan(base_plan, state))
+    n_subjects = len(sessions.spec.subjects)
+    n_rows = int(sessions.row.max(initial=0)) + 1
+    done = completion_matrix(state.get("checkbox_states", {}), n_rows)[sessions.row, sessions.slot]
+    due = sessions.date <= np.datetime64(today, "D")
+    events = state.get("events", {})
+    return {
+        "sessions": np.bincount(sessions.subject, minlength=n_subjects).tolist(),
+        "completed": np.bincount(sessions.subject[done], minlength=n_subjects).tolist(),
+        "due": np.bincount(sessions.subject[due], minlength=n_subjects).tolist(),
+        "last_active": max((event[0] for event in events.values()), default=None),
+    }
+
+
+# Content stamp of a JSON state file and its journal
+def file_stamp(path):
+    stamp = []
+    for part in (path, path + ".journal"):
+        try:
+            stat = os.stat(part)
+            stamp.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        except FileNotFoundError:
+            stamp.append("-")
+    return "/".join(stamp)
+
+
+# Cache key part identifying what a summary was measured against
+def _measure_key(base_plan, today):
+    return f"{hashlib.blake2b(repr(base_plan).encode(), digest_size=8).hexdigest()}@{today.isoformat()}"
+
+
+def _summarize_file(job):
+    path, base_plan, today = job
+    try:
+        state, _stamps, _records, _length = read_journaled(path)
+        return learner_summary(state, base_plan, today)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        return {"error": f"{type(exc).__name__}: {exc}"}
+
+
+@lru_cache(maxsize=4)
+def _sqlite(path):
+    return SqliteBackend(path)
+
+
+def _summarize_user(job):
+    user, path, base_plan, today = job
+    try:
+        return learner_summary(_sqlite(path).load(user, base_plan.name), base_plan, today)
+    except (sqlite3.Error, ValueError, KeyError, TypeError) as exc:
+        return {"error": f"{type(exc).__name__}: {exc}"}
+
+
+# Name of the known plans (plan files and `extra`), used to tell plan suffixes from user names
+def known_plans(extra=()):
+    names = set(extra)
+    for path in plan_files(plans_dir()).values():
+        try:
+            names.add(PLAN_CACHE.definition(path).spec.name)
+        except (OSError, ValueError):
+            continue
+    names.discard(DEFAULT_PLAN_NAME)
+    return names
+
+
+# (user, plan) of a JSON state file named like JsonBackend.path_for(): <root>[.user][.plan].json,
+# or None for files of another root. A suffix naming one of `plans` is the plan.
+def parse_state_name(path, root, plans):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if stem != root and not stem.startswith(root + "."):
+        return None
+    middle = stem[len(root) + 1:]
+    for plan in sorted(plans, key=len, reverse=True):
+        if middle == plan:
+            return DEFAULT_USER, plan
+        if middle.endswith("." + plan):
+            return middle[:-len(plan) - 1], plan
+    return middle or DEFAULT_USER, DEFAULT_PLAN_NAME
+
+
+# State files of a directory for plan `plan` as {learner: path}. A store only has its
+# journal (<name>.json.journal) until it first compacts, so those learners count too.
+def state_files(directory, plan, root, plans=()):
+    files = {}
+    pattern = os.path.join(directory, glob.escape(root) + "*.json")
+    paths = {path.removesuffix(".journal") for path in glob.glob(pattern) + glob.glob(pattern + ".journal")}
+    for path in sorted(paths):
+        parsed = parse_state_name(path, root, known_plans([*plans, plan]))
+        if parsed is not None and parsed[1] == plan:
+            files[parsed[0]] = path
+    return files
+
+
+# Stem of the app's state files (timetable_data for timetable_data.json)
+def default_root():
+    return os.path.splitext(os.path.basename(storage_settings()[1]))[0]
+
+
+# Learners of a SQLite store and their current versions, for `plan`
+def sqlite_learners(path, plan):
+    # closing(): a connection's own context manager only ends the transaction
+    with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as conn:
+        return dict(conn.execute(
+            "SELECT user, COALESCE(MAX(version), 0) FROM state WHERE plan = ? GROUP BY user ORDER BY user", (plan,)
+        ))
+
+
+# Summaries of every learner in `source` (a directory of JSON state files named
+# <root>[.user][.plan].json, or a SQLite store) as {learner: summary}, for the plan
+# of `base_plan`. `cache` ({learner: [key, summary]}) is consulted and updated in
+# place; only learners whose key changed are read, on `workers` processes.
+def scan(source, base_plan, today, cache=None, workers=None, root=None):
+    cache = {} if cache is None else cache
+    measure = _measure_key(base_plan, today)
+    if os.path.isdir(source):
+        paths = state_files(source, base_plan.name, root or default_root())
+        keys = {learner: f"{file_stamp(path)}|{measure}" for learner, path in paths.items()}
+        task, job = _summarize_file, lambda learner: (paths[learner], base_plan, today)
+    else:
+        versions = sqlite_learners(source, base_plan.name)
+        keys = {learner: f"v{version}|{measure}" for learner, version in versions.items()}
+        task, job = _summarize_user, lambda learner: (learner, source, base_plan, today)
+
+    stale = [learner for learner, key in keys.items() if cache.get(learner, [None])[0] != key]
+    jobs = [job(learner) for learner in stale]
+    workers = workers or os.cpu_count() or 1
+    if len(jobs) < POOL_MIN or workers == 1:
+        summaries = [task(args) for args in jobs]
+    else:
+        # Workers start from a clean server process, since forking a threaded one (e.g. Streamlit) is unsafe
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        if context.get_start_method() == "forkserver":
+            context.set_forkserver_preload(["timetable.cohort"])
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            summaries = list(pool.map(task, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    for learner, summary in zip(stale, summaries):
+        cache[learner] = [keys[learner], summary]
+    for learner in set(cache) - set(keys):
+        del cache[learner]
+    return {learner: cache[learner][1] for learner in keys}
+
+
+# Per-learner table, per-subject completion distribution, on-track share and laggards
+def cohort_report(summaries, subject_names, today, on_track=ON_TRACK, laggards=LAGGARDS):
+    rows = []
+    errors = {}
+    for learner, summary in summaries.items():
+        if "error" in summary:
+            errors[learner] = summary["error"]
+            continue
+        sessions, completed, due = (np.array(summary[field]) for field in ("sessions", "completed", "due"))
+        last = summary["last_active"]
+        rows.append({
+            "Learner": learner,
+            "Completed": int(completed.sum()),
+            "Due": int(due.sum()),
+            "Sessions": int(sessions.sum()),
+            **{name: completed[code] * 100.0 / sessions[code] if sessions[code] else 0.0
+               for code, name in enumerate(subject_names)},
+            "Last active": datetime.fromtimestamp(last).date() if last else None,
+        })
+    learners = pd.DataFrame(rows, columns=[
+        "Learner", "Completed", "Due", "Sessions", *subject_names, "Last active",
+    ]).astype({"Completed": np.int64, "Due": np.int64, "Sessions": np.int64, **dict.fromkeys(subject_names, float)})
+    learners["Percent"] = np.divide(
+        learners["Completed"] * 100.0, learners["Sessions"],
+        out=np.zeros(len(learners)), where=learners["Sessions"].to_numpy() > 0,
+    )
+    learners["Pace"] = np.divide(
+        learners["Completed"].to_numpy(dtype=float), learners["Due"].to_numpy(dtype=float),
+        out=np.ones(len(learners)), where=learners["Due"].to_numpy() > 0,
+    )
+    learners["Behind"] = (learners["Due"] - learners["Completed"]).clip(lower=0)
+    learners["On track"] = learners["Pace"] >= on_track
+
+    distribution = learners[subject_names + ["Percent"]].describe(percentiles=[0.25, 0.5, 0.75]).T
+    distribution = distribution.rename(columns={"25%": "p25", "50%": "median", "75%": "p75"})
+    return {
+        "learners": learners.sort_values("Learner", ignore_index=True),
+        "distribution": distribution[["count", "mean", "min", "p25", "median", "p75", "max"]],
+        "on_track_percent": float(learners["On track"].mean() * 100) if len(learners) else 0.0,
+        "laggards": learners[learners["Behind"] > 0].nlargest(laggards, "Behind")[
+            ["Learner", "Completed", "Due", "Behind", "Pace", "Last active"]
+        ],
+        "errors": errors,
+        "today": today,
+    }
+
+
+def _load_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Progress of every learner in a study group")
+    parser.add_argument("source", help="directory of JSON learner states, or a SQLite store")
+    parser.add_argument("--days", type=int, help="plan length override, as TIMETABLE_DAYS")
+    parser.add_argument("--today", type=date.fromisoformat, default=date.today(), help="ISO date (default: today)")
+    parser.add_argument("--workers", type=int, help="processes (default: one per CPU; 1 reads in-process)")
+    parser.add_argument("--root", help="state file name stem (default: that of TIMETABLE_DATA, timetable_data)")
+    parser.add_argument("--cache", help="JSON file caching summaries between runs")
+    parser.add_argument("--on-track", type=float, default=ON_TRACK, help="share of due sessions to be on track")
+    parser.add_argument("--laggards", type=int, default=LAGGARDS)
+    parser.add_argument("--json", action="store_true", help="print the per-learner table as JSON lines")
+    args = parser.parse_args(argv)
+
+    base, _report = configured_plan(days=args.days)
+    cache = _load_cache(args.cache) if args.cache else {}
+    summaries = scan(args.source, base, args.today, cache, args.workers, args.root)
+    if args.cache:
+        with open(args.cache, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+
+    names = [subject[0] for subject in base.subjects]
+    report = cohort_report(summaries, names, args.today, args.on_track, args.laggards)
+    if args.json:
+        report["learners"].to_json(sys.stdout, orient="records", lines=True, date_format="iso")
+        return
+    learners = report["learners"]
+    print(f"{len(learners)} learners · {report['on_track_percent']:.1f}% on track on {args.today}")
+    print()
+    print("Completion by subject (%)")
+    print(report["distribution"].round(1).to_string())
+    if len(report["laggards"]):
+        print()
+        print("Furthest behind")
+        print(report["laggards"].round(2).to_string(index=False))
+    for learner, error in report["errors"].items():
+        print(f"{learner}: unreadable ({error})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import os
+from dataclasses import replace
+
+from timetable.plans import DEFAULT_PLAN_STEM, default_definition
+from timetable.solver import solve_plan
+
+
+# Study plan chosen by the environment, shared by the app, the API and the command-line tools:
+# `definition` (a plans.PlanDefinition), else the plan file in TIMETABLE_PLAN_FILE, else
+# plans/default.toml (see plans.plan_file). TIMETABLE_DAYS (or `days`) overrides its length and TIMETABLE_PLAN=solved
+# balances sessions against the definition's hour targets instead of the fixed rotation.
+# Returns the plan and the solver's report (None for the fixed rotation).
+def configured_plan(environ=None, days=None, definition=None):
+    environ = os.environ if environ is None else environ
+    if definition is None:
+        definition = default_definition(environ)
+    plan = definition.spec
+    days = days or environ.get("TIMETABLE_DAYS")
+    if days:
+        plan = replace(plan, days=int(days))
+    if environ.get("TIMETABLE_PLAN") == "solved":
+        targets = dict(definition.targets)
+        missing = [name for name, _label, _minutes in plan.subjects if name not in targets]
+        if missing:
+            raise ValueError(f"plan {plan.name!r} has no target_hours for {', '.join(missing)}")
+        return solve_plan(
+            plan.start, plan.days,
+            {name: {"label": label, "minutes": minutes, "target_hours": targets[name]}
+             for name, label, minutes in plan.subjects},
+            rest_weekdays=plan.rest_weekdays, week_length=plan.week_length,
+            name="solved" if plan.name == DEFAULT_PLAN_STEM else f"{plan.name}-solved",
+        )
+    return plan, None
+
+
+# Storage backend ("json", a single timetable_data.json file, or "sqlite" for multi-learner
+# servers) and its data file, from TIMETABLE_STORAGE and TIMETABLE_DATA unless given
+def storage_settings(environ=None, kind=None, path=None):
+    environ = os.environ if environ is None else environ
+    kind = kind or environ.get("TIMETABLE_STORAGE", "json")
+    path = path or environ.get("TIMETABLE_DATA", "timetable_data.db" if kind == "sqlite" else "timetable_data.json")
+    return kind, path
@@ -0,0 +1,237 @@
+import argparse
+import io
+import sys
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from timetable.config import configured_plan, storage_settings
+from timetable.legacy import load_upgraded
+from timetable.notes import LazyNotes, open_blobs
+from timetable.progress import completion_matrix
+from timetable.replan import apply_layout
+from timetable.schedule import generate_sessions
+from timetable.sessions import SLOT_KEYS
+from timetable.storage import DEFAULT_USER, open_backend
+
+# One row per session; "Session" (e.g. "API-3") identifies it independently of the table layout
+EXPORT_COLUMNS = [
+    "Session", "Date", "Week", "Day", "Slot", "Subject", "Session Number", "Minutes", "Done", "Notes",
+]
+
+# Sessions per chunk written or read at a time
+CHUNK_SIZE = 4096
+
+# Start time of the morning and evening sessions in calendar exports
+SLOT_TIMES = (timedelta(hours=7), timedelta(hours=19))
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "ics": ("text/calendar", "ics"),
+}
+
+
+# Export rows of sessions[start:stop] joined with their completion state and day notes
+def export_chunk(sessions, done, notes, start, stop):
+    spec = sessions.spec
+    part = slice(start, stop)
+    names = np.array([subject[0] for subject in spec.subjects], dtype=object)
+    subject = names[sessions.subject[part]]
+    ordinal = sessions.ordinal[part]
+    rows = sessions.row[part]
+    slots = sessions.slot[part]
+    return pd.DataFrame({
+        "Session": subject + "-" + ordinal.astype(str).astype(object),
+        "Date": sessions.date[part],
+        "Week": rows // (spec.week_length + 1) + 1,
+        "Day": sessions.day[part],
+        "Slot": np.array(SLOT_KEYS, dtype=object)[slots],
+        "Subject": subject,
+        "Session Number": ordinal,
+        "Minutes": sessions.minutes[part],
+        "Done": done[rows, slots] if len(done) else np.zeros(len(rows), dtype=bool),
+        "Notes": [notes.get(f"notes_{row}", "") for row in rows.tolist()],
+    }, columns=EXPORT_COLUMNS)
+
+
+# Export rows in chunks of `chunk_size` sessions
+def iter_export(sessions, done, notes, chunk_size=CHUNK_SIZE):
+    for start in range(0, len(sessions), chunk_size):
+        yield export_chunk(sessions, done, notes, start, min(start + chunk_size, len(sessions)))
+
+
+def write_csv(f, sessions, done, notes, chunk_size=CHUNK_SIZE):
+    for i, chunk in enumerate(iter_export(sessions, done, notes, chunk_size)):
+        chunk.to_csv(f, header=i == 0, index=False, date_format="%Y-%m-%d")
+
+
+# Parquet with one row group per chunk (needs pyarrow)
+def write_parquet(f, sessions, done, notes, chunk_size=CHUNK_SIZE):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in iter_export(sessions, done, notes, chunk_size):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(f, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _ics_text(value):
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+# Content line folded at 75 octets without splitting UTF-8 characters (RFC 5545 3.1)
+def _ics_line(line):
+    data = line.encode("utf-8")
+    parts = []
+    limit = 75
+    while len(data) > limit:
+        cut = limit
+        while data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+        limit = 74
+    parts.append(data.decode("utf-8"))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+# iCalendar file with one event per session; completed sessions are marked with ✅
+def write_ics(f, sessions, done, notes, chunk_size=CHUNK_SIZE):
+    labels = {subject[0]: subject[1] for subject in sessions.spec.subjects}
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    f.write(_ics_line("BEGIN:VCALENDAR"))
+    f.write(_ics_line("VERSION:2.0"))
+    f.write(_ics_line("PRODID:-//TimeTable//Study Timetable//EN"))
+    f.write(_ics_line(f"X-WR-CALNAME:{_ics_text(sessions.spec.name)} study plan"))
+    for chunk in iter_export(sessions, done, notes, chunk_size):
+        begin = chunk["Date"] + chunk["Slot"].map(dict(zip(SLOT_KEYS, SLOT_TIMES))).astype("timedelta64[ns]")
+        end = begin + pd.to_timedelta(chunk["Minutes"], unit="m")
+        summary = (
+            np.where(chunk["Done"], "✅ ", "") + chunk["Subject"].map(labels).astype(object)
+            + ": Session " + chunk["Session Number"].astype(str)
+        )
+        for session, start, stop, title, note in zip(
+            chunk["Session"], begin.dt.strftime("%Y%m%dT%H%M%S"), end.dt.strftime("%Y%m%dT%H%M%S"),
+            summary, chunk["Notes"]
+        ):
+            f.write("BEGIN:VEVENT\r\n")
+            f.write(_ics_line(f"UID:{session}-{sessions.spec.name}@timetable"))
+            f.write(f"DTSTAMP:{stamp}\r\nDTSTART:{start}\r\nDTEND:{stop}\r\n")
+            f.write(_ics_line(f"SUMMARY:{_ics_text(title)}"))
+            if note:
+                f.write(_ics_line(f"DESCRIPTION:{_ics_text(note)}"))
+            f.write("END:VEVENT\r\n")
+    f.write(_ics_line("END:VCALENDAR"))
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet, "ics": write_ics}
+
+
+class _EncodingWriter:
+    __slots__ = ("raw",)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def write(self, text):
+        return self.raw.write(text.encode("utf-8"))
+
+
+# Write an export to an in-memory buffer and return it rewound, e.g. for a download
+# button (Streamlit takes bytes or BytesIO and holds the whole file in memory anyway)
+def export_file(fmt, sessions, done, notes):
+    f = io.BytesIO()
+    # Text formats are encoded chunk by chunk as they are written
+    WRITERS[fmt](f if fmt == "parquet" else _EncodingWriter(f), sessions, done, notes)
+    f.seek(0)
+    return f
+
+
+# Completion states from an exported CSV as (checkbox key, done) pairs, read in chunks.
+# Rows are matched by their "Session" id; ids the plan does not have are skipped.
+def read_progress_csv(f, sessions, chunk_size=CHUNK_SIZE):
+    names = [subject[0] for subject in sessions.spec.subjects]
+    lookup = np.full((len(names), int(sessions.ordinal.max(initial=0)) + 1), -1, dtype=np.int64)
+    lookup[sessions.subject, sessions.ordinal] = np.arange(len(sessions))
+    codes = {name: code for code, name in enumerate(names)}
+
+    for chunk in pd.read_csv(f, usecols=["Session", "Done"], dtype={"Session": str}, chunksize=chunk_size):
+        parts = chunk["Session"].str.rsplit("-", n=1, expand=True)
+        subject = parts[0].map(codes)
+        ordinal = pd.to_numeric(parts[1], errors="coerce")
+        valid = (subject.notna() & ordinal.notna() & (ordinal < lookup.shape[1])).to_numpy()
+        index = np.full(len(chunk), -1, dtype=np.int64)
+        index[valid] = lookup[subject[valid].astype(np.int64), ordinal[valid].astype(np.int64)]
+        checked = chunk["Done"].astype(str).str.strip().str.lower().isin(["true", "1", "yes", "y", "x", "✅"])
+        for i, value in zip(index[index >= 0], checked.to_numpy()[index >= 0]):
+            yield sessions.state_key(i), bool(value)
+
+
+# Plan of a learner: the base plan with their stored re-plan layout applied
+def learner_plan(base, state):
+    layout = state.get("plan", {}).get("layout")
+    return apply_layout(base, layout) if layout else base
+
+
+# Command line: export a learner's schedule and progress, or import progress from CSV
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or import study timetable progress")
+    parser.add_argument("--storage", choices=["json", "sqlite"], help="backend (default: TIMETABLE_STORAGE or json)")
+    parser.add_argument("--data", help="state file (default: timetable_data.json or timetable_data.db)")
+    parser.add_argument("--user", default=DEFAULT_USER)
+    parser.add_argument("--days", type=int, help="plan length override, as TIMETABLE_DAYS")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="write the schedule joined with progress and notes")
+    export.add_argument("--format", choices=list(WRITERS), default="csv")
+    export.add_argument("--output", "-o", help="output file (default: stdout for csv/ics)")
+    load = commands.add_parser("import", help="apply the Done column of an exported CSV")
+    load.add_argument("input", help="CSV file, or - for stdin")
+    args = parser.parse_args(argv)
+
+    base, _report = configured_plan(days=args.days)
+    kind, path = storage_settings(kind=args.storage, path=args.data)
+    store = open_backend(kind, path)
+    try:
+        state = load_upgraded(store, args.user, base)
+        sessions = generate_sessions(learner_plan(base, state))
+        n_rows = int(sessions.row.max(initial=0)) + 1
+
+        if args.command == "export":
+            done = completion_matrix(state.get("checkbox_states", {}), n_rows)
+            notes = LazyNotes(state.get("notes", {}), open_blobs(path))
+            if args.format == "parquet":
+                if not args.output:
+                    parser.error("--output is required for parquet")
+                with open(args.output, "wb") as f:
+                    write_parquet(f, sessions, done, notes)
+            elif args.output:
+                with open(args.output, "w", encoding="utf-8", newline="") as f:
+                    WRITERS[args.format](f, sessions, done, notes)
+            else:
+                WRITERS[args.format](sys.stdout, sessions, done, notes)
+            return
+
+        current = state.get("checkbox_states", {})
+        changed = 0
+        source = sys.stdin if args.input == "-" else args.input
+        for key, checked in read_progress_csv(source, sessions):
+            if current.get(key, False) != checked:
+                store.set(args.user, base.name, "checkbox_states", key, checked)
+                current[key] = checked
+                changed += 1
+        print(f"Updated {changed} sessions", file=sys.stderr)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# Computational kernels of the schedule, style and progress code: the compiled
+# extension (timetable/_kernels.pyx, built with `python setup.py build_ext --inplace`)
+# when it is available, else the pure-Python implementations, which give identical results.
+try:
+    from timetable._kernels import (
+        completion_matrix, day_dates, progress_counts, row_kinds, session_labels, session_layout, style_cells,
+    )
+    COMPILED = True
+except ImportError:
+    from timetable._kernels_py import (
+        completion_matrix, day_dates, progress_counts, row_kinds, session_labels, session_layout, style_cells,
+    )
+    COMPILED = False
+
+from timetable._kernels_py import HEADER, PLAIN, REST
+
+__all__ = [
+    "COMPILED", "HEADER", "PLAIN", "REST", "completion_matrix", "day_dates", "progress_counts", "row_kinds",
+    "session_labels", "session_layout", "style_cells",
+]
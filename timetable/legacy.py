@@ -0,0 +1,94 @@
+# State saved by the original hand-written 45-day table. Its rows 0-39 match the
+# generated schedule, but after day 30 it jumped to a "FINAL DAYS" header (row 40)
+# and days 40-45 (rows 41-47, with a rest day at row 43), so keys saved against
+# those rows now point at other days. They are moved once, on load: checkboxes to
+# the session they were ticked for (by id, e.g. "API-21"), notes to the day now
+# holding that row's sessions (the rest day's to the same calendar day).
+#
+# The original table stored a checkbox for every one of its study rows on the first
+# save, so its files always have keys on row 46, a rest day of the generated
+# calendar; the current code only stores checkboxes of scheduled sessions.
+from datetime import date
+
+from timetable.schedule import _calendar, _day_rows, generate_sessions
+
+LEGACY_START = date(2025, 6, 9)
+
+# Legacy row -> (morning session id, evening session id, date)
+LEGACY_ROWS = {
+    41: ("API-21", "Statistics-21", date(2025, 7, 24)),
+    42: ("Statistics-22", "LLM-21", date(2025, 7, 25)),
+    43: (None, None, date(2025, 7, 26)),
+    44: ("API-22", "LLM-22", date(2025, 7, 27)),
+    45: ("API-23", "Statistics-23", date(2025, 7, 28)),
+    46: ("Statistics-24", "LLM-23", date(2025, 7, 29)),
+    47: ("API-24", "LLM-24", date(2025, 7, 30)),
+}
+
+# Marker stored in the "plan" section once a state uses the generated row layout
+LAYOUT_KEY = "row_layout"
+LAYOUT = "calendar"
+
+
+def _legacy_keys(state):
+    return [
+        (section, f"{prefix}_{row}")
+        for row in LEGACY_ROWS
+        for section, prefix in (("checkbox_states", "morning"), ("checkbox_states", "evening"), ("notes", "notes"))
+        if f"{prefix}_{row}" in state.get(section, {})
+    ]
+
+
+# Whether `state` was saved by the original table for the default plan `spec`: it has
+# checkboxes on rows where the generated layout has no session, and no layout marker
+# (or re-plan layout) yet
+def is_legacy(state, spec):
+    if spec.name != "default" or spec.start != LEGACY_START or state.get("plan"):
+        return False
+    scheduled = {f"{prefix}_{row}" for row in generate_sessions(spec).row.tolist() for prefix in ("morning", "evening")}
+    return any(key not in scheduled for key in state.get("checkbox_states", {})) and bool(_legacy_keys(state))
+
+
+# (section, key, value) changes moving a legacy state's rows 41-47 onto the generated layout
+def legacy_changes(state, spec):
+    sessions = generate_sessions(spec)
+    key_of = {sessions.session_id(i): sessions.state_key(i) for i in range(len(sessions))}
+    row_of_session = {sessions.session_id(i): int(sessions.row[i]) for i in range(len(sessions))}
+    dates, _is_rest = _calendar(spec)
+    row_of = dict(zip(dates.to_numpy().astype("datetime64[D]").tolist(), _day_rows(len(dates), spec.week_length).tolist()))
+
+    moved = {"checkbox_states": {}, "notes": {}}
+    for row, (morning, evening, day) in LEGACY_ROWS.items():
+        for prefix, session in (("morning", morning), ("evening", evening)):
+            value = state["checkbox_states"].get(f"{prefix}_{row}")
+            if value is not None and session in key_of:
+                moved["checkbox_states"][key_of[session]] = value
+        text = state["notes"].get(f"notes_{row}")
+        target = row_of_session.get(morning) if morning else row_of.get(day)
+        if text and target is not None:
+            moved["notes"][f"notes_{target}"] = text
+
+    changes = [(section, key, False if section == "checkbox_states" else "")
+               for section, key in _legacy_keys(state) if key not in moved[section]]
+    changes += [(section, key, value) for section, values in moved.items() for key, value in values.items()]
+    return changes + [("plan", LAYOUT_KEY, LAYOUT)]
+
+
+# Apply the legacy remap to a loaded `state` in place; returns the changes (empty if none
+# were needed) so callers with a store can persist them
+def upgrade_state(state, spec):
+    if not is_legacy(state, spec):
+        return []
+    changes = legacy_changes(state, spec)
+    for section, key, value in changes:
+        state.setdefault(section, {})[key] = value
+    return changes
+
+
+# Load a learner's state and persist the legacy remap if it was needed
+def load_upgraded(store, user, spec):
+    state = store.load(user, spec.name)
+    changes = upgrade_state(state, spec)
+    if changes:
+        store.set_many(user, spec.name, changes)
+    return state
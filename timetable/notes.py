@@ -0,0 +1,208 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import zlib
+from collections.abc import MutableMapping
+from functools import lru_cache
+
+# Note bodies at least this long (UTF-8 bytes) are stored zlib-compressed when that is smaller
+COMPRESS_MIN = 512
+
+# Header byte of a blob file: plain UTF-8 or zlib-compressed
+PLAIN, COMPRESSED = b"t", b"z"
+
+# Unreferenced blobs younger than this (seconds) are kept by sweep()
+SWEEP_MIN_AGE = 24 * 3600
+
+
+def note_digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Reference kept in the "notes" section in place of a note body
+def note_ref(digest):
+    return {"blob": digest}
+
+
+def is_ref(value):
+    return isinstance(value, dict) and "blob" in value
+
+
+# Blob files are immutable, so their bodies can be shared by every session
+@lru_cache(maxsize=4096)
+def _read_blob(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    body = zlib.decompress(data[1:]) if data[:1] == COMPRESSED else data[1:]
+    return body.decode("utf-8")
+
+
+# Content-addressed store of note bodies: one file per distinct text under `root`,
+# named by its digest (root/ab/cdef...), so equal notes share a file and a body
+# already stored is never written again. With `defer` (e.g. a write-behind
+# backend's), `put()` only computes the reference and the file is written by
+# `defer`'s thread, before the changes recorded after it; until then `get()`
+# answers from memory.
+class NoteBlobs:
+    def __init__(self, root, compress_min=COMPRESS_MIN, defer=None):
+        self.root = root
+        self.compress_min = compress_min
+        self.defer = defer
+        self._unwritten = {}  # digest -> body queued with `defer`
+        self._lock = threading.Lock()
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    # Store `text` unless a blob with its digest exists; returns the reference ("" stays inline)
+    def put(self, text):
+        if not text:
+            return ""
+        digest = note_digest(text)
+        if self.defer is None:
+            self._write(digest, text)
+        else:
+            with self._lock:
+                queued = digest in self._unwritten
+                self._unwritten[digest] = text
+            if not queued:
+                self.defer(self._write_queued, digest)
+        return note_ref(digest)
+
+    def _write_queued(self, digest):
+        with self._lock:
+            text = self._unwritten[digest]
+        self._write(digest, text)
+        with self._lock:
+            del self._unwritten[digest]
+
+    def _write(self, digest, text):
+        path = self.path(digest)
+        if os.path.exists(path):
+            # Referenced again: a fresh mtime keeps sweep() from collecting it meanwhile
+            os.utime(path)
+            return
+        body = text.encode("utf-8")
+        data = PLAIN + body
+        if len(body) >= self.compress_min:
+            packed = zlib.compress(body, 6)
+            if len(packed) < len(body):
+                data = COMPRESSED + packed
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so a blob file is either complete or absent
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    # Body of a stored value: a reference, or a note kept inline by older versions
+    def get(self, value):
+        if is_ref(value):
+            with self._lock:
+                text = self._unwritten.get(value["blob"])
+            return text if text is not None else _read_blob(self.path(value["blob"]))
+        return value or ""
+
+    # Remove the blob files (and leftover temp files) whose digest is not in `referenced`
+    # and that were not written or referenced in the last `min_age` seconds, which keeps
+    # a body put just before the state referencing it was saved; returns the number removed
+    def sweep(self, referenced, min_age=SWEEP_MIN_AGE):
+        cutoff = time.time() - min_age
+        removed = 0
+        try:
+            prefixes = os.listdir(self.root)
+        except FileNotFoundError:
+            return 0
+        for prefix in prefixes:
+            directory = os.path.join(self.root, prefix)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                digest = prefix + name
+                with self._lock:
+                    if digest in referenced or digest in self._unwritten:
+                        continue
+                path = os.path.join(directory, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.unlink(path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+
+# Sweep the blobs of `store`: keep those referenced by any learner's notes in any plan
+def sweep_notes(store, blobs, min_age=SWEEP_MIN_AGE):
+    referenced = {value["blob"] for value in store.section_values("notes") if is_ref(value)}
+    return blobs.sweep(referenced, min_age)
+
+
+# Blob store next to a state file, e.g. timetable_data.json.notes/
+def open_blobs(path, defer=None):
+    return NoteBlobs(path + ".notes", defer=defer)
+
+
+# Notes of a learner keyed like the "notes" section ("notes_12"), reading a body only
+# when its note is first accessed. `refs` is the stored section: references to
+# blobs, or inline bodies saved by older versions.
+class LazyNotes(MutableMapping):
+    def __init__(self, refs, blobs):
+        self.refs = dict(refs)
+        self.blobs = blobs
+        self._bodies = {}
+
+    def __getitem__(self, key):
+        if key not in self._bodies:
+            self._bodies[key] = self.blobs.get(self.refs[key])
+        return self._bodies[key]
+
+    def __setitem__(self, key, text):
+        self.refs[key] = self.blobs.put(text)
+        self._bodies[key] = text
+
+    def __delitem__(self, key):
+        del self.refs[key]
+        self._bodies.pop(key, None)
+
+    def __iter__(self):
+        return iter(self.refs)
+
+    def __len__(self):
+        return len(self.refs)
+
+    def __contains__(self, key):
+        return key in self.refs
+
+    # Store `text` for `key`; returns its new reference, or None if the note is unchanged
+    def save(self, key, text):
+        ref = self.blobs.put(text)
+        if self.refs.get(key, "") == ref:
+            self._bodies[key] = text
+            return None
+        self.refs[key] = ref
+        self._bodies[key] = text
+        return ref
+
+    # Take a stored value (e.g. changed by another tab); returns False if it was already current
+    def set_ref(self, key, value):
+        if self.refs.get(key, "") == value:
+            return False
+        self.refs[key] = value
+        self._bodies.pop(key, None)
+        return True
+
+    # Hashable identity of the current contents, without reading any body
+    def version_key(self):
+        return tuple((key, value["blob"] if is_ref(value) else value) for key, value in self.refs.items())
+
+    # Number of bodies read so far
+    def loaded(self):
+        return len(self._bodies)
@@ -0,0 +1,219 @@
+# Study plans defined in files: plans/*.toml or plans/*.json, each with its subjects
+# (label, session minutes, cell color, optional target hours), rotation and calendar.
+#
+#     name = "default"               # identifies the plan in persisted state
+#     title = "API | Statistics | LLM"
+#     start = 2025-06-09
+#     days = 45
+#     rest_weekdays = ["Saturday"]   # names or numbers (Monday = 0)
+#     rotation = [["API", "Statistics"], ["Statistics", "LLM"]]
+#
+#     [subjects.API]
+#     label = "🔧 API"
+#     minutes = 45
+#     color = "#0000ff"
+#     target_hours = 19.0            # optional, for TIMETABLE_PLAN=solved
+#
+# plans/default.toml is the built-in plan: every tool resolves the plan it uses with
+# plan_file(), so the app, the API and the command-line tools agree on it.
+#
+# A definition is compiled once into the session table, schedule frame and cell
+# styles; PlanCache keeps the compiled plans in a bounded LRU and re-reads a file
+# only when its mtime or size changes.
+import json
+import os
+import threading
+import tomllib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+
+from timetable.schedule import WEEKDAY_NAMES, PlanSpec, generate_schedule, generate_sessions
+from timetable.styles import legend_html, style_matrix, subject_style
+
+# Plan files shipped with the app (TIMETABLE_PLANS points elsewhere)
+PLANS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "plans")
+
+PLAN_EXTENSIONS = (".toml", ".json")
+
+# Plan used unless another is picked: plans/default.*, whose `name` is "default"
+DEFAULT_PLAN_STEM = "default"
+
+# Compiled plans (and parsed files) kept per process
+CACHE_SIZE = 8
+
+# Color of subjects a definition gives none
+DEFAULT_COLOR = "#7f8c8d"
+
+
+# A plan as defined in a file: the schedule spec plus how its subjects are shown.
+# `colors`, `css_classes` and `targets` are (subject, value) pairs; `targets` may be empty.
+@dataclass(frozen=True)
+class PlanDefinition:
+    spec: PlanSpec
+    title: str
+    colors: tuple
+    css_classes: tuple
+    targets: tuple = ()
+
+
+def _weekday(value):
+    return WEEKDAY_NAMES.index(value.capitalize()) if isinstance(value, str) else int(value)
+
+
+# Definition from parsed file contents; `default_name` is used when the file names no plan
+def parse_definition(data, default_name="default"):
+    subjects = data["subjects"]
+    if not subjects:
+        raise ValueError("a plan needs at least one subject")
+    rotation = [tuple(pair) for pair in data["rotation"]]
+    for pair in rotation:
+        if len(pair) != 2:
+            raise ValueError(f"rotation entries are (morning, evening) pairs, not {list(pair)!r}")
+        for name in pair:
+            if name not in subjects:
+                raise ValueError(f"rotation uses unknown subject {name!r}")
+    start = data["start"]
+    spec = PlanSpec.from_subjects(
+        start=start if isinstance(start, date) else date.fromisoformat(start),
+        days=int(data["days"]),
+        rotation=rotation,
+        subjects={name: {"label": info.get("label", name), "minutes": int(info["minutes"])}
+                  for name, info in subjects.items()},
+        rest_weekdays=tuple(_weekday(day) for day in data.get("rest_weekdays", [5])),
+        week_length=int(data.get("week_length", 7)),
+        name=data.get("name", default_name),
+    )
+    return PlanDefinition(
+        spec=spec,
+        title=data.get("title", " | ".join(subjects)),
+        colors=tuple((name, info.get("color", DEFAULT_COLOR)) for name, info in subjects.items()),
+        css_classes=tuple((name, info.get("css_class", name.lower())) for name, info in subjects.items()),
+        targets=tuple((name, float(info["target_hours"])) for name, info in subjects.items() if "target_hours" in info),
+    )
+
+
+# Definition in a .toml or .json file; raises ValueError for malformed files
+def load_definition(path):
+    stem, extension = os.path.splitext(os.path.basename(path))
+    if extension not in PLAN_EXTENSIONS:
+        raise ValueError(f"{path}: plan files are {' or '.join(PLAN_EXTENSIONS)}")
+    with open(path, "rb") as f:
+        try:
+            data = tomllib.load(f) if extension == ".toml" else json.load(f)
+            return parse_definition(data, stem)
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"{path}: missing or malformed {exc}") from exc
+        except ValueError as exc:
+            raise ValueError(f"{path}: {exc}") from exc
+
+
+# Directory of plan files: TIMETABLE_PLANS, else plans/
+def plans_dir(environ=None):
+    environ = os.environ if environ is None else environ
+    return environ.get("TIMETABLE_PLANS", PLANS_DIR)
+
+
+# Plan files of a directory as {file stem: path}, sorted by stem
+def plan_files(directory=PLANS_DIR):
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return {}
+    return {os.path.splitext(name)[0]: os.path.join(directory, name)
+            for name in names if os.path.splitext(name)[1] in PLAN_EXTENSIONS}
+
+
+# A definition compiled for one spec (its own, or a variant such as a re-planned layout):
+# the shared session table, schedule frame, cell styles and legend
+class CompiledPlan:
+    def __init__(self, definition, spec=None):
+        spec = spec or definition.spec
+        names = [subject[0] for subject in spec.subjects]
+        colors = dict(definition.colors)
+        css_classes = dict(definition.css_classes)
+        self.definition = definition
+        self.spec = spec
+        self.sessions = generate_sessions(spec)
+        self.schedule = generate_schedule(spec, self.sessions)
+        self.colors = [colors.get(name, DEFAULT_COLOR) for name in names]
+        self.styles = style_matrix(self.schedule, names, {
+            name: subject_style(color, css_classes.get(name, name.lower())) for name, color in zip(names, self.colors)
+        })
+        self.legend = legend_html(zip(names, self.colors))
+
+
+# Compiled plans shared by every session of a process. Files are stat'ed on each
+# lookup and re-parsed only when their (mtime, size) changed, which also drops
+# the plans compiled from the old definition; at most `maxsize` compiled plans
+# and parsed files are kept, least recently used first out.
+class PlanCache:
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._files = OrderedDict()     # path -> ((mtime_ns, size), definition)
+        self._compiled = OrderedDict()  # (definition, spec) -> CompiledPlan
+        self._lock = threading.Lock()
+
+    def definition(self, path):
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._files.move_to_end(path)
+                return entry[1]
+        definition = load_definition(path)
+        with self._lock:
+            if entry is not None and entry[1] != definition:
+                for key in [key for key in self._compiled if key[0] == entry[1]]:
+                    del self._compiled[key]
+            self._files[path] = (stamp, definition)
+            self._files.move_to_end(path)
+            while len(self._files) > self.maxsize:
+                self._files.popitem(last=False)
+        return definition
+
+    # Compiled plan of `definition` for `spec` (default: the definition's own spec)
+    def compiled(self, definition, spec=None):
+        key = (definition, spec or definition.spec)
+        with self._lock:
+            plan = self._compiled.get(key)
+            if plan is not None:
+                self._compiled.move_to_end(key)
+                return plan
+        # Compiled outside the lock; a concurrent miss for the same key just builds it twice
+        plan = CompiledPlan(definition, key[1])
+        with self._lock:
+            plan = self._compiled.setdefault(key, plan)
+            self._compiled.move_to_end(key)
+            while len(self._compiled) > self.maxsize:
+                self._compiled.popitem(last=False)
+        return plan
+
+    def get(self, path, spec=None):
+        return self.compiled(self.definition(path), spec)
+
+    def __len__(self):
+        return len(self._compiled)
+
+
+# Compiled plans shared by everything in this process
+PLAN_CACHE = PlanCache()
+
+
+# Plan file used unless another is picked: TIMETABLE_PLAN_FILE, else the default plan
+# of the plans directory (or its first file); raises FileNotFoundError if there is none
+def plan_file(environ=None):
+    environ = os.environ if environ is None else environ
+    if environ.get("TIMETABLE_PLAN_FILE"):
+        return environ["TIMETABLE_PLAN_FILE"]
+    directory = plans_dir(environ)
+    files = plan_files(directory)
+    if not files:
+        raise FileNotFoundError(f"no plan files (*.toml, *.json) in {directory}")
+    return files.get(DEFAULT_PLAN_STEM, next(iter(files.values())))
+
+
+# Definition of the plan file used unless another is picked (re-read when it changes)
+def default_definition(environ=None):
+    return PLAN_CACHE.definition(plan_file(environ))
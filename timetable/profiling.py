@@ -0,0 +1,95 @@
+import functools
+import json
+import random
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# Shared no-op context returned when profiling is off or the run is not sampled
+NULL_PHASE = nullcontext()
+
+_log_lock = threading.Lock()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+# Per-phase wall-clock timings of app reruns.
+# `begin()` starts a run (a full script run or a widget interaction) and decides
+# whether it is sampled; `phase(name)` times a block of it. Events are kept in a
+# bounded history for the debug panel and optionally appended to a JSON-lines file.
+class Profiler:
+    def __init__(self, enabled=False, sample_rate=1.0, log_path=None, history=500):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.log_path = log_path
+        self.events = deque(maxlen=history)
+        self.active = False
+        self._run = 0
+        self._kind = None
+
+    def begin(self, kind):
+        if not self.enabled:
+            self.active = False
+            return
+        self._run += 1
+        self._kind = kind
+        self.active = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def phase(self, name):
+        if not self.active:
+            return NULL_PHASE
+        return _Phase(self, name)
+
+    # Decorator timing every call of the function as phase `name`
+    def timed(self, name):
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.phase(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    # Time from `started` (a perf_counter value) to now, recorded as a milestone of the run
+    def mark(self, name, started):
+        if self.active:
+            self.record(name, time.perf_counter() - started, mark=True)
+
+    def record(self, name, seconds, mark=False):
+        event = {"ts": time.time(), "run": self._run, "kind": self._kind, "phase": name, "ms": seconds * 1000}
+        if mark:
+            event["mark"] = True
+        self.events.append(event)
+        if self.log_path:
+            with _log_lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event) + "\n")
+
+    # Recent runs, newest first, as {"run", "kind", "phases": {name: ms}, "marks": {name: ms}, "total_ms"};
+    # marks are milestones and do not count towards the total
+    def runs(self, limit=20):
+        runs = {}
+        for event in self.events:
+            run = runs.setdefault(event["run"], {"run": event["run"], "kind": event["kind"], "phases": {}, "marks": {}})
+            if event.get("mark"):
+                run["marks"][event["phase"]] = event["ms"]
+                continue
+            run["phases"][event["phase"]] = run["phases"].get(event["phase"], 0.0) + event["ms"]
+        ordered = sorted(runs.values(), key=lambda run: run["run"], reverse=True)[:limit]
+        for run in ordered:
+            run["total_ms"] = sum(run["phases"].values())
+        return ordered
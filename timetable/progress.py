@@ -0,0 +1,85 @@
+import numpy as np
+
+from timetable.kernels import completion_matrix, progress_counts
+
+SLOTS = ("morning", "evening")
+
+
+# Per-subject and overall session totals, completions and percentages.
+# `codes` is an (n_rows, 2) array of subject codes with -1 for empty slots.
+def compute_progress(codes, done, n_subjects):
+    codes = np.asarray(codes)
+    totals, completed, _minutes, _completed_minutes = progress_counts(codes, np.zeros(codes.shape, dtype=np.int64), done, n_subjects)
+    percent = np.divide(completed * 100.0, totals, out=np.zeros(n_subjects), where=totals > 0)
+    total = int(totals.sum())
+    completed_total = int(completed.sum())
+    return {
+        "totals": totals,
+        "completed": completed,
+        "percent": percent,
+        "total": total,
+        "completed_total": completed_total,
+        "overall": completed_total * 100.0 / total if total else 0.0,
+    }
+
+
+# Scheduled and completed session counts per week (index 0 is week 1)
+def week_progress(week_numbers, codes, done):
+    week_numbers = np.asarray(week_numbers)
+    scheduled = np.asarray(codes) >= 0
+    n_weeks = int(week_numbers.max()) if len(week_numbers) else 0
+    weeks = np.repeat(week_numbers - 1, scheduled.shape[1])
+    totals = np.bincount(weeks, weights=scheduled.ravel(), minlength=n_weeks).astype(np.int64)
+    completed = np.bincount(weeks, weights=(scheduled & done).ravel(), minlength=n_weeks).astype(np.int64)
+    return totals, completed
+
+
+# Running per-subject session and minute counts, updated by delta on every toggle.
+# `codes` and `minutes` are (n_rows, 2) arrays indexed like the schedule rows;
+# the completion matrix `done` is kept here so every change is applied exactly once.
+class ProgressCounter:
+    def __init__(self, codes, minutes, subjects, done=None):
+        self.codes = np.asarray(codes)
+        self.minutes = np.asarray(minutes)
+        self.subjects = list(subjects)
+        scheduled = self.codes >= 0
+        self.done = np.zeros(self.codes.shape, dtype=bool) if done is None else np.asarray(done, dtype=bool) & scheduled
+        self.totals, self.completed, self.total_minutes, self.completed_minutes = progress_counts(
+            self.codes, self.minutes, self.done, len(self.subjects)
+        )
+
+    # Full rebuild from the `{slot}_{row}` checkbox dict
+    @classmethod
+    def from_states(cls, codes, minutes, subjects, checkbox_states):
+        return cls(codes, minutes, subjects, completion_matrix(checkbox_states, len(codes)))
+
+    # Apply one checkbox change; returns False if it did not change the counts
+    def set(self, key, checked):
+        slot, _, row = key.partition("_")
+        if slot not in SLOTS or not row.isdigit() or int(row) >= len(self.codes):
+            return False
+        row, slot = int(row), SLOTS.index(slot)
+        code = self.codes[row, slot]
+        if code < 0 or self.done[row, slot] == bool(checked):
+            return False
+        step = 1 if checked else -1
+        self.done[row, slot] = bool(checked)
+        self.completed[code] += step
+        self.completed_minutes[code] += step * int(self.minutes[row, slot])
+        return True
+
+    # Same shape as compute_progress(), plus minute totals
+    def summary(self):
+        n_subjects = len(self.subjects)
+        total = int(self.totals.sum())
+        completed_total = int(self.completed.sum())
+        return {
+            "totals": self.totals,
+            "completed": self.completed,
+            "percent": np.divide(self.completed * 100.0, self.totals, out=np.zeros(n_subjects), where=self.totals > 0),
+            "total": total,
+            "completed_total": completed_total,
+            "overall": completed_total * 100.0 / total if total else 0.0,
+            "total_minutes": self.total_minutes,
+            "completed_minutes": self.completed_minutes,
+        }
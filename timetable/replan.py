@@ -0,0 +1,130 @@
+import numpy as np
+
+from dataclasses import replace
+
+from timetable.schedule import _calendar, _day_rows, generate_sessions
+
+
+# Explicit (study days, 2) subject codes of a plan; -1 marks a free slot
+def assignment(spec):
+    names = [s[0] for s in spec.subjects]
+    rotation = np.array(
+        [[-1 if name is None else names.index(name) for name in pair] for pair in spec.rotation], dtype=np.int64
+    )
+    return rotation[np.arange(spec.days) % len(rotation)]
+
+
+# (study days, 2) session numbers of a plan, 0 for free slots
+def session_ordinals(spec):
+    sessions = generate_sessions(spec)
+    ordinals = np.zeros((spec.days, 2), dtype=np.int64)
+    ordinals[sessions.day - 1, sessions.slot] = sessions.ordinal
+    return ordinals
+
+
+def _pairs(spec, codes):
+    names = [s[0] for s in spec.subjects]
+    return [tuple(None if code < 0 else names[code] for code in pair) for pair in codes.tolist()]
+
+
+# Schedule rows and dates of the plan's study days
+def _study_days(spec):
+    dates, is_rest = _calendar(spec)
+    study = np.flatnonzero(~is_rest)
+    return _day_rows(len(dates), spec.week_length)[study], dates.to_numpy().astype("datetime64[D]")[study]
+
+
+# Study sessions scheduled before `today` that are not completed
+def count_missed(spec, done, today):
+    codes = assignment(spec)
+    rows, dates = _study_days(spec)
+    past = dates < np.datetime64(today, "D")
+    pending = (codes[past] >= 0) & ~done[rows[past]]
+    return int(pending.sum())
+
+
+# Move missed and pending sessions onto the free slots from `today` on.
+#
+# `done` is the (n_rows, 2) completion matrix of the current schedule. Everything
+# before the first missed session is left untouched, and completed sessions keep
+# their slot (checkbox states are keyed by row). From the first missed study day
+# on, the unfinished sessions of each slot are re-queued in their original order
+# and packed into that slot's free positions starting today, extending the plan
+# when they no longer fit. Moved sessions keep their session number, so ids such
+# as "API-3" (and exports keyed by them) survive a re-plan. Returns the new spec
+# (with an explicit rotation and ordinals), the first changed study day and the
+# number of sessions re-queued.
+def replan(spec, done, today):
+    codes = assignment(spec)
+    ordinals = session_ordinals(spec)
+    rows, dates = _study_days(spec)
+    today = np.datetime64(today, "D")
+    done = np.asarray(done, dtype=bool)
+
+    scheduled = codes >= 0
+    completed = np.zeros_like(scheduled)
+    in_range = rows < len(done)
+    completed[in_range] = done[rows[in_range]] & scheduled[in_range]
+    missed = scheduled & ~completed & (dates < today)[:, None]
+    if not missed.any():
+        return spec, spec.days, 0
+
+    first = int(np.flatnonzero(missed.any(axis=1))[0])
+    if today > dates[-1]:
+        # Today is past the end of the plan: count study days up to today on an extended calendar
+        dates = _study_days(replace(spec, days=spec.days + int((today - dates[-1]) // np.timedelta64(1, "D"))))[1]
+    start = int(np.searchsorted(dates, today))
+    suffix = codes[first:].copy()
+    suffix_ordinals = ordinals[first:].copy()
+    kept = completed[first:]
+    queued = [~kept[:, slot] & (suffix[:, slot] >= 0) for slot in range(suffix.shape[1])]
+    pending = [suffix[queued[slot], slot] for slot in range(suffix.shape[1])]
+    pending_ordinals = [suffix_ordinals[queued[slot], slot] for slot in range(suffix.shape[1])]
+    suffix[~kept] = -1
+    suffix_ordinals[~kept] = 0
+
+    # Room needed from today on, per slot; extend the plan with free days if short
+    offset = start - first
+    free = [np.flatnonzero(suffix[offset:, slot] < 0) + offset for slot in range(suffix.shape[1])]
+    shortfall = max(len(queue) - len(slots) for queue, slots in zip(pending, free))
+    shortfall += max(offset - len(suffix), 0)
+    if shortfall > 0:
+        suffix = np.vstack([suffix, np.full((shortfall, suffix.shape[1]), -1, dtype=suffix.dtype)])
+        suffix_ordinals = np.vstack([suffix_ordinals, np.zeros((shortfall, suffix.shape[1]), dtype=np.int64)])
+        free = [np.flatnonzero(suffix[offset:, slot] < 0) + offset for slot in range(suffix.shape[1])]
+    for slot, queue in enumerate(pending):
+        suffix[free[slot][:len(queue)], slot] = queue
+        suffix_ordinals[free[slot][:len(queue)], slot] = pending_ordinals[slot]
+
+    # Drop trailing free days beyond the original end
+    used = np.flatnonzero((suffix >= 0).any(axis=1))
+    length = max(len(codes) - first, int(used[-1]) + 1 if len(used) else 0)
+    suffix = suffix[:length]
+    suffix_ordinals = suffix_ordinals[:length]
+
+    rotation = _pairs(spec, np.vstack([codes[:first], suffix]))
+    numbers = np.vstack([ordinals[:first], suffix_ordinals])
+    moved = int(sum(len(queue) for queue in pending))
+    return replace(
+        spec, days=len(rotation), rotation=tuple(rotation), ordinals=tuple(map(tuple, numbers.tolist()))
+    ), first, moved
+
+
+# Persistable description of how `spec` differs from `base` from study day `first` on
+def layout(spec, first):
+    stored = {"from_day": first, "rotation": [list(pair) for pair in spec.rotation[first:]]}
+    if spec.ordinals:
+        stored["ordinals"] = [list(pair) for pair in spec.ordinals[first:]]
+    return stored
+
+
+# Rebuild a re-planned spec from its base plan and a stored layout. Layouts saved
+# before session numbers were stored renumber their sessions chronologically.
+def apply_layout(base, stored):
+    first = stored["from_day"]
+    prefix = replace(base, days=first)
+    rotation = _pairs(base, assignment(prefix)) + [tuple(pair) for pair in stored["rotation"]]
+    ordinals = ()
+    if "ordinals" in stored:
+        ordinals = tuple(map(tuple, session_ordinals(prefix).tolist())) + tuple(map(tuple, stored["ordinals"]))
+    return replace(base, days=len(rotation), rotation=tuple(rotation), ordinals=ordinals)
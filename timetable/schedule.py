@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from timetable.kernels import day_dates, session_labels, session_layout
+from timetable.sessions import SessionTable
+
+# Columns of the schedule table, in display order
+COLUMNS = ["Week", "Day", "Date", "Morning Session", "Evening Session",
+           "Morning Completed", "Evening Completed", "Notes"]
+
+# Per-learner columns, filled in at render time by styles.overlay_state()
+STATE_COLUMNS = ["Morning Completed", "Evening Completed", "Notes"]
+
+# Integer subject codes per slot (-1 for header and rest rows), kept next to the display columns
+CODE_COLUMNS = ["Morning Code", "Evening Code"]
+
+# Week number (1-based) and calendar date of every row; header rows carry their week's first day
+CALENDAR_COLUMNS = ["Week Number", "Calendar Date"]
+
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+# Declarative description of a study plan.
+# `rotation` is a cycle of (morning, evening) subject pairs, advanced once per
+# study day; `rest_weekdays` are weekday numbers (Monday=0) with no sessions;
+# a "WEEK n" header row is emitted every `week_length` calendar days;
+# `name` identifies the plan in persisted state. `ordinals` optionally pins the
+# session number of every (morning, evening) rotation entry, so sessions moved by
+# a re-plan keep their id; without it sessions are numbered chronologically.
+@dataclass(frozen=True)
+class PlanSpec:
+    start: date
+    days: int
+    rotation: tuple
+    subjects: tuple
+    rest_weekdays: tuple = (5,)
+    week_length: int = 7
+    name: str = "default"
+    ordinals: tuple = ()
+
+    @classmethod
+    def from_subjects(cls, start, days, rotation, subjects, **kwargs):
+        return cls(
+            start=start,
+            days=days,
+            rotation=tuple(tuple(pair) for pair in rotation),
+            subjects=tuple((name, info["label"], info["minutes"]) for name, info in subjects.items()),
+            **kwargs,
+        )
+
+
+# Calendar layout of a plan: one entry per calendar day up to the last study day
+def _calendar(spec):
+    if spec.days <= 0:
+        return pd.DatetimeIndex([]), np.zeros(0, dtype=bool)
+    study_per_week = 7 - len(set(spec.rest_weekdays))
+    if study_per_week <= 0:
+        raise ValueError("rest_weekdays leaves no study days")
+    span = -(-spec.days * 7 // study_per_week) + 7
+    dates = pd.date_range(spec.start, periods=span, freq="D")
+    is_rest = np.isin(dates.weekday, spec.rest_weekdays)
+    study_number = np.cumsum(~is_rest)
+    last = int(np.searchsorted(study_number, spec.days)) + 1
+    return dates[:last], is_rest[:last]
+
+
+# Schedule row of every calendar day: each week is preceded by its header row
+def _day_rows(n, week_length):
+    days = np.arange(n)
+    return days + days // week_length + 1
+
+
+# Typed, array-backed sessions of a plan in chronological order
+def generate_sessions(spec):
+    dates, is_rest = _calendar(spec)
+    names = [s[0] for s in spec.subjects]
+    minutes = np.array([s[2] for s in spec.subjects], dtype=np.int16)
+    # A None entry in the rotation leaves that slot free
+    rotation = np.array(
+        [[-1 if name is None else names.index(name) for name in pair] for pair in spec.rotation], dtype=np.int64
+    )
+    subject, ordinal, slot, day_of, day, row = session_layout(is_rest, rotation, len(names), spec.week_length)
+    if spec.ordinals:
+        ordinals = np.array(spec.ordinals, dtype=np.int32).reshape(-1, 2)
+        ordinal = ordinals[(day - 1) % len(ordinals), slot]
+    return SessionTable(
+        spec,
+        subject=subject,
+        ordinal=ordinal,
+        minutes=minutes[subject],
+        slot=slot,
+        date=dates.to_numpy().astype("datetime64[D]")[day_of],
+        day=day,
+        row=row,
+    )
+
+
+# Build the schedule rows (week headers, study days and rest days) for a plan.
+# Session strings are rendered here once per plan from the typed session table.
+# The frame holds only plan data, so one copy can be shared by every learner:
+# the per-learner STATE_COLUMNS are left out, and the repetitive text columns
+# (week headers, day and date labels) are categorical.
+def generate_schedule(spec, sessions=None):
+    if sessions is None:
+        sessions = generate_sessions(spec)
+    dates, is_rest = _calendar(spec)
+    n = len(dates)
+    n_weeks = -(-n // spec.week_length)
+    n_rows = n + n_weeks
+    day_rows = _day_rows(n, spec.week_length)
+    header_rows = np.arange(n_weeks) * (spec.week_length + 1)
+
+    codes = np.full((n_rows, 2), -1, dtype=np.int8)
+    codes[sessions.row, sessions.slot] = sessions.subject
+    text = np.full((n_rows, 2), "", dtype=object)
+    text[sessions.row, sessions.slot] = session_labels(
+        sessions.subject, sessions.ordinal, sessions.minutes, [subject[1] for subject in spec.subjects]
+    )
+
+    weekday = pd.Index(WEEKDAY_NAMES)[dates.weekday].to_numpy(dtype=object)
+    study_number = np.cumsum(~is_rest)
+    day_text = np.where(
+        is_rest,
+        weekday,
+        "Day " + study_number.astype(str).astype(object) + " (" + weekday + ")",
+    )
+
+    week_text = np.full(n_rows, "", dtype=object)
+    week_text[header_rows] = ["WEEK %d" % (i + 1) for i in range(n_weeks)]
+    day_column = np.full(n_rows, "", dtype=object)
+    day_column[day_rows] = day_text
+    date_column = np.full(n_rows, "", dtype=object)
+    date_column[day_rows] = day_dates(dates.to_numpy())
+    text[day_rows[is_rest], 0] = "REST DAY"
+
+    week_number = np.repeat(np.arange(1, n_weeks + 1, dtype=np.int32), spec.week_length + 1)[:n_rows]
+    calendar = np.empty(n_rows, dtype="datetime64[s]")
+    calendar[day_rows] = dates.to_numpy()
+    calendar[header_rows] = dates.to_numpy()[header_rows - np.arange(n_weeks)]
+
+    return pd.DataFrame({
+        "Week": pd.Categorical(week_text),
+        "Day": pd.Categorical(day_column),
+        "Date": pd.Categorical(date_column),
+        "Morning Session": text[:, 0],
+        "Evening Session": text[:, 1],
+        "Morning Code": codes[:, 0],
+        "Evening Code": codes[:, 1],
+        "Week Number": week_number,
+        "Calendar Date": calendar,
+    }, columns=[column for column in COLUMNS if column not in STATE_COLUMNS] + CODE_COLUMNS + CALENDAR_COLUMNS)
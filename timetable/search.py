@@ -0,0 +1,108 @@
+import bisect
+import math
+import re
+from collections import Counter
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Words too common in notes to be worth indexing
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it my of on or so that the this to was were "
+    "with".split()
+)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+# Inverted index over notes, keyed like the notes dict (e.g. "notes_12").
+# `update()` re-indexes a single note in time proportional to its length;
+# `search()` ranks notes with BM25, treating the last query word as a prefix
+# so results follow the query as it is typed.
+class NoteIndex:
+    def __init__(self, notes=None):
+        self.postings = {}
+        self.lengths = {}
+        # Indexed terms per note, so a note can be removed without re-tokenizing its old text
+        self._terms = {}
+        self.total_length = 0
+        self._vocabulary = None
+        for key, text in (notes or {}).items():
+            self.update(key, text)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def remove(self, key):
+        length = self.lengths.pop(key, None)
+        if length is None:
+            return
+        self.total_length -= length
+        for token in self._terms.pop(key):
+            docs = self.postings[token]
+            del docs[key]
+            if not docs:
+                del self.postings[token]
+                self._vocabulary = None
+
+    def update(self, key, text):
+        if key in self.lengths:
+            self.remove(key)
+        tokens = tokenize(text or "")
+        if not tokens:
+            return
+        counts = Counter(tokens)
+        for token, count in counts.items():
+            docs = self.postings.get(token)
+            if docs is None:
+                docs = self.postings[token] = {}
+                self._vocabulary = None
+            docs[key] = count
+        self._terms[key] = tuple(counts)
+        self.lengths[key] = len(tokens)
+        self.total_length += len(tokens)
+
+    # Indexed words starting with `prefix`, via a sorted vocabulary rebuilt only when words are added or dropped
+    def expand(self, prefix):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        stop = bisect.bisect_left(self._vocabulary, prefix + "\U0010ffff")
+        return self._vocabulary[start:stop]
+
+    # Best matching note keys as (key, score), highest score first
+    def search(self, query, limit=20):
+        words = tokenize(query)
+        if not words or not self.lengths:
+            return []
+        terms = [[word] for word in words[:-1] if word in self.postings]
+        last = self.expand(words[-1]) if not query[-1:].isspace() else [words[-1]]
+        terms.append([word for word in last if word in self.postings])
+
+        n_docs = len(self.lengths)
+        average = self.total_length / n_docs
+        scores = Counter()
+        for group in terms:
+            for term in group:
+                docs = self.postings[term]
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for key, tf in docs.items():
+                    norm = K1 * (1 - B + B * self.lengths[key] / average)
+                    scores[key] += idf * tf * (K1 + 1) / (tf + norm)
+        return scores.most_common(limit)
+
+
+# Short excerpt of `text` around the first occurrence of a query word
+def snippet(text, query, width=60):
+    words = tokenize(query)
+    lowered = text.lower()
+    positions = [lowered.find(word) for word in words]
+    positions = [position for position in positions if position >= 0]
+    start = max(min(positions, default=0) - width // 3, 0)
+    excerpt = " ".join(text[start:start + width].split())
+    return ("…" if start else "") + excerpt + ("…" if start + width < len(text) else "")
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from enum import IntEnum
+
+import numpy as np
+
+
+class Slot(IntEnum):
+    MORNING = 0
+    EVENING = 1
+
+
+# Checkbox state key prefix per slot, e.g. "morning_12"
+SLOT_KEYS = ("morning", "evening")
+
+
+# A single study session, materialized on demand from a SessionTable
+@dataclass(frozen=True, slots=True)
+class Session:
+    id: str
+    subject: IntEnum
+    ordinal: int
+    minutes: int
+    slot: Slot
+    date: np.datetime64
+    day: int
+    row: int
+
+    @property
+    def state_key(self):
+        return f"{SLOT_KEYS[self.slot]}_{self.row}"
+
+
+# Subject enum for a plan, e.g. Subject.API == 0; values index `spec.subjects`
+def subject_enum(spec):
+    return IntEnum("Subject", [(name, code) for code, (name, _label, _minutes) in enumerate(spec.subjects)])
+
+
+# Column-oriented table of sessions in chronological order (by row, morning first).
+# Each field is a numpy array; strings are only produced by `label()` and `session_id()`.
+class SessionTable:
+    __slots__ = ("spec", "subject", "ordinal", "minutes", "slot", "date", "day", "row", "_subjects")
+
+    def __init__(self, spec, subject, ordinal, minutes, slot, date, day, row):
+        self.spec = spec
+        self.subject = np.asarray(subject, dtype=np.int8)
+        self.ordinal = np.asarray(ordinal, dtype=np.int32)
+        self.minutes = np.asarray(minutes, dtype=np.int16)
+        self.slot = np.asarray(slot, dtype=np.int8)
+        self.date = np.asarray(date, dtype="datetime64[D]")
+        self.day = np.asarray(day, dtype=np.int32)
+        self.row = np.asarray(row, dtype=np.int32)
+        self._subjects = subject_enum(spec)
+
+    def __len__(self):
+        return len(self.subject)
+
+    def __getitem__(self, i):
+        return Session(
+            id=self.session_id(i),
+            subject=self._subjects(int(self.subject[i])),
+            ordinal=int(self.ordinal[i]),
+            minutes=int(self.minutes[i]),
+            slot=Slot(int(self.slot[i])),
+            date=self.date[i],
+            day=int(self.day[i]),
+            row=int(self.row[i]),
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def subjects(self):
+        return self._subjects
+
+    # Sub-table of the sessions selected by a boolean mask or index array
+    def take(self, selection):
+        return SessionTable(
+            self.spec, self.subject[selection], self.ordinal[selection], self.minutes[selection],
+            self.slot[selection], self.date[selection], self.day[selection], self.row[selection],
+        )
+
+    # Sessions matching every given field, e.g. where(subject="API", slot=Slot.EVENING)
+    def where(self, subject=None, slot=None, date=None, day=None, row=None):
+        mask = np.ones(len(self), dtype=bool)
+        if subject is not None:
+            code = self._subjects[subject] if isinstance(subject, str) else subject
+            mask &= self.subject == int(code)
+        if slot is not None:
+            mask &= self.slot == int(slot)
+        if date is not None:
+            mask &= self.date == np.datetime64(date, "D")
+        if day is not None:
+            mask &= self.day == day
+        if row is not None:
+            mask &= self.row == row
+        return self.take(mask)
+
+    # Index range of the sessions on a schedule row (rows are sorted)
+    def row_slice(self, row):
+        return slice(*np.searchsorted(self.row, [row, row + 1]))
+
+    # Stable identifier independent of table layout, e.g. "API-3"
+    def session_id(self, i):
+        return f"{self.spec.subjects[self.subject[i]][0]}-{self.ordinal[i]}"
+
+    # Display string, e.g. "🔧 API: Session 3 (45 min)"
+    def label(self, i):
+        return f"{self.spec.subjects[self.subject[i]][1]}: Session {self.ordinal[i]} ({self.minutes[i]} min)"
+
+    # (n_rows, 2) array of `values` laid out by schedule row and slot
+    def to_matrix(self, values, n_rows, fill=0):
+        values = np.asarray(values)
+        matrix = np.full((n_rows, len(Slot)), fill, dtype=values.dtype)
+        matrix[self.row, self.slot] = values
+        return matrix
+
+    # Checkbox state key, e.g. "morning_12"
+    def state_key(self, i):
+        return f"{SLOT_KEYS[self.slot[i]]}_{self.row[i]}"
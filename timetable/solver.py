@@ -0,0 +1,144 @@
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from timetable.plans import default_definition
+from timetable.schedule import PlanSpec
+
+# Longest session (minutes) that fits the morning and the evening slot
+SLOT_MINUTES = (60, 90)
+
+# Sessions per subject that best approximate the targets within the available slots.
+# If the targets need more sessions than there are slots, every subject is scaled
+# down proportionally and the leftover slots go to the largest remainders.
+def session_counts(target_minutes, lengths, fits, n_days):
+    # At most one session per subject per day, and none for subjects that fit no slot
+    wanted = np.rint(target_minutes / lengths).astype(np.int64)
+    wanted = np.where(fits.any(axis=1), np.minimum(wanted, n_days), 0)
+    capacity = n_days * fits.shape[1]
+    if wanted.sum() <= capacity:
+        return wanted
+    exact = wanted * (capacity / wanted.sum())
+    counts = np.floor(exact).astype(np.int64)
+    leftover = int(capacity - counts.sum())
+    counts[np.argsort(counts - exact)[:leftover]] += 1
+    return counts
+
+
+# Assign subjects to the morning/evening slots of every study day.
+#
+# `subjects` maps a name to {"minutes": session length, "target_hours": target,
+# optional "label"}. A subject only goes into slots at least as long as its
+# sessions (`slot_minutes`), never twice on the same day, and preferably at
+# least `min_gap` days after its previous session. Slots are filled in order,
+# each going to the feasible subject that is furthest behind its ideal even
+# pace; slots stay free while no subject is due, so every subject is spread
+# evenly across the plan.
+#
+# Returns the solved PlanSpec (its rotation lists every study day) and a report
+# of planned versus target hours per subject.
+def solve_plan(start, days, subjects, rest_weekdays=(5,), slot_minutes=SLOT_MINUTES, min_gap=1,
+               week_length=7, name="solved"):
+    names = list(subjects)
+    lengths = np.array([subjects[n]["minutes"] for n in names], dtype=np.int64)
+    target_minutes = np.array([subjects[n]["target_hours"] * 60.0 for n in names])
+    slot_minutes = np.asarray(slot_minutes)
+    fits = lengths[:, None] <= slot_minutes[None, :]
+
+    counts = session_counts(target_minutes, lengths, fits, days)
+    remaining = counts.copy()
+    placed = np.zeros(len(names), dtype=np.int64)
+    last_day = np.full(len(names), -min_gap - 1, dtype=np.int64)
+    # Ideal spacing between sessions of each subject, in study days
+    pace = np.divide(float(days), counts, out=np.full(len(names), np.inf), where=counts > 0)
+
+    assignment = np.full((days, len(slot_minutes)), -1, dtype=np.int64)
+    for day in range(days):
+        today = np.zeros(len(names), dtype=bool)
+        for slot in range(len(slot_minutes)):
+            open_ = (remaining > 0) & fits[:, slot] & ~today
+            feasible = open_ & (day - last_day >= min_gap)
+            if not feasible.any():
+                # Spacing is a preference: fall back to any subject that fits
+                feasible = open_
+                if not feasible.any():
+                    continue
+            # Subjects with a session left for every remaining day cannot wait
+            urgent = feasible & (remaining >= days - day)
+            if urgent.any():
+                feasible = urgent
+            due = np.where(feasible, (placed + 0.5) * pace, np.inf)
+            code = int(np.argmin(due))
+            # Leave the slot free while nothing is due yet, unless every remaining slot is needed
+            slots_left = (days - day) * len(slot_minutes) - slot
+            if not urgent.any() and due[code] > day + 1 and remaining.sum() < slots_left:
+                continue
+            assignment[day, slot] = code
+            remaining[code] -= 1
+            placed[code] += 1
+            last_day[code] = day
+            today[code] = True
+
+    rotation = [tuple(None if code < 0 else names[code] for code in pair) for pair in assignment]
+    spec = PlanSpec.from_subjects(
+        start=start,
+        days=days,
+        rotation=rotation or [(None, None)],
+        subjects={n: {"label": subjects[n].get("label", n), "minutes": subjects[n]["minutes"]} for n in names},
+        rest_weekdays=tuple(rest_weekdays),
+        week_length=week_length,
+        name=name,
+    )
+    return spec, plan_report(names, lengths, target_minutes, placed)
+
+
+# Planned versus target hours per subject
+def plan_report(names, lengths, target_minutes, sessions):
+    planned = sessions * lengths
+    deviation = planned - target_minutes
+    return pd.DataFrame({
+        "Subject": names,
+        "Sessions": sessions,
+        "Target Hours": target_minutes / 60,
+        "Planned Hours": planned / 60,
+        "Deviation Hours": deviation / 60,
+        "Deviation %": np.divide(deviation * 100, target_minutes, out=np.zeros(len(names)), where=target_minutes > 0),
+    })
+
+
+# Command line: solve the subjects of the default plan file (TIMETABLE_PLAN_FILE or
+# plans/default.toml) against their target hours and print the report
+def main(argv=None):
+    definition = default_definition()
+    base = definition.spec
+    parser = argparse.ArgumentParser(description="Solve a study plan that meets per-subject hour targets")
+    parser.add_argument("--start", type=date.fromisoformat, default=base.start)
+    parser.add_argument("--days", type=int, default=base.days, help="study days to plan")
+    parser.add_argument("--min-gap", type=int, default=1)
+    parser.add_argument("--target", action="append", default=[], metavar="SUBJECT=HOURS",
+                        help="override a subject's hour target")
+    args = parser.parse_args(argv)
+
+    targets = dict(definition.targets)
+    for item in args.target:
+        subject, _, hours = item.partition("=")
+        targets[subject] = float(hours)
+    subjects = {
+        name: {"label": label, "minutes": minutes, "target_hours": targets[name]}
+        for name, label, minutes in base.subjects if name in targets
+    }
+
+    started = time.perf_counter()
+    spec, report = solve_plan(
+        args.start, args.days, subjects, base.rest_weekdays, min_gap=args.min_gap, week_length=base.week_length
+    )
+    elapsed = time.perf_counter() - started
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+    print(f"\n{spec.days} study days solved in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
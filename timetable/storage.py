@@ -0,0 +1,668 @@
+import atexit
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, so only one process may write a store
+    fcntl = None
+
+# Sections of the persisted state ("progress" only holds counters saved by earlier
+# versions; counters are rebuilt from the checkbox states on load)
+SECTIONS = ("checkbox_states", "notes", "progress", "plan", "events")
+
+
+def empty_state():
+    return {section: {} for section in SECTIONS}
+
+
+# Validate (section, key, value[, ts]) changes and stamp those without a time with `ts` (default: now)
+def stamped_changes(changes, ts=None):
+    ts = time.time() if ts is None else ts
+    stamped = []
+    for section, key, value, *stamp in changes:
+        if section not in SECTIONS:
+            raise ValueError(f"unknown section: {section!r}")
+        stamped.append((section, key, value, stamp[0] if stamp else ts))
+    return stamped
+
+
+# Write `data` as JSON to `path` atomically: temp file in the same directory, fsync, rename
+def atomic_write_json(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# State of a journaled JSON file without opening a store (nothing is written): the
+# snapshot with the journal replayed last-writer-wins. Returns (state, key timestamps,
+# journal records read, byte length of the complete journal records).
+def read_journaled(path):
+    state = empty_state()
+    stamps = empty_state()
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            snapshot = json.load(f)
+        for section in SECTIONS:
+            state[section].update(snapshot.get(section, {}))
+            stamps[section].update(snapshot.get("_ts", {}).get(section, {}))
+    records = 0
+    good = 0
+    if os.path.exists(path + ".journal"):
+        with open(path + ".journal", "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                good += len(line)
+                section, key = record.get("section"), record.get("key")
+                if section in SECTIONS and record.get("ts", 0) >= stamps[section].get(key, 0):
+                    state[section][key] = record["value"]
+                    stamps[section][key] = record.get("ts", 0)
+                records += 1
+    return state, stamps, records, good
+
+
+# Append-only store: a JSON snapshot plus a JSON-lines journal of changes.
+# Every change costs one appended line; once the journal holds `compact_every`
+# records it is folded into a fresh snapshot and truncated.
+#
+# Each key carries the timestamp of its last write and conflicting writes are
+# resolved last-writer-wins, so writers never revert each other's newer values.
+# Applied changes get increasing version numbers; `changes_since(version)` returns
+# what changed after a version from a bounded in-memory log, and records appended
+# by other processes are picked up by reading only the new tail of the journal.
+# Processes sharing the files serialize appends and compaction with an advisory
+# lock on `path`.lock (reads take it shared), so compaction never drops a record
+# another process appended after this one last caught up.
+class JournalStore:
+    def __init__(self, path, compact_every=500, log_size=10000):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.lock_path = path + ".lock"
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._state = None
+        self._stamps = None
+        self._pending = 0
+        self._offset = 0
+        self._snapshot = None
+        self._version = 0
+        # (version, section, key) of recent changes; older versions get the full state
+        self._log = deque(maxlen=log_size)
+        self._log_floor = 0
+
+    # Advisory lock shared with other processes using the same files: exclusive for
+    # writes (and the first read, which may truncate a torn record), shared otherwise
+    @contextmanager
+    def _file_lock(self, exclusive=True):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive or self._state is None else fcntl.LOCK_SH)
+            yield
+
+    # Snapshot + replayed journal tail
+    def load(self):
+        with self._lock, self._file_lock(exclusive=False):
+            self._sync()
+            return {section: dict(values) for section, values in self._state.items()}
+
+    def version(self):
+        with self._lock, self._file_lock(exclusive=False):
+            self._sync()
+            return self._version
+
+    # (current version, [(section, key, value)]) for the keys changed after `version`
+    def changes_since(self, version):
+        with self._lock, self._file_lock(exclusive=False):
+            self._sync()
+            if version >= self._version:
+                return self._version, []
+            if version < self._log_floor or (self._log and version < self._log[0][0] - 1):
+                keys = [(section, key) for section in SECTIONS for key in self._state[section]]
+            else:
+                keys = list(dict.fromkeys((section, key) for v, section, key in self._log if v > version))
+            return self._version, [(section, key, self._state[section][key]) for section, key in keys]
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    # Catch up with the files: re-read after another process compacted, else apply new journal records
+    def _sync(self):
+        if self._state is None or self._file_stamp() != self._snapshot:
+            self._reload()
+            return
+        try:
+            size = os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            size = 0
+        if size < self._offset:
+            self._reload()
+        elif size > self._offset:
+            with open(self.journal_path, "rb") as f:
+                f.seek(self._offset)
+                for line in f:
+                    # A line without its newline is still being written
+                    if not line.endswith(b"\n"):
+                        break
+                    self._offset += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._apply(record.get("section"), record.get("key"), record.get("value"), record.get("ts", 0))
+
+    def _reload(self):
+        first = self._state is None
+        self._state, self._stamps = self._read(truncate=first)
+        self._version += 1
+        self._log.clear()
+        self._log_floor = self._version
+
+    def _read(self, truncate=False):
+        self._snapshot = self._file_stamp()
+        state, stamps, self._pending, self._offset = read_journaled(self.path)
+        # Drop a torn final record left by a crash mid-append so new records start on a fresh line
+        if truncate and os.path.exists(self.journal_path) and self._offset != os.path.getsize(self.journal_path):
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(self._offset)
+        return state, stamps
+
+    # Apply one change unless the stored value was written later; returns whether it was applied
+    def _apply(self, section, key, value, ts):
+        if section not in SECTIONS or ts < self._stamps[section].get(key, 0):
+            return False
+        self._stamps[section][key] = ts
+        if key in self._state[section] and self._state[section][key] == value:
+            return False
+        self._state[section][key] = value
+        self._version += 1
+        self._log.append((self._version, section, key))
+        return True
+
+    # Record a single change
+    def set(self, section, key, value, ts=None):
+        self.set_many([(section, key, value)], ts)
+
+    # Record several (section, key, value[, ts]) changes under one lock; `ts` (default: now)
+    # stamps the changes that carry no time of their own
+    def set_many(self, changes, ts=None):
+        changes = stamped_changes(changes, ts)
+        with self._lock, self._file_lock():
+            self._sync()
+            records = [
+                json.dumps({"section": section, "key": key, "value": value, "ts": ts}, ensure_ascii=False)
+                for section, key, value, ts in changes
+                if self._apply(section, key, value, ts)
+            ]
+            if not records:
+                return
+            data = ("\n".join(records) + "\n").encode("utf-8")
+            with open(self.journal_path, "ab") as f:
+                f.write(data)
+                end = f.tell()
+            # Skip re-reading our own records unless another process appended in between
+            if end - len(data) == self._offset:
+                self._offset = end
+            self._pending += len(records)
+            if self._pending >= self.compact_every:
+                self._compact()
+
+    def compact(self):
+        with self._lock, self._file_lock():
+            self._sync()
+            self._compact()
+
+    # Fold the journal into the snapshot; callers hold the exclusive file lock and have synced
+    def _compact(self):
+        atomic_write_json(self.path, {**self._state, "_ts": self._stamps})
+        # Replaying a journal over a snapshot that already contains it is harmless,
+        # so a crash between these two steps loses nothing
+        with open(self.journal_path, "w"):
+            pass
+        self._pending = 0
+        self._offset = 0
+        self._snapshot = self._file_stamp()
+
+
+DEFAULT_USER = "default"
+DEFAULT_PLAN_NAME = "default"
+
+
+# JSON backend: one journaled file per user and plan. The default user and
+# plan keep using `path` itself, so existing timetable_data.json files load as before.
+# Versions count changes seen by this process's store, so compare them only with
+# versions from the same backend object.
+class JsonBackend:
+    def __init__(self, path, compact_every=500):
+        self.path = path
+        self.compact_every = compact_every
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, user, plan):
+        root, ext = os.path.splitext(self.path)
+        parts = [root]
+        if user != DEFAULT_USER:
+            parts.append(user)
+        if plan != DEFAULT_PLAN_NAME:
+            parts.append(plan)
+        return ".".join(parts) + ext
+
+    def store(self, user, plan):
+        with self._lock:
+            key = (user, plan)
+            if key not in self._stores:
+                self._stores[key] = JournalStore(self.path_for(user, plan), self.compact_every)
+            return self._stores[key]
+
+    def load(self, user, plan, keys=None):
+        state = self.store(user, plan).load()
+        if keys is not None:
+            keys = set(keys)
+            state = {section: {k: v for k, v in values.items() if k in keys} for section, values in state.items()}
+        return state
+
+    def set(self, user, plan, section, key, value, ts=None):
+        self.store(user, plan).set(section, key, value, ts)
+
+    # Several (section, key, value[, ts]) changes appended in one write
+    def set_many(self, user, plan, changes, ts=None):
+        self.store(user, plan).set_many(changes, ts)
+
+    def version(self, user, plan):
+        return self.store(user, plan).version()
+
+    # (current version, [(section, key, value)]) changed after `version`
+    def changes_since(self, user, plan, version):
+        return self.store(user, plan).changes_since(version)
+
+    # Stored values of `section` for every user and plan: each file named after `path`
+    # (root[.user][.plan].json, or only its journal before the first compaction), read
+    # without opening a store
+    def section_values(self, section):
+        root, ext = os.path.splitext(os.path.basename(self.path))
+        directory = os.path.dirname(os.path.abspath(self.path))
+        names = {name.removesuffix(".journal") for name in os.listdir(directory)}
+        values = []
+        for name in sorted(names):
+            if name == root + ext or (name.startswith(root + ".") and name.endswith(ext)):
+                state = read_journaled(os.path.join(directory, name))[0]
+                values.extend(state[section].values())
+        return values
+
+    def close(self):
+        with self._lock:
+            for store in self._stores.values():
+                store.compact()
+            self._stores.clear()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    user TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    section TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL DEFAULT (julianday('now')),
+    version INTEGER NOT NULL DEFAULT 0,
+    ts REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (user, plan, section, key)
+) WITHOUT ROWID
+"""
+
+# Columns added after the first release, for databases created before them
+_MIGRATIONS = {
+    "version": "ALTER TABLE state ADD COLUMN version INTEGER NOT NULL DEFAULT 0",
+    "ts": "ALTER TABLE state ADD COLUMN ts REAL NOT NULL DEFAULT 0",
+}
+
+_INDEX = "CREATE INDEX IF NOT EXISTS state_version ON state (user, plan, version)"
+
+# A write only wins over a row stamped later; a changed value takes the learner's next version
+_UPSERT = """
+INSERT INTO state (user, plan, section, key, value, ts, version)
+SELECT ?1, ?2, ?3, ?4, ?5, ?6, COALESCE(MAX(version), 0) + 1 FROM state WHERE user = ?1 AND plan = ?2
+ON CONFLICT (user, plan, section, key)
+DO UPDATE SET value = excluded.value, ts = excluded.ts, updated_at = julianday('now'),
+    version = CASE WHEN excluded.value != state.value THEN excluded.version ELSE state.version END
+WHERE excluded.ts >= state.ts
+"""
+
+
+# SQLite backend: one row per (user, plan, section, key) in a WAL-mode database.
+# Each change is a single-row upsert, so concurrent sessions never overwrite each
+# other's keys; rows carry the learner's version at their last change, so other
+# sessions can fetch just what changed. Each call borrows a connection from a pool
+# shared by all threads (Streamlit runs every rerun on a new thread, so per-thread
+# connections would pile up); at most `pool_size` idle connections are kept open.
+class SqliteBackend:
+    def __init__(self, path, timeout=30.0, pool_size=8):
+        self.path = path
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._idle = []
+        self._lock = threading.Lock()
+        with self._connection() as conn, conn:
+            conn.execute(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(state)")}
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+            conn.execute(_INDEX)
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return conn
+
+    # An idle connection (or a new one) for the duration of the block, then back to the pool
+    @contextmanager
+    def _connection(self):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    # Open connections kept for reuse
+    def idle(self):
+        with self._lock:
+            return len(self._idle)
+
+    # Rows for one user and plan, optionally restricted to `keys`
+    def load(self, user, plan, keys=None):
+        state = empty_state()
+        with self._connection() as conn:
+            if keys is None:
+                rows = conn.execute(
+                    "SELECT section, key, value FROM state WHERE user = ? AND plan = ?", (user, plan)
+                ).fetchall()
+            else:
+                keys = list(keys)
+                rows = []
+                # Stay under SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    rows.extend(conn.execute(
+                        "SELECT section, key, value FROM state WHERE user = ? AND plan = ? AND key IN (%s)"
+                        % ",".join("?" * len(chunk)),
+                        (user, plan, *chunk),
+                    ))
+        for section, key, value in rows:
+            if section in state:
+                state[section][key] = json.loads(value)
+        return state
+
+    def set(self, user, plan, section, key, value, ts=None):
+        self.set_many(user, plan, [(section, key, value)], ts)
+
+    # Several (section, key, value[, ts]) changes upserted in one transaction; `ts` (default: now)
+    # stamps the changes that carry no time of their own
+    def set_many(self, user, plan, changes, ts=None):
+        rows = [
+            (user, plan, section, key, json.dumps(value, ensure_ascii=False), ts)
+            for section, key, value, ts in stamped_changes(changes, ts)
+        ]
+        with self._connection() as conn, conn:
+            conn.executemany(_UPSERT, rows)
+
+    def version(self, user, plan):
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT COALESCE(MAX(version), 0) FROM state WHERE user = ? AND plan = ?", (user, plan)
+            ).fetchone()
+        return row[0]
+
+    # (current version, [(section, key, value)]) changed after `version`
+    def changes_since(self, user, plan, version):
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT section, key, value, version FROM state WHERE user = ? AND plan = ? AND version > ? "
+                "ORDER BY version",
+                (user, plan, version),
+            ).fetchall()
+        if not rows:
+            current = self.version(user, plan)
+            # Versions only grow, so a newer `version` means the rows were replaced: send everything
+            if current < version:
+                return self.changes_since(user, plan, -1)
+            return current, []
+        return rows[-1][3], [(section, key, json.loads(value)) for section, key, value, _v in rows if section in SECTIONS]
+
+    # Stored values of `section` for every user and plan
+    def section_values(self, section):
+        with self._connection() as conn:
+            rows = conn.execute("SELECT value FROM state WHERE section = ?", (section,)).fetchall()
+        return [json.loads(value) for value, in rows]
+
+    # Close the idle connections; connections in use are closed when they come back
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self.pool_size = 0
+        for conn in idle:
+            conn.close()
+
+
+# Write-behind wrapper around a backend: `set()` only records the change in memory
+# and a background thread writes batches of them. Repeated changes to a key are
+# coalesced; a batch is written once no change arrived for `delay` seconds, and
+# never later than `max_delay` seconds after its oldest change (the staleness
+# bound). Changes keep the time they were made, so last-writer-wins is decided by
+# when the learner acted rather than when the batch reached the disk. Reads see
+# pending changes; `flush()` and `close()` (also run at interpreter exit) write
+# everything out. A failed write is kept and retried after `delay` seconds.
+# `defer()` queues other slow work (note bodies) for the same thread, run before
+# the changes recorded after it are written.
+class WriteBehindBackend:
+    def __init__(self, backend, delay=0.5, max_delay=2.0):
+        self.backend = backend
+        self.delay = delay
+        self.max_delay = max_delay
+        self.error = None
+        # (user, plan) -> {(section, key): (value, ts)}, in order of first change
+        self._pending = {}
+        # Batch being written
+        self._batch = {}
+        # Deferred (func, args), in order
+        self._tasks = []
+        self._first = None
+        self._last = None
+        self._writing = False
+        self._flushing = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="timetable-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def set(self, user, plan, section, key, value, ts=None):
+        self.set_many(user, plan, [(section, key, value)], ts)
+
+    def set_many(self, user, plan, changes, ts=None):
+        changes = stamped_changes(changes, ts)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write-behind backend is closed")
+            pending = self._pending.setdefault((user, plan), {})
+            for section, key, value, ts in changes:
+                if ts >= pending.get((section, key), (None, ts))[1]:
+                    pending[section, key] = (value, ts)
+            now = time.monotonic()
+            self._first = self._first or now
+            self._last = now
+            self._cond.notify_all()
+
+    # Run `func(*args)` on the writer thread ahead of the changes recorded after this call;
+    # a failure is retried like a failed write
+    def defer(self, func, *args):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write-behind backend is closed")
+            self._tasks.append((func, args))
+            now = time.monotonic()
+            self._first = self._first or now
+            self._last = now
+            self._cond.notify_all()
+
+    # Stored state with the unwritten changes laid over it. They are copied before
+    # reading, so a batch finishing in between is in the stored state instead.
+    def load(self, user, plan, keys=None):
+        with self._cond:
+            pending = {**self._batch.get((user, plan), {}), **self._pending.get((user, plan), {})}
+        state = self.backend.load(user, plan, keys)
+        keys = None if keys is None else set(keys)
+        for (section, key), (value, _ts) in pending.items():
+            if keys is None or key in keys:
+                state[section][key] = value
+        return state
+
+    def version(self, user, plan):
+        return self.backend.version(user, plan)
+
+    def changes_since(self, user, plan, version):
+        return self.backend.changes_since(user, plan, version)
+
+    # Stored values of `section` for every user and plan, and the unwritten ones
+    def section_values(self, section):
+        with self._cond:
+            pending = [value for changes in (*self._batch.values(), *self._pending.values())
+                       for (changed, _key), (value, _ts) in changes.items() if changed == section]
+        return self.backend.section_values(section) + pending
+
+    # Number of changes (and deferred tasks) not yet written
+    def pending(self):
+        with self._cond:
+            return sum(len(changes) for changes in self._pending.values()) + len(self._tasks)
+
+    # Write every change recorded so far without waiting for the debounce; returns False if
+    # they were not all written within `timeout` seconds
+    def flush(self, timeout=None):
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: not self._pending and not self._tasks and not self._writing, timeout)
+            finally:
+                self._flushing -= 1
+
+    # Flush (giving up after `timeout` seconds if the backend keeps failing) and close the backend
+    def close(self, timeout=30.0):
+        with self._cond:
+            if self._closed:
+                return
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        atexit.unregister(self.close)
+        self.backend.close()
+
+    # Seconds until the pending batch is due (0 = now), None when nothing is pending
+    def _due(self):
+        if not self._pending and not self._tasks:
+            return None
+        if self._flushing or self._closed:
+            return 0
+        return max(min(self._last + self.delay, self._first + self.max_delay) - time.monotonic(), 0)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                due = self._due()
+                while due != 0:
+                    if due is None and self._closed:
+                        return
+                    self._cond.wait(due)
+                    due = self._due()
+                self._batch, self._pending = self._pending, {}
+                tasks, self._tasks = self._tasks, []
+                self._first = self._last = None
+                self._writing = True
+            failed, failed_tasks = self._write(self._batch, tasks)
+            with self._cond:
+                self._batch = {}
+                self._writing = False
+                retry = bool(failed or failed_tasks)
+                if retry:
+                    # Changes made since the batch was taken are newer and win over the failed ones
+                    for target, changes in failed.items():
+                        self._pending[target] = {**changes, **self._pending.get(target, {})}
+                    self._tasks[:0] = failed_tasks
+                    now = time.monotonic()
+                    self._first = self._first or now
+                    self._last = now
+                self._cond.notify_all()
+                if retry:
+                    if self._closed:
+                        return
+                    self._cond.wait(self.delay)
+
+    # Run the deferred tasks, then write a batch; returns the changes of the (user, plan)
+    # pairs that failed and the tasks left. After a failed task nothing more is written,
+    # so no change is stored before the work deferred ahead of it.
+    def _write(self, batch, tasks):
+        for i, (func, args) in enumerate(tasks):
+            try:
+                func(*args)
+            except Exception as exc:
+                self.error = exc
+                return dict(batch), tasks[i:]
+        failed = {}
+        for (user, plan), changes in batch.items():
+            try:
+                self.backend.set_many(
+                    user, plan, [(section, key, value, ts) for (section, key), (value, ts) in changes.items()]
+                )
+            except Exception as exc:
+                self.error = exc
+                failed[user, plan] = changes
+        if not failed:
+            self.error = None
+        return failed, []
+
+
+# Open the backend named by `kind` ("json" or "sqlite") at `path`
+def open_backend(kind, path):
+    if kind == "json":
+        return JsonBackend(path)
+    if kind == "sqlite":
+        return SqliteBackend(path)
+    raise ValueError(f"unknown storage backend: {kind!r}")
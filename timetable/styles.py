@@ -0,0 +1,64 @@
+import html
+
+import numpy as np
+import pandas as pd
+
+from timetable.kernels import row_kinds, style_cells
+from timetable.schedule import CODE_COLUMNS, COLUMNS
+
+HEADER_STYLE = 'background-color: #2c3e50; color: white; font-weight: bold; text-align: center'
+REST_STYLE = 'background-color: #f8f9fa; color: #6c757d; font-style: italic'
+
+# Session cell style for a subject color; `css_class` names the cell for static/app.css
+def subject_style(color, css_class):
+    return f'background-color: {color}; border-left: 4px solid {color}; --cell-class: {css_class}-session'
+
+
+MORNING_COLUMN = COLUMNS.index("Morning Session")
+EVENING_COLUMN = COLUMNS.index("Evening Session")
+
+
+# CSS for every displayed cell, derived from the row kind and the subject code columns;
+# `subject_styles` maps subject names to their session cell CSS
+def style_matrix(df, subject_names, subject_styles):
+    kinds = row_kinds(df["Week"].to_numpy(), df["Day"].to_numpy(), df["Morning Session"].to_numpy())
+    styles = style_cells(
+        kinds, df[CODE_COLUMNS].to_numpy(), len(COLUMNS), (MORNING_COLUMN, EVENING_COLUMN),
+        HEADER_STYLE, HEADER_STYLE + '; --cell-class: week-header',
+        REST_STYLE, REST_STYLE + '; --cell-class: rest-day',
+        [subject_styles.get(name) for name in subject_names],
+    )
+    return pd.DataFrame(styles, index=df.index, columns=COLUMNS)
+
+
+# Color legend above the schedule: (name, color) per subject
+def legend_html(colors):
+    items = "".join(
+        f'<div class="legend-item"><div class="legend-color" style="background-color: {color}; '
+        f'border-left: 4px solid {color}"></div><span>{html.escape(name)}</span></div>'
+        for name, color in colors
+    )
+    return f'<div class="legend-container">{items}</div>'
+
+
+# Completion mark per (scheduled, done) cell: blank for empty slots
+MARKS = pd.CategoricalDtype(['', '✅', '⬜'])
+
+
+# Display frame: the shared schedule joined with one learner's completion marks and notes.
+# Only the state columns are new arrays; the schedule columns are shared with `df`
+# (copy-on-write), so the cached base frame is never copied or mutated.
+def overlay_state(df, done, notes):
+    codes = df[CODE_COLUMNS[0]].to_numpy(), df[CODE_COLUMNS[1]].to_numpy()
+    scheduled = np.maximum(*codes) >= 0
+    text = np.full(len(df), "", dtype=object)
+    for key, value in notes.items():
+        row = key[len("notes_"):]
+        if key.startswith("notes_") and row.isdigit() and int(row) < len(df) and scheduled[int(row)]:
+            text[int(row)] = value
+    state = {
+        "Morning Completed": pd.Categorical.from_codes(np.where(scheduled, 2 - done[:, 0], 0), dtype=MARKS),
+        "Evening Completed": pd.Categorical.from_codes(np.where(scheduled, 2 - done[:, 1], 0), dtype=MARKS),
+        "Notes": pd.Series(text, index=df.index, dtype=object),
+    }
+    return pd.DataFrame({column: state[column] if column in state else df[column] for column in COLUMNS}, copy=False)